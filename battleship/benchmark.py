@@ -0,0 +1,286 @@
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from battleship.board import BoardAutomatic
+from battleship.game import Game
+from battleship.player import Player, PlayerAutomatic, PlayerProbability, PlayerRandom
+
+# A benchmark result is a dict {'value': float, 'unit': str, 'higher_is_better': bool}, the results of a run are
+# stored by name of benchmark. Each value is the best over several rounds (as timeit does), the other rounds being
+# slowed down by the noise of the machine.
+
+# relative change of a value beyond which the comparison with a baseline flags a regression
+DEFAULT_TOLERANCE = 0.15
+
+VERSION_FORMAT_BASELINE = 1
+
+
+def get_result(value: float, unit: str, higher_is_better: bool = False) -> dict:
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def bench_is_attacked_at(number_rounds: int, number_boards: int, seed: int) -> Dict[str, dict]:
+    """
+    :return: the latency of Board.is_attacked_at, every cell of the boards being attacked in a random order
+    """
+    rng = random.Random(seed)
+    list_times_per_call = []
+
+    for _ in range(number_rounds):
+        list_boards = [BoardAutomatic(rng=rng) for _ in range(number_boards)]
+        list_coordinates = [(x, y) for x in range(1, BoardAutomatic.SIZE_X + 1)
+                            for y in range(1, BoardAutomatic.SIZE_Y + 1)]
+        rng.shuffle(list_coordinates)
+
+        time_start = time.perf_counter()
+        for board in list_boards:
+            for coord_x, coord_y in list_coordinates:
+                board.is_attacked_at(coord_x, coord_y)
+        list_times_per_call.append((time.perf_counter() - time_start) / (number_boards * len(list_coordinates)))
+
+    return {'board.is_attacked_at': get_result(min(list_times_per_call) * 1e6, 'us')}
+
+
+def bench_apply_undo_shot(number_rounds: int, number_boards: int, seed: int) -> Dict[str, dict]:
+    """
+    :return: the latency of a shot tried and undone with Board.apply_shot and Board.undo_shot, and of Board.clone, as
+    used by the strategies searching hypothetical boards
+    """
+    rng = random.Random(seed)
+    list_times_per_shot = []
+    list_times_per_clone = []
+
+    for _ in range(number_rounds):
+        list_boards = [BoardAutomatic(rng=rng) for _ in range(number_boards)]
+        list_coordinates = [(x, y) for x in range(1, BoardAutomatic.SIZE_X + 1)
+                            for y in range(1, BoardAutomatic.SIZE_Y + 1)]
+        rng.shuffle(list_coordinates)
+
+        time_start = time.perf_counter()
+        for board in list_boards:
+            for coord_x, coord_y in list_coordinates:
+                board.undo_shot(board.apply_shot(coord_x, coord_y)[2])
+        list_times_per_shot.append((time.perf_counter() - time_start) / (number_boards * len(list_coordinates)))
+
+        time_start = time.perf_counter()
+        for board in list_boards:
+            for _ in range(len(list_coordinates)):
+                board.clone()
+        list_times_per_clone.append((time.perf_counter() - time_start) / (number_boards * len(list_coordinates)))
+
+    return {'board.apply_undo_shot': get_result(min(list_times_per_shot) * 1e6, 'us'),
+            'board.clone': get_result(min(list_times_per_clone) * 1e6, 'us')}
+
+
+def bench_board_generation(number_rounds: int, number_boards: int, seed: int) -> Dict[str, dict]:
+    """
+    :return: the time taken by BoardAutomatic() to generate a board, and the mean number of backtracks of the generation
+    """
+    rng = random.Random(seed)
+    list_times_per_board = []
+    number_backtracks = 0
+
+    for _ in range(number_rounds):
+        time_start = time.perf_counter()
+        for _ in range(number_boards):
+            number_backtracks += BoardAutomatic(rng=rng).number_backtracks
+        list_times_per_board.append((time.perf_counter() - time_start) / number_boards)
+
+    return {'board_automatic.generation': get_result(min(list_times_per_board) * 1e6, 'us'),
+            'board_automatic.backtracks': get_result(number_backtracks / (number_rounds * number_boards),
+                                                     'backtracks/board')}
+
+
+def bench_select_coordinates(name_player: str,
+                             factory_player: Callable[..., Player],
+                             number_rounds: int,
+                             number_games: int,
+                             seed: int) -> Dict[str, dict]:
+    """
+    :return: the latency of select_coordinates_to_attack of a class of players, over whole games against PlayerRandom
+    (the latency of the attacks themselves is not included)
+    """
+    rng = random.Random(seed)
+    list_times_per_call = []
+
+    for _ in range(number_rounds):
+        time_total = 0.
+        number_calls = 0
+        for _ in range(number_games):
+            player = factory_player(rng=random.Random(rng.getrandbits(64)))
+            opponent = PlayerRandom(rng=random.Random(rng.getrandbits(64)))
+            while not opponent.has_lost():
+                time_start = time.perf_counter()
+                coord_x, coord_y = player.select_coordinates_to_attack(opponent)
+                time_total += time.perf_counter() - time_start
+                number_calls += 1
+                player.attacks_at(opponent, coord_x, coord_y)
+        list_times_per_call.append(time_total / number_calls)
+
+    return {f'{name_player}.select_coordinates_to_attack': get_result(min(list_times_per_call) * 1e6,
+                                                                      'us')}
+
+
+def bench_games(number_rounds: int, number_games: int, seed: int) -> Dict[str, dict]:
+    """
+    :return: the throughput of whole headless games PlayerAutomatic vs PlayerRandom, boards generation included
+    """
+    rng = random.Random(seed)
+    list_games_per_second = []
+
+    for _ in range(number_rounds):
+        time_start = time.perf_counter()
+        for _ in range(number_games):
+            Game(player_1=PlayerAutomatic(rng=random.Random(rng.getrandbits(64))),
+                 player_2=PlayerRandom(rng=random.Random(rng.getrandbits(64))),
+                 rng=random.Random(rng.getrandbits(64))).run()
+        list_games_per_second.append(number_games / (time.perf_counter() - time_start))
+
+    return {'game.throughput': get_result(max(list_games_per_second), 'games/s', higher_is_better=True)}
+
+
+def run_benchmarks(quick: bool = False, seed: int = 0) -> Dict[str, dict]:
+    """
+    :param quick: if True, fewer rounds and games are run (less accurate, for a quick check)
+    :param seed: seed of the random generators, the same workload is measured for the same seed
+    :return: the results of all the benchmarks, by name
+    """
+    number_rounds = 3 if quick else 7
+    scale = 1 if quick else 5
+
+    # as in timeit, the garbage collector would add noise to the timings
+    is_gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        dict_results = _run_benchmarks(number_rounds, scale, seed)
+    finally:
+        if is_gc_enabled:
+            gc.enable()
+
+    return dict_results
+
+
+def _run_benchmarks(number_rounds: int, scale: int, seed: int) -> Dict[str, dict]:
+    dict_results = {}
+    dict_results.update(bench_is_attacked_at(number_rounds, 20 * scale, seed))
+    dict_results.update(bench_apply_undo_shot(number_rounds, 20 * scale, seed))
+    dict_results.update(bench_board_generation(number_rounds, 20 * scale, seed))
+    for name_player, factory_player in (('player_automatic', PlayerAutomatic),
+                                        ('player_random', PlayerRandom),
+                                        ('player_probability', PlayerProbability)):
+        dict_results.update(bench_select_coordinates(name_player, factory_player, number_rounds, 2 * scale, seed))
+    dict_results.update(bench_games(number_rounds, 10 * scale, seed))
+
+    return dict_results
+
+
+def get_baseline(dict_results: Dict[str, dict]) -> dict:
+    """
+    :return: the results with information about the machine, as stored in a baseline file
+    """
+    return {'version': VERSION_FORMAT_BASELINE,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': dict_results}
+
+
+def save_baseline(dict_results: Dict[str, dict], path_file: str) -> None:
+    with open(path_file, 'w') as file:
+        json.dump(get_baseline(dict_results), file, indent=2, sort_keys=True)
+
+
+def load_baseline(path_file: str) -> Dict[str, dict]:
+    """
+    :return: the results stored in a baseline file
+    :raise ValueError: if the file is not a baseline
+    """
+    with open(path_file) as file:
+        baseline = json.load(file)
+    if baseline.get('version') != VERSION_FORMAT_BASELINE or 'results' not in baseline:
+        raise ValueError(f"The file {path_file} is not a benchmark baseline.")
+    return baseline['results']
+
+
+def compare_results(dict_results: Dict[str, dict],
+                    dict_results_baseline: Dict[str, dict],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[dict]:
+    """
+    :param tolerance: relative change allowed before a change for the worse is a regression
+    :return: one comparison per benchmark present in both results: {'name', 'baseline', 'value', 'change',
+    'is_regression'}, change being the relative change of the value, positive if it is better
+    """
+    list_comparisons = []
+
+    for name, result in sorted(dict_results.items()):
+        if name not in dict_results_baseline:
+            continue
+        value, value_baseline = result['value'], dict_results_baseline[name]['value']
+        difference = value - value_baseline if result['higher_is_better'] else value_baseline - value
+        if value_baseline:
+            change = difference / abs(value_baseline)
+        else:
+            change = 0. if not difference else math.copysign(float('inf'), difference)
+
+        list_comparisons.append({'name': name,
+                                 'baseline': value_baseline,
+                                 'value': value,
+                                 'change': change,
+                                 'is_regression': change < -tolerance})
+
+    return list_comparisons
+
+
+def print_results(dict_results: Dict[str, dict], file=None) -> None:
+    for name, result in sorted(dict_results.items()):
+        print(f"{name:<45} {result['value']:>12.3f} {result['unit']}", file=file)
+
+
+def print_comparisons(list_comparisons: List[dict], dict_results: Dict[str, dict], file=None) -> None:
+    for comparison in list_comparisons:
+        flag = "REGRESSION" if comparison['is_regression'] else ""
+        print(f"{comparison['name']:<45} {comparison['baseline']:>12.3f} -> {comparison['value']:>12.3f} "
+              f"{dict_results[comparison['name']]['unit']:<18} {comparison['change']:>+8.1%} {flag}", file=file)
+
+
+def main(list_arguments: List[str] = None) -> int:
+    """
+    Runs the benchmarks, e.g.:
+        python -m battleship.benchmark --save baseline.json
+        python -m battleship.benchmark --compare baseline.json
+    :return: the exit code, 1 if a regression was found when comparing with a baseline, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks of the hot paths of the battleship engine.")
+    parser.add_argument('--quick', action='store_true', help="fewer rounds, less accurate")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the workload")
+    parser.add_argument('--save', metavar='PATH', help="stores the results as a baseline (JSON)")
+    parser.add_argument('--compare', metavar='PATH', help="compares the results with a baseline (JSON)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="relative change for the worse flagged as a regression")
+    arguments = parser.parse_args(list_arguments)
+
+    dict_results = run_benchmarks(quick=arguments.quick, seed=arguments.seed)
+
+    exit_code = 0
+    if arguments.compare:
+        list_comparisons = compare_results(dict_results, load_baseline(arguments.compare), arguments.tolerance)
+        print_comparisons(list_comparisons, dict_results)
+        if any(comparison['is_regression'] for comparison in list_comparisons):
+            exit_code = 1
+    else:
+        print_results(dict_results)
+
+    if arguments.save:
+        save_baseline(dict_results, arguments.save)
+
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 import random
 
@@ -9,6 +10,50 @@ from battleship.ship import Ship
 OFFSET_UPPER_CASE_CHAR_CONVERSION = 64
 
 
+class BoardRender(object):
+    """
+    Text representation of a board, kept up to date cell by cell: when the board is rendered, only the rows that
+    changed since the previous rendering are formatted again.
+    """
+
+    def __init__(self, size_x: int, size_y: int):
+        self.array_chars = [[' ' for _ in range(size_x)] for _ in range(size_y)]
+
+        # formatted rows of the board, None if the row has changed since it was last formatted
+        self.list_lines = [None] * size_y
+
+        from battleship.convert import get_label_column
+
+        # the labels of the rows are right-aligned, at least 2 characters wide
+        self.width_labels_rows = max(2, len(str(size_y)))
+
+        # the labels of the columns are left-aligned on the cells, which are 6 characters wide
+        array_first_line = [get_label_column(coord_x) for coord_x in range(1, size_x + 1)]
+        self.first_line = ' ' * (self.width_labels_rows + 4) \
+            + ''.join(label.ljust(6) for label in array_first_line[:-1]) + array_first_line[-1] + ' \n'
+        self.line_dashes = ' ' * (self.width_labels_rows + 1) + '-' * 6 * size_x + '-\n'
+
+    def set_char(self, coord_x: int, coord_y: int, char: str) -> None:
+        """
+        Sets the character displayed at the position (coord_x, coord_y)
+        """
+        array_line = self.array_chars[coord_y - 1]
+        if array_line[coord_x - 1] != char:
+            array_line[coord_x - 1] = char
+            self.list_lines[coord_y - 1] = None
+
+    def get_string(self) -> str:
+        """
+        :return: the text representation of the board
+        """
+        for index_line, line in enumerate(self.list_lines):
+            if line is None:
+                self.list_lines[index_line] = f'{index_line + 1:>{self.width_labels_rows}} |  ' \
+                                              + '  |  '.join(self.array_chars[index_line]) + '  |\n'
+
+        return self.first_line + self.line_dashes + self.line_dashes.join(self.list_lines) + self.line_dashes
+
+
 class Board(object):
     """
     Class representing the board of the player. Interface between the player and its ships.
@@ -23,40 +68,134 @@ class Board(object):
                                     4: 1,
                                     5: 1}
 
+    # True if the ships are shared with clones of the board (see clone): they are copied before being damaged
+    is_state_shared = False
+
     def __init__(self,
-                 list_ships: List[Ship]):
+                 list_ships: List[Ship],
+                 size_x: int = None,
+                 size_y: int = None,
+                 dict_number_ships_per_length: Dict[int, int] = None,
+                 check_rules: bool = True):
         """
         :param list_ships: list of ships for the board.
+        :param size_x: length of the board along the x axis, Board.SIZE_X if None
+        :param size_y: length of the board along the y axis, Board.SIZE_Y if None
+        :param dict_number_ships_per_length: dict length -> number of ships of that length,
+        Board.DICT_NUMBER_SHIPS_PER_LENGTH if None
+        :param check_rules: if False, the ships are not checked against the rules below, they must be known to follow
+        them (e.g. the ships of a board restored from a checkpoint)
         :raise ValueError if the list of ships is in contradiction with Board.DICT_NUMBER_SHIPS_PER_LENGTH.
         :raise ValueError if there are some ships that are too close from each other
         """
 
+        self.set_dimensions(size_x, size_y, dict_number_ships_per_length)
+
         self.list_ships = list_ships
-        self.set_coordinates_previous_shots = set()
 
-        if not self.lengths_of_ships_correct():
-            total_number_of_ships = sum(self.DICT_NUMBER_SHIPS_PER_LENGTH.values())
+        if check_rules:
+            if not self.lengths_of_ships_correct():
+                total_number_of_ships = sum(self.DICT_NUMBER_SHIPS_PER_LENGTH.values())
+
+                error_message = f"There should be {total_number_of_ships} ships in total:\n"
+
+                for length_ship, number_ships in self.DICT_NUMBER_SHIPS_PER_LENGTH.items():
+                    error_message += f" - {number_ships} of length {length_ship}\n"
+
+                raise ValueError(error_message)
+
+            if self.are_some_ships_too_close_from_each_other():
+                raise ValueError("There are some ships that are too close from each other.")
+
+            if self.are_some_ships_outside_the_board():
+                raise ValueError("There are some ships that are outside the board.")
 
-            error_message = f"There should be {total_number_of_ships} ships in total:\n"
+        # Lookup table: index of a cell -> index (in list_ships) of the ship placed on that cell
+        self.dict_index_ship_per_index_cell = {}
+        for index_ship, ship in enumerate(self.list_ships):
+            for coord_x, coord_y in ship.get_all_coordinates():
+                self.dict_index_ship_per_index_cell[self.get_index_cell(coord_x, coord_y)] = index_ship
 
-            for length_ship, number_ships in self.DICT_NUMBER_SHIPS_PER_LENGTH.items():
-                error_message += f" - {number_ships} of length {length_ship}\n"
+        self._initialise_shots_and_damages()
 
-            raise ValueError(error_message)
+        # renders of the board, created the first time the board is printed: with_ships_positions -> BoardRender
+        self.dict_renders = {}
 
-        if self.are_some_ships_too_close_from_each_other():
-            raise ValueError("There are some ships that are too close from each other.")
+    def set_dimensions(self,
+                       size_x: int = None,
+                       size_y: int = None,
+                       dict_number_ships_per_length: Dict[int, int] = None) -> None:
+        """
+        Overrides the class-level dimensions and fleet composition for this board only.
+        The arguments left to None keep the values defined on the class.
+        """
+        if size_x is not None:
+            self.SIZE_X = size_x
+        if size_y is not None:
+            self.SIZE_Y = size_y
+        if dict_number_ships_per_length is not None:
+            self.DICT_NUMBER_SHIPS_PER_LENGTH = dict(dict_number_ships_per_length)
+
+    def _initialise_shots_and_damages(self) -> None:
+        # Bitboards: bit number (y - 1) * SIZE_X + (x - 1) represents the cell (x, y)
+        self.list_masks_ships = [self.get_mask_from_ship(ship) for ship in self.list_ships]
+        self.mask_ships = 0
+        for mask_ship in self.list_masks_ships:
+            self.mask_ships |= mask_ship
+        self.mask_shots = 0
+        self.mask_damages = 0
+
+    @property
+    def set_coordinates_previous_shots(self) -> set:
+        """
+        :return: A set containing the coordinates of all the attacks the board has received
+        """
+        return self.get_set_coordinates_from_mask(self.mask_shots)
+
+    def get_index_cell(self, coord_x: int, coord_y: int) -> int:
+        """
+        :param coord_x: integer representing the projection of a coordinate on the x-axis
+        :param coord_y: integer representing the projection of a coordinate on the y-axis
+        :return: the index of the bit representing (coord_x, coord_y) in the bitboards of the board
+        """
+        return (coord_y - 1) * self.SIZE_X + coord_x - 1
+
+    def get_coordinates_from_index_cell(self, index_cell: int) -> Tuple[int, int]:
+        """
+        :param index_cell: index of a bit in the bitboards of the board
+        :return: the coordinates (coord_x, coord_y) represented by that bit
+        """
+        coord_y, coord_x = divmod(index_cell, self.SIZE_X)
+        return coord_x + 1, coord_y + 1
+
+    def get_mask_from_ship(self, ship: Ship) -> int:
+        """
+        :param ship: object of class Ship placed on the board
+        :return: the bitboard in which only the coordinates of the ship are set
+        """
+        mask_ship = 0
+        for coord_x, coord_y in ship.get_all_coordinates():
+            mask_ship |= 1 << self.get_index_cell(coord_x, coord_y)
+        return mask_ship
+
+    def get_set_coordinates_from_mask(self, mask: int) -> set:
+        """
+        :param mask: bitboard of the board
+        :return: A set containing the coordinates of all the bits set in the mask
+        """
+        set_coordinates = set()
+        while mask:
+            lowest_bit = mask & -mask
+            set_coordinates.add(self.get_coordinates_from_index_cell(lowest_bit.bit_length() - 1))
+            mask ^= lowest_bit
+        return set_coordinates
 
     def has_no_ships_left(self) -> bool:
         """
         :return: True if and only if all the ships on the board have sunk.
         """
-        # If there is a single ship that hasnt sunk, returns false
-        for Ship in list_ships:
-            if not Ship.has_sunk():
-                return false
-        # if the code can go through the loop without returning false, then all ships have sunk
-        return True
+        # all the ships have sunk once every bit of a ship is also a bit of damage
+        return self.mask_damages == self.mask_ships
 
     def is_attacked_at(self, coord_x: int, coord_y: int) -> Tuple[bool, bool]:
         """
@@ -71,225 +210,588 @@ class Board(object):
                     opponent's ship is.
                     - has_ship_sunk is True if and only if that attack made the ship sink.
         """
-        # default values
-        is_ship_hit = False
-        has_ship_sunk = False
+        if not (1 <= coord_x <= self.SIZE_X and 1 <= coord_y <= self.SIZE_Y):
+            return False, False
 
-        for ship in self.list_ships:
-            if ship.is_on_coordinate(coord_x, coord_y):
-                is_ship_hit = True
-                ship.gets_damage_at(coord_x, coord_y)
-                if ship.has_sunk():
-                    has_ship_sunk = True
+        index_cell = (coord_y - 1) * self.SIZE_X + coord_x - 1
+        bit_cell = 1 << index_cell
+        self.mask_shots |= bit_cell
 
-        return (is_ship_hit, has_ship_sunk)
+        index_ship = self.dict_index_ship_per_index_cell.get(index_cell)
+        if index_ship is None:
+            if self.dict_renders:
+                self._update_renders(coord_x, coord_y, None)
+            return False, False
 
-    def print_board_with_ships_positions(self) -> None:
-        array_board = [[' ' for _ in range(self.SIZE_X)] for _ in range(self.SIZE_Y)]
+        self.mask_damages |= bit_cell
+        if self.is_state_shared:
+            self._unshare_state()
+        ship = self.list_ships[index_ship]
+        ship.gets_damage_at(coord_x, coord_y)
 
-        for x_shot, y_shot in self.set_coordinates_previous_shots:
-            array_board[y_shot - 1][x_shot - 1] = 'O'
+        if self.dict_renders:
+            self._update_renders(coord_x, coord_y, ship)
 
-        for ship in self.list_ships:
-            if ship.has_sunk():
-                for x_ship, y_ship in ship.set_all_coordinates:
-                    array_board[y_ship - 1][x_ship - 1] = '$'
-                continue
+        # the ship has sunk once all its bits are damaged
+        mask_ship = self.list_masks_ships[index_ship]
+        return True, self.mask_damages & mask_ship == mask_ship
 
-            for x_ship, y_ship in ship.set_all_coordinates:
-                array_board[y_ship - 1][x_ship - 1] = 'S'
+    def apply_shot(self, coord_x: int, coord_y: int) -> Tuple[bool, bool, tuple]:
+        """
+        Same as is_attacked_at, for trying a shot and undoing it afterwards (e.g. in a search).
+        :return: a tuple (is_ship_hit, has_ship_sunk, token), is_ship_hit and has_ship_sunk being the same as in
+        is_attacked_at, and token the state needed by undo_shot to cancel the shot
+        """
+        token = self._get_token_shot(coord_x, coord_y)
+        is_ship_hit, has_ship_sunk = self.is_attacked_at(coord_x, coord_y)
+        return is_ship_hit, has_ship_sunk, token
 
-            for x_ship, y_ship in ship.set_coordinates_damages:
-                array_board[y_ship - 1][x_ship - 1] = 'X'
+    def undo_shot(self, token: tuple) -> None:
+        """
+        Cancels a shot applied by apply_shot. The shots must be undone in the reverse order of their application.
+        The renders of the board are created again the next time the board is printed.
+        :param token: token returned by apply_shot
+        """
+        self.mask_shots, self.mask_damages, index_ship, mask_damages_ship = token
+        if index_ship is not None:
+            if self.is_state_shared:
+                self._unshare_state()
+            self.list_ships[index_ship].mask_damages = mask_damages_ship
+        self.dict_renders = {}
+
+    def clone(self) -> 'Board':
+        """
+        Copies the board in a constant time: the clone shares the ships of the board until one of them is damaged,
+        on either board (copy-on-write). The other attributes are either never modified (e.g. the lookup tables) or
+        replaced rather than modified (e.g. the bitboards).
+        :return: a board in the same state, which can be attacked independently
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.dict_renders = {}
+        self.is_state_shared = board.is_state_shared = True
+        return board
 
-        board_str = self._get_board_string_from_array_chars(array_board)
+    def _get_token_shot(self, coord_x: int, coord_y: int) -> tuple:
+        """
+        :return: the state modified by a shot at (coord_x, coord_y), see undo_shot
+        """
+        index_ship = None
+        mask_damages_ship = 0
+        if 1 <= coord_x <= self.SIZE_X and 1 <= coord_y <= self.SIZE_Y:
+            index_ship = self.dict_index_ship_per_index_cell.get((coord_y - 1) * self.SIZE_X + coord_x - 1)
+            if index_ship is not None:
+                mask_damages_ship = self.list_ships[index_ship].mask_damages
+        return self.mask_shots, self.mask_damages, index_ship, mask_damages_ship
+
+    def _unshare_state(self) -> None:
+        """
+        Copies the ships shared with the clones of the board, before modifying them
+        """
+        self.list_ships = [ship.copy() for ship in self.list_ships]
+        self.is_state_shared = False
 
-        print(board_str)
+    def get_ship_at(self, coord_x: int, coord_y: int) -> Optional[Ship]:
+        """
+        :param coord_x: integer representing the projection of a coordinate on the x-axis
+        :param coord_y: integer representing the projection of a coordinate on the y-axis
+        :return: the ship placed at (coord_x, coord_y), None if there is no ship at that position
+        """
+        if not (1 <= coord_x <= self.SIZE_X and 1 <= coord_y <= self.SIZE_Y):
+            return None
 
-    def print_board_without_ships_positions(self) -> None:
-        array_board = [[' ' for _ in range(self.SIZE_X)] for _ in range(self.SIZE_Y)]
+        index_ship = self.dict_index_ship_per_index_cell.get(self.get_index_cell(coord_x, coord_y))
+        if index_ship is None:
+            return None
+        return self.list_ships[index_ship]
 
-        for x_shot, y_shot in self.set_coordinates_previous_shots:
-            array_board[y_shot - 1][x_shot - 1] = 'O'
+    def print_board_with_ships_positions(self, file=None) -> None:
+        """
+        :param file: stream in which the board is printed, sys.stdout if None
+        """
+        print(self.get_board_string_with_ships_positions(), file=file)
 
-        for ship in self.list_ships:
-            if ship.has_sunk():
-                for x_ship, y_ship in ship.set_all_coordinates:
-                    array_board[y_ship - 1][x_ship - 1] = '$'
-                continue
+    def print_board_without_ships_positions(self, file=None) -> None:
+        """
+        :param file: stream in which the board is printed, sys.stdout if None
+        """
+        print(self.get_board_string_without_ships_positions(), file=file)
 
-            for x_ship, y_ship in ship.set_coordinates_damages:
-                array_board[y_ship - 1][x_ship - 1] = 'X'
+    def get_board_string_with_ships_positions(self) -> str:
+        """
+        :return: the text representation of the board, showing the positions of the ships
+        """
+        return self._get_render(with_ships_positions=True).get_string()
 
-        board_str = self._get_board_string_from_array_chars(array_board)
+    def get_board_string_without_ships_positions(self) -> str:
+        """
+        :return: the text representation of the board, only showing the damaged and sunk ships
+        """
+        return self._get_render(with_ships_positions=False).get_string()
 
-        print(board_str)
+    def _get_render(self, with_ships_positions: bool) -> 'BoardRender':
+        """
+        :return: the render of the board, created from the current state of the board the first time it is needed and
+        then updated after each attack
+        """
+        if with_ships_positions not in self.dict_renders:
+            render = BoardRender(self.SIZE_X, self.SIZE_Y)
+
+            for x_shot, y_shot in self.set_coordinates_previous_shots:
+                render.set_char(x_shot, y_shot, 'O')
 
-    def _get_board_string_from_array_chars(self, array_board: List[List[str]]) -> str:
-        list_lines = []
+            for ship in self.list_ships:
+                self._update_render_ship(render, ship, with_ships_positions)
 
-        array_first_line = [chr(code + OFFSET_UPPER_CASE_CHAR_CONVERSION) for code in range(1, self.SIZE_X + 1)]
-        first_line = ' ' * 6 + (' ' * 5).join(array_first_line) + ' \n'
+            self.dict_renders[with_ships_positions] = render
 
-        for index_line, array_line in enumerate(array_board, 1):
-            number_spaces_before_line = 2 - len(str(index_line))
-            space_before_line = number_spaces_before_line * ' '
-            list_lines.append(f'{space_before_line}{index_line} |  ' + '  |  '.join(array_line) + '  |\n')
+        return self.dict_renders[with_ships_positions]
 
-        line_dashes = '   ' + '-' * 6 * self.SIZE_X + '-\n'
+    def _update_renders(self, coord_x: int, coord_y: int, ship: Optional[Ship]) -> None:
+        """
+        Updates the renders after an attack at (coord_x, coord_y)
+        :param ship: the ship placed at (coord_x, coord_y), None if there is no ship at that position
+        """
+        for with_ships_positions, render in self.dict_renders.items():
+            if ship is None:
+                render.set_char(coord_x, coord_y, 'O')
+            elif ship.has_sunk():
+                self._update_render_ship(render, ship, with_ships_positions)
+            else:
+                render.set_char(coord_x, coord_y, 'X')
 
-        board_str = first_line + line_dashes + line_dashes.join(list_lines) + line_dashes
+    @staticmethod
+    def _update_render_ship(render: 'BoardRender', ship: Ship, with_ships_positions: bool) -> None:
+        if ship.has_sunk():
+            for x_ship, y_ship in ship.get_all_coordinates():
+                render.set_char(x_ship, y_ship, '$')
+            return
 
-        return board_str
+        if with_ships_positions:
+            for x_ship, y_ship in ship.get_all_coordinates():
+                render.set_char(x_ship, y_ship, 'S')
+
+        for x_ship, y_ship in ship.set_coordinates_damages:
+            render.set_char(x_ship, y_ship, 'X')
 
     def lengths_of_ships_correct(self) -> bool:
         """
         :return: True if and only if there is the right number of ships of each length, according to
         Board.DICT_NUMBER_SHIPS_PER_LENGTH
         """
-        freq1 = 0
-        freq2 = 0
-        freq3 = 0
-        freq4 = 0
-        freq5 = 0
-        for ship in self.list_ships:
-            if (ship.length() == 1):
-                freq1 += 1
-            elif (ship.length() == 2):
-                freq2 += 1
-            elif (ship.length() == 3):
-                freq3 += 1
-            elif (ship.length() == 4):
-                freq4 += 1
-            elif (ship.length() == 5):
-                freq5 += 1
-            else:
-                # ship cannot be more than 5 coords large
+        number_ships_per_length = Counter(ship.length() for ship in self.list_ships)
+
+        # every length present on the board must be expected, with the right number of ships
+        for length_ship, number_ships in number_ships_per_length.items():
+            if self.DICT_NUMBER_SHIPS_PER_LENGTH.get(length_ship, 0) != number_ships:
                 return False
 
-        if (
-                freq1 == self.DICT_NUMBER_SHIPS_PER_LENGTH[1]
-                and freq2 == self.DICT_NUMBER_SHIPS_PER_LENGTH[2]
-                and freq3 == self.DICT_NUMBER_SHIPS_PER_LENGTH[3]
-                and freq4 == self.DICT_NUMBER_SHIPS_PER_LENGTH[4]
-                and freq5 == self.DICT_NUMBER_SHIPS_PER_LENGTH[5]
-        ):
-            return True
-        else:
-            return False
+        for length_ship, number_ships in self.DICT_NUMBER_SHIPS_PER_LENGTH.items():
+            if number_ships_per_length[length_ship] != number_ships:
+                return False
 
-        # TODO
+        return True
 
     def are_some_ships_too_close_from_each_other(self) -> bool:
         """
         :return: True if and only if there are at least 2 ships on the board that are near each other.
         """
-        # loop below runs through all permutations of ship pairs (avoiding repeats) and
-        # runs is_near_ship on each pair, counting to 2
+        return self.ships_too_close(self.list_ships)
 
-        for ship1 in self.list_ships:
-            for ship2 in self.list_ships[self.list_ships.index(ship1) + 1:]:
-                # print(f'{list_ships.index(ship1)},{list_ships.index(ship2)}')
-                if ship1.is_near_ship(ship2):
+    def ships_too_close(self, ship_list: List[Ship]) -> bool:
+        """
+        Checks the spacing of a whole fleet with an occupancy grid, in a time linear in the total size of the ships
+        (instead of comparing every pair of ships).
+        :param ship_list: list of ships to check
+        :return: True if and only if at least 2 ships of ship_list overlap or are near each other.
+        """
+        # occupancy grid: coordinate -> index of the ship placed on it
+        dict_index_ship_per_coordinates = {}
+        for index_ship, ship in enumerate(ship_list):
+            for coord in ship.get_all_coordinates():
+                if coord in dict_index_ship_per_coordinates:  # two ships overlap
                     return True
+                dict_index_ship_per_coordinates[coord] = index_ship
+
+        # a ship is too close from another one if the other one occupies a cell of its surrounding rectangle
+        for index_ship, ship in enumerate(ship_list):
+            for x in range(ship.x_start - 1, ship.x_end + 2):
+                for y in range(ship.y_start - 1, ship.y_end + 2):
+                    index_other_ship = dict_index_ship_per_coordinates.get((x, y), index_ship)
+                    if index_other_ship != index_ship:
+                        return True
 
         return False
 
+    def are_some_ships_outside_the_board(self) -> bool:
+        """
+        :return: True if and only if at least one of the ships has a coordinate outside the board.
+        """
+        for ship in self.list_ships:
+            if not (1 <= ship.x_start and ship.x_end <= self.SIZE_X
+                    and 1 <= ship.y_start and ship.y_end <= self.SIZE_Y):
+                return True
+
+        return False
+
+
+class BoardSparse(Board):
+    """
+    Board for very large grids (e.g. 1000 x 1000): no bitboard nor any other structure proportional to the area of the
+    board is allocated. The memory and the cost of an attack only depend on the number of ships and shots.
+    """
+
+    def _initialise_shots_and_damages(self) -> None:
+        # the damages are only kept by the ships themselves
+        self.set_index_cells_previous_shots = set()
+        self.number_ships_sunk = 0
+
+    @property
+    def set_coordinates_previous_shots(self) -> set:
+        """
+        :return: A set containing the coordinates of all the attacks the board has received
+        """
+        return {self.get_coordinates_from_index_cell(index_cell)
+                for index_cell in self.set_index_cells_previous_shots}
+
+    def has_no_ships_left(self) -> bool:
+        """
+        :return: True if and only if all the ships on the board have sunk.
+        """
+        return self.number_ships_sunk == len(self.list_ships)
+
+    def is_attacked_at(self, coord_x: int, coord_y: int) -> Tuple[bool, bool]:
+        """
+        Same as Board.is_attacked_at, using the sparse representation of the board
+        """
+        if not (1 <= coord_x <= self.SIZE_X and 1 <= coord_y <= self.SIZE_Y):
+            return False, False
+
+        if self.is_state_shared:
+            self._unshare_state()
+
+        index_cell = (coord_y - 1) * self.SIZE_X + coord_x - 1
+        self.set_index_cells_previous_shots.add(index_cell)
+
+        index_ship = self.dict_index_ship_per_index_cell.get(index_cell)
+        if index_ship is None:
+            if self.dict_renders:
+                self._update_renders(coord_x, coord_y, None)
+            return False, False
+
+        ship = self.list_ships[index_ship]
+        had_ship_sunk = ship.has_sunk()
+        ship.gets_damage_at(coord_x, coord_y)
+        has_ship_sunk = ship.has_sunk()
+
+        if self.dict_renders:
+            self._update_renders(coord_x, coord_y, ship)
+
+        if has_ship_sunk and not had_ship_sunk:
+            self.number_ships_sunk += 1
+
+        return True, has_ship_sunk
+
+    def undo_shot(self, token: tuple) -> None:
+        """
+        Same as Board.undo_shot, using the sparse representation of the board
+        """
+        index_cell, was_attacked, index_ship, mask_damages_ship, self.number_ships_sunk = token
+        if index_cell is None:
+            return
+
+        if self.is_state_shared:
+            self._unshare_state()
+        if not was_attacked:
+            self.set_index_cells_previous_shots.discard(index_cell)
+        if index_ship is not None:
+            self.list_ships[index_ship].mask_damages = mask_damages_ship
+        self.dict_renders = {}
+
+    def _get_token_shot(self, coord_x: int, coord_y: int) -> tuple:
+        if not (1 <= coord_x <= self.SIZE_X and 1 <= coord_y <= self.SIZE_Y):
+            return None, False, None, 0, self.number_ships_sunk
+
+        index_cell = (coord_y - 1) * self.SIZE_X + coord_x - 1
+        index_ship = self.dict_index_ship_per_index_cell.get(index_cell)
+        mask_damages_ship = self.list_ships[index_ship].mask_damages if index_ship is not None else 0
+        return index_cell, index_cell in self.set_index_cells_previous_shots, index_ship, mask_damages_ship, \
+            self.number_ships_sunk
+
+    def _unshare_state(self) -> None:
+        """
+        Copies the ships and the shots shared with the clones of the board, before modifying them
+        """
+        self.set_index_cells_previous_shots = set(self.set_index_cells_previous_shots)
+        super()._unshare_state()
+
 
 class BoardAutomatic(Board):
-    def __init__(self):
-        super().__init__(list_ships=self.generate_ships_automatically())
-
-    def ships_too_close(self, ship_list) -> bool:
-        # copy of method defined in board that takes a list of ships and checks if more than 2 are
-        # near each other
-        for ship1 in ship_list:
-            for ship2 in ship_list[ship_list.index(ship1) + 1:]:
-                if ship1.is_near_ship(ship2):
-                    return True
+    def __init__(self,
+                 size_x: int = None,
+                 size_y: int = None,
+                 dict_number_ships_per_length: Dict[int, int] = None,
+                 rng: random.Random = None):
+        """
+        Board whose ships are generated randomly.
+        :param size_x: length of the board along the x axis, Board.SIZE_X if None
+        :param size_y: length of the board along the y axis, Board.SIZE_Y if None
+        :param dict_number_ships_per_length: dict length -> number of ships of that length,
+        Board.DICT_NUMBER_SHIPS_PER_LENGTH if None
+        :param rng: random generator used to place the ships, a new one seeded from the system if None
+        """
+        self.rng = rng if rng is not None else random.Random()
 
-        return False
+        # the dimensions are needed before generating the ships
+        self.set_dimensions(size_x, size_y, dict_number_ships_per_length)
 
-    def generate_ship(self, size, taken_coordinates) -> Ship:
-        # Method that generates a ship of specific size, while making sure it does not conflict
-        # with the coordinates of other ships defined in an array called taken_coordinates.
-
-        # Loops until it finds a ship that fits all the selection criteria (coordinates in bounds of board, no conflicts)
-
-        while (1):
-            # seedx and seedy are random coordinates that act as seed from which ship grows either backwards or downwards
-            seedx = random.randint(1, 10)
-            seedy = random.randint(1, 10)
-            # array that stores coordinates of ship so they can be checked against taken_coordinates later
-            ship_coords = []
-            # offset is the offset from seed representing the size of the ship
-            offset = size - 1
-
-            # first randomly selects vertical or horizontal
-            if random.choice([True, False]):  # True = Horizontal, False = Vertical
-                if 1 <= seedx - offset <= 9:  # checks if ships start position (seed - offset) is on the board
-                    # defines start and end coordinates, and adds them to ship_coords
-                    xstart = seedx - offset
-                    xend = seedx
-                    ystart = seedy
-                    yend = seedy
-                    for coord in range((seedx - offset), seedx + 1):
-                        coordinates = (coord, seedy)
-                        ship_coords.append(coordinates)
-                else:  # start coordinate for ship is outside board, starts loop again
-                    continue
-            else:
-                if 1 <= seedy - offset <= 9:  # checks if ships start position (seed - offset) is on the board
-                    # defines start and end coordinates, and adds them to ship_coords
-                    xstart = seedx
-                    xend = seedx
-                    ystart = seedy - offset
-                    yend = seedy
-                    for coord in range((seedy - offset), seedy + 1):
-                        coordinates = (seedx, coord)
-                        ship_coords.append(coordinates)
-                else:  # start coordinate for ship is outside board, starts loop again
-                    continue
-
-            # checks if coordinates of ship conflict with other previously created ships
-            coords_taken = False
-            for coord in ship_coords:
-                if coord in taken_coordinates:
-                    coords_taken = True
-
-            if not coords_taken:  # if no conflict exists, creates ship and adds coordinates to taken_coordinates
-                for coord in ship_coords:
-                    taken_coordinates.add(coord)
-                GeneratedShip = Ship(coord_start=(xstart, ystart), coord_end=(xend, yend))
-                break  # selection criteria met, exits loop
-            else:
-                continue  # if conflict exists, starts loop again
+        super().__init__(list_ships=self.generate_ships_automatically(),
+                         size_x=size_x,
+                         size_y=size_y,
+                         dict_number_ships_per_length=dict_number_ships_per_length)
 
-        return GeneratedShip
+    # number of random guesses tried before looking for a legal position exhaustively (see _pick_random_bit)
+    NUMBER_GUESSES_RANDOM_BIT = 16
+
+    # The search for a placement would be exhaustive, so its time is bounded: after this number of backtracks, the
+    # generation starts again from an empty board (a bad start can rarely be fixed by small changes), and it gives up
+    # after NUMBER_ATTEMPTS_MAXIMUM attempts
+    NUMBER_BACKTRACKS_PER_ATTEMPT = 1000
+    NUMBER_ATTEMPTS_MAXIMUM = 10
+
+    # number of times the last generation of the ships had to move back to a previous ship
+    number_backtracks = 0
+
+    def generate_ship(self, size: int, list_masks_candidates: List[int]) -> Ship:
+        """
+        Picks a random position among the legal positions of a ship of length size. The position picked is removed from
+        the candidates, so that it is not picked again if the generation needs to backtrack.
+        :param size: length of the ship to generate
+        :param list_masks_candidates: [mask_horizontal, mask_vertical] as returned by get_masks_legal_positions
+        :return: the generated ship
+        """
+        mask_horizontal, mask_vertical = list_masks_candidates
+        number_horizontal = bin(mask_horizontal).count('1')
+        number_vertical = bin(mask_vertical).count('1')
+
+        # each legal position has the same probability of being picked
+        if self.rng.randrange(number_horizontal + number_vertical) < number_horizontal:
+            index_start = self._pick_random_bit(mask_horizontal, number_horizontal)
+            list_masks_candidates[0] ^= 1 << index_start
+            x_start, y_start = self.get_coordinates_from_index_cell(index_start)
+            return Ship(coord_start=(x_start, y_start), coord_end=(x_start + size - 1, y_start))
+        else:
+            index_start = self._pick_random_bit(mask_vertical, number_vertical)
+            list_masks_candidates[1] ^= 1 << index_start
+            x_start, y_start = self.get_coordinates_from_index_cell(index_start)
+            return Ship(coord_start=(x_start, y_start), coord_end=(x_start, y_start + size - 1))
 
     def generate_ships_automatically(self) -> List[Ship]:
         """
         :return: A list of automatically (randomly) generated ships for the board
+        :raise ValueError: if the ships cannot be placed on the board, or could not be placed within the bounded number
+        of backtracks
+        """
+        list_lengths = []
+        for length, number_ships in sorted(self.DICT_NUMBER_SHIPS_PER_LENGTH.items(), reverse=True):
+            list_lengths.extend([length] * number_ships)
+
+        if not self._can_fleet_fit(list_lengths):
+            raise ValueError("The ships cannot be placed on the board without being too close.")
+
+        self.number_backtracks = 0
+        for _ in range(self.NUMBER_ATTEMPTS_MAXIMUM):
+            ship_list = self._generate_ships_attempt(list_lengths)
+            if ship_list is not None:
+                return ship_list
+
+        raise ValueError(f"The ships could not be placed on the board after {self.number_backtracks} backtracks.")
+
+    def _generate_ships_attempt(self, list_lengths: List[int]) -> Optional[List[Ship]]:
+        """
+        :param list_lengths: lengths of the ships to place, longest first
+        :return: the ships placed, None if NUMBER_BACKTRACKS_PER_ATTEMPT backtracks were not enough
+        :raise ValueError: if all the placements were tried, i.e. the ships cannot be placed on the board
+        """
+        # Places the ships one by one (longest first), only at legal positions: the cells taken by the ships
+        # already placed and their surrounding cells are kept in a mask of forbidden cells.
+        # If a ship cannot be placed anymore, the previous ship is moved to its next candidate position
+        # (backtracking). As each position is tried at most once per state, the search always terminates.
+        ship_list = []
+        number_backtracks_attempt = 0
+        # one item per ship being placed: (mask of forbidden cells before placing it, its remaining candidates)
+        list_states = []
+        mask_forbidden = 0
+
+        while len(ship_list) < len(list_lengths):
+            length = list_lengths[len(ship_list)]
+
+            if len(list_states) == len(ship_list):
+                list_states.append((mask_forbidden, list(self.get_masks_legal_positions(length, mask_forbidden))))
+
+            mask_forbidden_before, list_masks_candidates = list_states[-1]
+
+            if not any(list_masks_candidates):  # no legal position left: backtracks
+                list_states.pop()
+                if not ship_list:
+                    raise ValueError("The ships cannot be placed on the board without being too close.")
+                ship_list.pop()
+                self.number_backtracks += 1
+                number_backtracks_attempt += 1
+                if number_backtracks_attempt >= self.NUMBER_BACKTRACKS_PER_ATTEMPT:
+                    return None
+                continue
+
+            ship = self.generate_ship(length, list_masks_candidates)
+            ship_list.append(ship)
+            mask_forbidden = mask_forbidden_before | self.get_mask_surrounding_ship(ship)
+
+        return ship_list
+
+    def _can_fleet_fit(self, list_lengths: List[int]) -> bool:
+        """
+        Necessary conditions for the ships to fit on the board, checked in a time linear in the number of ships.
+        Each ship with the cells at its right and below it (its half of the spacing) takes a rectangle of
+        (length + 1) x 2 cells of the board extended by one column and one row, and these rectangles cannot overlap:
+        - their total area is at most the area of the extended board
+        - each one covers at least (length + 1) // 2 of the cells of the extended board whose coordinates are both even,
+        which rejects the crowded fleets too (e.g. 10 ships of length 1 on a 6x6 board, on which at most 9 fit)
+        :return: False if the ships certainly cannot be placed, True if they may be
+        """
+        for length in list_lengths:
+            if length > max(self.SIZE_X, self.SIZE_Y):
+                return False
+        area_needed = sum(2 * (length + 1) for length in list_lengths)
+        if area_needed > (self.SIZE_X + 1) * (self.SIZE_Y + 1):
+            return False
+        number_cells_even_needed = sum((length + 1) // 2 for length in list_lengths)
+        return number_cells_even_needed <= ((self.SIZE_X + 1) // 2) * ((self.SIZE_Y + 1) // 2)
+
+    def get_masks_legal_positions(self, length: int, mask_forbidden: int) -> Tuple[int, int]:
+        """
+        :param length: length of the ship to place
+        :param mask_forbidden: bitboard of the cells on which no ship can be placed
+        :return: a tuple of bitboards (mask_horizontal, mask_vertical) in which a bit is set if and only if a ship of
+        that length can start at that cell (and go rightwards, resp. downwards) without covering a forbidden cell.
+        """
+        mask_free = ~mask_forbidden & ((1 << (self.SIZE_X * self.SIZE_Y)) - 1)
+        mask_horizontal, mask_vertical = mask_free, mask_free
+
+        # a ship can start at a cell if the length - 1 following cells are free too
+        for offset in range(1, length):
+            mask_horizontal &= mask_free >> offset
+            mask_vertical &= mask_free >> (offset * self.SIZE_X)
+
+        mask_horizontal &= self._get_mask_columns(self.SIZE_X - length + 1)
+        mask_vertical &= (1 << (max(self.SIZE_Y - length + 1, 0) * self.SIZE_X)) - 1
+
+        if length == 1:  # both orientations give the same ship
+            mask_vertical = 0
+
+        return mask_horizontal, mask_vertical
+
+    def get_mask_surrounding_ship(self, ship: Ship) -> int:
+        """
+        :param ship: object of class Ship placed on the board
+        :return: the bitboard of the cells of the ship and of all the cells near it
         """
-        # Generates 5 ships of specific lengths, loops until it finds a configuration
-        # such that no more than 2 ships are close to each other
+        x_start, x_end = max(ship.x_start - 1, 1), min(ship.x_end + 1, self.SIZE_X)
+        y_start, y_end = max(ship.y_start - 1, 1), min(ship.y_end + 1, self.SIZE_Y)
 
-        while (1):
-            ship_list = []
-            occupied_coordinates = set()
+        mask_row = ((1 << (x_end - x_start + 1)) - 1) << (x_start - 1)
+        mask_surrounding = 0
+        for y in range(y_start, y_end + 1):
+            mask_surrounding |= mask_row << ((y - 1) * self.SIZE_X)
 
-            for length, number_ships in self.DICT_NUMBER_SHIPS_PER_LENGTH.items():
-                for instances in range(0, number_ships):
-                    Generated_ship = self.generate_ship(length, occupied_coordinates)
-                    ship_list.append(Generated_ship)
+        return mask_surrounding
 
-            if self.ships_too_close(ship_list):  # checks if no more than two ships are close to each other
-                continue  # continues loop if criterion is not met
+    def _get_mask_columns(self, number_columns: int) -> int:
+        """
+        :return: the bitboard in which only the cells of the first number_columns columns are set
+        """
+        if number_columns <= 0:
+            return 0
+
+        # the row is copied with a doubling scheme, which only needs log(SIZE_Y) operations
+        mask_columns = (1 << number_columns) - 1
+        number_rows = 1
+        while number_rows < self.SIZE_Y:
+            mask_columns |= mask_columns << (number_rows * self.SIZE_X)
+            number_rows *= 2
+
+        return mask_columns & ((1 << (self.SIZE_X * self.SIZE_Y)) - 1)
+
+    def _pick_random_bit(self, mask: int, number_bits: int) -> int:
+        """
+        :param mask: non-zero bitboard
+        :param number_bits: number of bits set in mask
+        :return: the index of a bit of mask picked uniformly at random
+        """
+        # on large boards with many candidates, guessing is much faster than walking through the bits
+        for _ in range(self.NUMBER_GUESSES_RANDOM_BIT):
+            index_guess = self.rng.randrange(mask.bit_length())
+            if mask >> index_guess & 1:
+                return index_guess
+
+        for _ in range(self.rng.randrange(number_bits)):
+            mask &= mask - 1  # removes the lowest bit
+        return (mask & -mask).bit_length() - 1
+
+
+class BoardSparseAutomatic(BoardSparse, BoardAutomatic):
+    """
+    Large sparse board whose ships are generated randomly.
+    """
+    # number of random positions tried for each ship before switching to the exhaustive generation
+    NUMBER_GUESSES_PER_SHIP = 100
+
+    def generate_ships_automatically(self) -> List[Ship]:
+        """
+        :return: A list of automatically (randomly) generated ships for the board
+        :raise ValueError: if the ships cannot be placed on the board
+        """
+        # On a large sparse board, almost any random position is legal: the positions are guessed and checked against
+        # the set of forbidden cells, which avoids building bitboards as large as the board.
+        # If the board is too crowded for guessing, the exhaustive generation of BoardAutomatic is used instead.
+        list_lengths = []
+        for length, number_ships in sorted(self.DICT_NUMBER_SHIPS_PER_LENGTH.items(), reverse=True):
+            list_lengths.extend([length] * number_ships)
+
+        ship_list = []
+        set_coordinates_forbidden = set()
+
+        for length in list_lengths:
+            for _ in range(self.NUMBER_GUESSES_PER_SHIP):
+                ship = self._guess_ship(length)
+                if ship is not None and set_coordinates_forbidden.isdisjoint(ship.get_all_coordinates()):
+                    break
             else:
-                break  # breaks loop if criterion is met
+                return super().generate_ships_automatically()
+
+            ship_list.append(ship)
+            for x in range(ship.x_start - 1, ship.x_end + 2):
+                for y in range(ship.y_start - 1, ship.y_end + 2):
+                    set_coordinates_forbidden.add((x, y))
 
         return ship_list
 
+    def _guess_ship(self, length: int) -> Optional[Ship]:
+        """
+        :return: a ship of that length at a random position on the board, None if the ship does not fit
+        """
+        if self.rng.choice([True, False]):  # True = Horizontal, False = Vertical
+            if length > self.SIZE_X:
+                return None
+            x_start = self.rng.randint(1, self.SIZE_X - length + 1)
+            y_start = self.rng.randint(1, self.SIZE_Y)
+            return Ship(coord_start=(x_start, y_start), coord_end=(x_start + length - 1, y_start))
+        else:
+            if length > self.SIZE_Y:
+                return None
+            x_start = self.rng.randint(1, self.SIZE_X)
+            y_start = self.rng.randint(1, self.SIZE_Y - length + 1)
+            return Ship(coord_start=(x_start, y_start), coord_end=(x_start, y_start + length - 1))
+
 
 if __name__ == '__main__':
     # SANDBOX for you to play and test your functions
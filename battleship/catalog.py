@@ -0,0 +1,365 @@
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from battleship.board import Board
+from battleship.ship import Ship
+
+# The cache files are written in this directory, unless the environment variable below is set
+NAME_ENVIRONMENT_VARIABLE_CACHE_DIRECTORY = 'BATTLESHIP_CACHE_DIRECTORY'
+DEFAULT_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), 'battleship_catalog')
+
+# The conflict bitsets have number_placements ** 2 bits, so the catalog is restricted to reasonably small boards
+MAXIMUM_NUMBER_CELLS = 64 * 64
+# Total size of the cache files: the files used the least recently are removed when a new file makes the cache larger
+MAXIMUM_SIZE_CACHE = 256 * 1024 * 1024
+
+MAGIC_NUMBER = b'BSPC'
+VERSION_FORMAT = 2
+
+# magic number, version, size_x, size_y, length, number_placements, bytes per cell mask, bytes per conflict bitset,
+# size of the file, CRC-32 of the file after the header
+STRUCT_HEADER = struct.Struct('<4sHHHHIIIQI')
+STRUCT_PLACEMENT = struct.Struct('<HHHH')
+STRUCT_INDEX = struct.Struct('<I')
+
+
+class PlacementCatalog(object):
+    """
+    All the legal placements of a ship of a given length on a board of a given size, enumerated once and stored in a
+    memory-mapped cache file. Every lookup is done in O(1) in that file.
+
+    The placements are numbered: first the horizontal ones, then the vertical ones, each time row by row.
+    For each placement, the file contains:
+    - its coordinates (x_start, y_start, x_end, y_end)
+    - the bitboard of its cells and the bitboard of its cells and their surrounding cells (same bit numbering as Board)
+    - the bitset of the placements (of the same catalog) conflicting with it, i.e. overlapping it or too close from it
+    The file also contains, for every cell, the indexes of the placements covering it.
+    The header of the file holds the size of the board, the length, the version of the format and a checksum: a file
+    which does not match them (written by another version, truncated, corrupted) is written again.
+    """
+
+    def __init__(self,
+                 size_x: int,
+                 size_y: int,
+                 length: int,
+                 path_cache_directory: str = None):
+        """
+        :param size_x: length of the board along the x axis
+        :param size_y: length of the board along the y axis
+        :param length: length of the ships placed
+        :param path_cache_directory: directory of the cache files, see get_path_cache_directory if None
+        :raise ValueError: if the board is too large for a catalog
+        """
+        if size_x * size_y > MAXIMUM_NUMBER_CELLS:
+            raise ValueError(f"The placement catalog only supports boards of at most {MAXIMUM_NUMBER_CELLS} cells.")
+
+        self.size_x = size_x
+        self.size_y = size_y
+        self.length = length
+
+        if path_cache_directory is None:
+            path_cache_directory = get_path_cache_directory()
+        self.path_file = os.path.join(path_cache_directory, f'placements_{size_x}x{size_y}_{length}.bin')
+
+        self._mmap = self._open_file()
+        if self._mmap is None:
+            os.makedirs(path_cache_directory, exist_ok=True)
+            self._write_file()
+            _remove_files_least_recently_used(path_cache_directory, MAXIMUM_SIZE_CACHE, self.path_file)
+            self._mmap = self._open_file()
+            if self._mmap is None:
+                raise ValueError(f"The cache file {self.path_file} is not a valid placement catalog.")
+
+        _, _, _, _, _, self.number_placements, self._number_bytes_mask, self._number_bytes_conflicts, _, _ = \
+            STRUCT_HEADER.unpack_from(self._mmap, 0)
+
+        # offsets of the sections of the file
+        self._offset_placements = STRUCT_HEADER.size
+        self._offset_masks_cells = self._offset_placements + self.number_placements * STRUCT_PLACEMENT.size
+        self._offset_masks_surrounding = self._offset_masks_cells + self.number_placements * self._number_bytes_mask
+        self._offset_conflicts = self._offset_masks_surrounding + self.number_placements * self._number_bytes_mask
+        self._offset_cells = self._offset_conflicts + self.number_placements * self._number_bytes_conflicts
+        self._offset_indexes_per_cell = self._offset_cells + (size_x * size_y + 1) * STRUCT_INDEX.size
+
+    def __len__(self):
+        return self.number_placements
+
+    def get_placement(self, index_placement: int) -> Tuple[int, int, int, int]:
+        """
+        :return: the coordinates (x_start, y_start, x_end, y_end) of the placement
+        """
+        return STRUCT_PLACEMENT.unpack_from(self._mmap, self._offset_placements
+                                            + index_placement * STRUCT_PLACEMENT.size)
+
+    def get_ship(self, index_placement: int) -> Ship:
+        """
+        :return: a new Ship at the placement
+        """
+        x_start, y_start, x_end, y_end = self.get_placement(index_placement)
+        return Ship(coord_start=(x_start, y_start), coord_end=(x_end, y_end))
+
+    def get_mask_cells(self, index_placement: int) -> int:
+        """
+        :return: the bitboard of the cells of the placement
+        """
+        return self._get_int(self._offset_masks_cells, index_placement, self._number_bytes_mask)
+
+    def get_mask_surrounding(self, index_placement: int) -> int:
+        """
+        :return: the bitboard of the cells of the placement and of all the cells near it
+        """
+        return self._get_int(self._offset_masks_surrounding, index_placement, self._number_bytes_mask)
+
+    def get_mask_conflicts(self, index_placement: int, catalog_other: 'PlacementCatalog' = None) -> int:
+        """
+        :param index_placement: index of a placement of this catalog
+        :param catalog_other: catalog of the placements of ships of another length on the same board, this catalog if
+        None
+        :return: the bitset in which bit j is set if and only if the placement j of catalog_other conflicts with this
+        placement, i.e. overlaps it or is too close from it
+        """
+        if catalog_other is None or catalog_other.length == self.length:
+            return self._get_int(self._offset_conflicts, index_placement, self._number_bytes_conflicts)
+
+        if (catalog_other.size_x, catalog_other.size_y) != (self.size_x, self.size_y):
+            raise ValueError("The placements of catalogs of boards of different sizes cannot conflict.")
+
+        # the bitsets of the file only cover the placements of this catalog: the placements of the other one covering a
+        # cell of the placement or near it are looked up cell by cell
+        mask_conflicts = 0
+        for index_cell in _get_tuple_indexes_bits(self.get_mask_surrounding(index_placement)):
+            for index_other_placement in catalog_other.get_indexes_placements_at(index_cell % self.size_x + 1,
+                                                                                   index_cell // self.size_x + 1):
+                mask_conflicts |= 1 << index_other_placement
+        return mask_conflicts
+
+    def get_indexes_placements_at(self, coord_x: int, coord_y: int) -> List[int]:
+        """
+        :return: the indexes of all the placements covering the cell (coord_x, coord_y)
+        """
+        index_cell = (coord_y - 1) * self.size_x + coord_x - 1
+        start, = STRUCT_INDEX.unpack_from(self._mmap, self._offset_cells + index_cell * STRUCT_INDEX.size)
+        end, = STRUCT_INDEX.unpack_from(self._mmap, self._offset_cells + (index_cell + 1) * STRUCT_INDEX.size)
+        return [index for index, in STRUCT_INDEX.iter_unpack(
+            self._mmap[self._offset_indexes_per_cell + start * STRUCT_INDEX.size:
+                       self._offset_indexes_per_cell + end * STRUCT_INDEX.size])]
+
+    def _open_file(self) -> Optional[mmap.mmap]:
+        """
+        :return: the cache file mapped in memory, None if it does not exist or does not match its header
+        """
+        try:
+            with open(self.path_file, 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # ValueError: empty file
+            return None
+
+        if len(data) >= STRUCT_HEADER.size:
+            magic_number, version, size_x, size_y, length, _, _, _, size_file, checksum = \
+                STRUCT_HEADER.unpack_from(data, 0)
+            if magic_number == MAGIC_NUMBER and version == VERSION_FORMAT \
+                    and (size_x, size_y, length) == (self.size_x, self.size_y, self.length) \
+                    and size_file == len(data) and checksum == zlib.crc32(memoryview(data)[STRUCT_HEADER.size:]):
+                try:
+                    os.utime(self.path_file)  # the files used recently are the last ones removed from the cache
+                except OSError:
+                    pass
+                return data
+
+        data.close()
+        return None
+
+    def _get_int(self, offset_section: int, index_placement: int, number_bytes: int) -> int:
+        offset = offset_section + index_placement * number_bytes
+        return int.from_bytes(self._mmap[offset:offset + number_bytes], 'little')
+
+    def _write_file(self) -> None:
+        """
+        Enumerates the placements and writes the cache file.
+        The file is written under a temporary name first, so that concurrent processes never read a partial file.
+        """
+        list_placements = enumerate_placements(self.size_x, self.size_y, self.length)
+        number_cells = self.size_x * self.size_y
+        number_bytes_mask = (number_cells + 7) // 8
+        number_bytes_conflicts = (len(list_placements) + 7) // 8
+
+        list_masks_cells = []
+        list_masks_surrounding = []
+        list_indexes_per_cell = [[] for _ in range(number_cells)]
+
+        for index_placement, (x_start, y_start, x_end, y_end) in enumerate(list_placements):
+            mask_cells = 0
+            for x in range(x_start, x_end + 1):
+                for y in range(y_start, y_end + 1):
+                    index_cell = (y - 1) * self.size_x + x - 1
+                    mask_cells |= 1 << index_cell
+                    list_indexes_per_cell[index_cell].append(index_placement)
+
+            mask_surrounding = 0
+            for x in range(max(x_start - 1, 1), min(x_end + 1, self.size_x) + 1):
+                for y in range(max(y_start - 1, 1), min(y_end + 1, self.size_y) + 1):
+                    mask_surrounding |= 1 << ((y - 1) * self.size_x + x - 1)
+
+            list_masks_cells.append(mask_cells)
+            list_masks_surrounding.append(mask_surrounding)
+
+        # two placements conflict if one of them covers a cell surrounding the other one
+        list_masks_conflicts = []
+        for index_placement, mask_surrounding in enumerate(list_masks_surrounding):
+            mask_conflicts = 0
+            while mask_surrounding:
+                lowest_bit = mask_surrounding & -mask_surrounding
+                for index_other_placement in list_indexes_per_cell[lowest_bit.bit_length() - 1]:
+                    mask_conflicts |= 1 << index_other_placement
+                mask_surrounding ^= lowest_bit
+            list_masks_conflicts.append(mask_conflicts)
+
+        list_parts = []
+        for placement in list_placements:
+            list_parts.append(STRUCT_PLACEMENT.pack(*placement))
+        for mask in list_masks_cells + list_masks_surrounding:
+            list_parts.append(mask.to_bytes(number_bytes_mask, 'little'))
+        for mask in list_masks_conflicts:
+            list_parts.append(mask.to_bytes(number_bytes_conflicts, 'little'))
+
+        index_start = 0
+        list_parts.append(STRUCT_INDEX.pack(index_start))
+        for list_indexes in list_indexes_per_cell:
+            index_start += len(list_indexes)
+            list_parts.append(STRUCT_INDEX.pack(index_start))
+        for list_indexes in list_indexes_per_cell:
+            for index_placement in list_indexes:
+                list_parts.append(STRUCT_INDEX.pack(index_placement))
+        data = b''.join(list_parts)
+
+        path_file_temporary = f'{self.path_file}.{os.getpid()}.tmp'
+        with open(path_file_temporary, 'wb') as file:
+            file.write(STRUCT_HEADER.pack(MAGIC_NUMBER, VERSION_FORMAT, self.size_x, self.size_y, self.length,
+                                          len(list_placements), number_bytes_mask, number_bytes_conflicts,
+                                          STRUCT_HEADER.size + len(data), zlib.crc32(data)))
+            file.write(data)
+
+        os.replace(path_file_temporary, self.path_file)
+
+
+def enumerate_placements(size_x: int, size_y: int, length: int) -> List[Tuple[int, int, int, int]]:
+    """
+    :return: the list of all the placements (x_start, y_start, x_end, y_end) of a ship of that length on the board,
+    horizontal ones first, then vertical ones, each time row by row.
+    """
+    list_placements = []
+
+    for y in range(1, size_y + 1):
+        for x in range(1, size_x - length + 2):
+            list_placements.append((x, y, x + length - 1, y))
+
+    if length > 1:  # both orientations give the same ship for a length of 1
+        for y in range(1, size_y - length + 2):
+            for x in range(1, size_x + 1):
+                list_placements.append((x, y, x, y + length - 1))
+
+    return list_placements
+
+
+def _remove_files_least_recently_used(path_cache_directory: str, size_maximum: int, path_file_kept: str) -> None:
+    """
+    Removes the cache files used the least recently until the cache holds at most size_maximum bytes, except
+    path_file_kept. The files mapped by other processes stay readable by them until they close them (except on Windows,
+    where they are not removed).
+    """
+    list_files = []
+    for entry in os.scandir(path_cache_directory):
+        if entry.name.startswith('placements_') and entry.name.endswith('.bin') and entry.is_file():
+            stat = entry.stat()
+            list_files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    size_cache = sum(size for _, size, _ in list_files)
+    for _, size, path_file in sorted(list_files):
+        if size_cache <= size_maximum:
+            break
+        if os.path.abspath(path_file) == os.path.abspath(path_file_kept):
+            continue
+        try:
+            os.remove(path_file)
+        except OSError:
+            continue
+        size_cache -= size
+
+
+def get_path_cache_directory() -> str:
+    """
+    :return: the directory of the cache files of the catalogs
+    """
+    return os.environ.get(NAME_ENVIRONMENT_VARIABLE_CACHE_DIRECTORY, DEFAULT_CACHE_DIRECTORY)
+
+
+# catalogs already opened in this process: (size_x, size_y, length) -> PlacementCatalog
+_dict_catalogs = {}  # type: Dict[Tuple[int, int, int], PlacementCatalog]
+
+
+def get_placement_catalog(length: int,
+                          size_x: int = Board.SIZE_X,
+                          size_y: int = Board.SIZE_Y) -> PlacementCatalog:
+    """
+    :return: the catalog of the placements of a ship of that length, opened only once per process
+    """
+    key = (size_x, size_y, length)
+    if key not in _dict_catalogs:
+        _dict_catalogs[key] = PlacementCatalog(size_x, size_y, length)
+    return _dict_catalogs[key]
+
+
+class PlacementTables(object):
+    """
+    Lookup tables of a placement catalog as Python lists, for the strategies updating many placements per move:
+    - list_cells_per_placement[index_placement]: indexes of the cells of the placement
+    - list_placements_per_cell[index_cell]: indexes of the placements covering the cell
+    - list_placements_near_cell[index_cell]: indexes of the placements not covering the cell but too close from it
+    The cells are indexed as in Board.get_index_cell.
+    """
+
+    def __init__(self, catalog: PlacementCatalog):
+        number_cells = catalog.size_x * catalog.size_y
+
+        self.number_placements = len(catalog)
+        self.list_cells_per_placement = []  # type: List[Tuple[int, ...]]
+        self.list_placements_per_cell = [[] for _ in range(number_cells)]  # type: List[List[int]]
+        self.list_placements_near_cell = [[] for _ in range(number_cells)]  # type: List[List[int]]
+
+        for index_placement in range(self.number_placements):
+            mask_cells = catalog.get_mask_cells(index_placement)
+            tuple_cells = _get_tuple_indexes_bits(mask_cells)
+            self.list_cells_per_placement.append(tuple_cells)
+            for index_cell in tuple_cells:
+                self.list_placements_per_cell[index_cell].append(index_placement)
+            for index_cell in _get_tuple_indexes_bits(catalog.get_mask_surrounding(index_placement) & ~mask_cells):
+                self.list_placements_near_cell[index_cell].append(index_placement)
+
+
+def _get_tuple_indexes_bits(mask: int) -> Tuple[int, ...]:
+    list_indexes = []
+    while mask:
+        lowest_bit = mask & -mask
+        list_indexes.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+    return tuple(list_indexes)
+
+
+# tables already built in this process: (size_x, size_y, length) -> PlacementTables
+_dict_tables = {}  # type: Dict[Tuple[int, int, int], PlacementTables]
+
+
+def get_placement_tables(length: int,
+                         size_x: int = Board.SIZE_X,
+                         size_y: int = Board.SIZE_Y) -> PlacementTables:
+    """
+    :return: the lookup tables of the placements of a ship of that length, built only once per process
+    """
+    key = (size_x, size_y, length)
+    if key not in _dict_tables:
+        _dict_tables[key] = PlacementTables(get_placement_catalog(length, size_x, size_y))
+    return _dict_tables[key]
@@ -0,0 +1,471 @@
+import random
+import struct
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from battleship.board import Board, BoardSparse
+from battleship.game import Game
+from battleship.player import Player, PlayerAutomatic, PlayerProbability, PlayerRandom
+from battleship.ship import Ship
+
+# Checkpoints of games in progress, to pause a game and resume it later, in another process for instance.
+# A checkpoint is a few hundred bytes of fixed-size fields and arrays (plus 2.5 kB per random generator, if their
+# states are included): saving or loading it takes microseconds, no graph of objects is pickled.
+# The arrays are stored in the byte order of the machine.
+#
+# Layout of a game checkpoint:
+# - header: magic number, version, flags
+# - game: index of the player starting, index of the player whose turn it is, the shots (cell attacked and outcome)
+# - board of player_1, board of player_2: fleet composition, ships, shots received
+# - player_1, player_2: name, state of the random generator (if FLAG_STATES_RNG), state of the strategy
+# - state of the random generator of the game (if FLAG_STATES_RNG)
+
+MAGIC_NUMBER = b'BSCP'
+VERSION_FORMAT = 3
+
+# the states of the random generators are included, so that the game resumes exactly as it would have gone on
+FLAG_STATES_RNG = 1
+
+# the bitboards of the shots are stored for the dense boards, the indices of the cells attacked for the sparse ones
+KIND_BOARD_DENSE = 0
+KIND_BOARD_SPARSE = 1
+
+# flags of a shot
+FLAG_SHOT_PLAYER_2 = 1
+FLAG_SHOT_HIT = 2
+FLAG_SHOT_SUNK = 4
+
+# magic number, version, flags
+STRUCT_HEADER = struct.Struct('<4sHB')
+# index of the player starting (0 if the game has not started), index of the player whose turn it is, number of shots
+STRUCT_GAME = struct.Struct('<BBI')
+# kind of board, size_x, size_y, number of lengths of the fleet composition, number of ships
+STRUCT_BOARD = struct.Struct('<BHHHH')
+# length, number of ships of that length
+STRUCT_LENGTH = struct.Struct('<HH')
+# x_start, y_start, x_end, y_end
+STRUCT_SHIP = struct.Struct('<HHHH')
+# number of items of a sequence that follows
+STRUCT_SIZE = struct.Struct('<I')
+# has the Gaussian generator a value pending, the value
+STRUCT_GAUSS = struct.Struct('<?d')
+# are the free positions of a PlayerRandom initialised (no position free is not the positions yet to be initialised),
+# number of positions free
+STRUCT_POSITIONS_FREE = struct.Struct('<?I')
+# size_x, size_y (0 if the densities have not been initialised), number of lengths
+STRUCT_PROBABILITY = struct.Struct('<HHH')
+
+VERSION_STATE_RNG = 3  # version of the states of random.Random, the Mersenne Twister
+
+
+# Functions (dump, load) saving and restoring the state of the strategy of each class of players:
+# dump(player, opponent) -> bytes, load(player, opponent, data) -> None.
+# The classes not listed (e.g. PlayerUser) have no state to save. A subclass uses the functions of its closest parent.
+_dict_functions_state_per_class = {}  # type: Dict[type, Tuple[Callable, Callable]]
+
+
+def dump_board(board: Board) -> bytes:
+    """
+    :param board: board, possibly attacked
+    :return: the checkpoint of the board: its dimensions and fleet composition, its ships and the shots it received
+    """
+    list_parts = []
+    _dump_board(board, list_parts)
+    return b''.join(list_parts)
+
+
+def load_board(data: bytes) -> Board:
+    """
+    :param data: checkpoint made by dump_board
+    :return: a new board in the state saved: a Board, or a BoardSparse if a sparse board was saved
+    """
+    board, _ = _load_board(data, 0)
+    return board
+
+
+def dump_player_state(player: Player, opponent: Player) -> bytes:
+    """
+    :param player: player whose strategy state is saved (positions attacked, ship being hunted, densities...)
+    :param opponent: player attacked by that player, giving the dimensions of the board attacked
+    :return: the state of the strategy, empty if the class of the player has no state
+    """
+    functions_state = _get_functions_state(type(player))
+    if functions_state is None:
+        return b''
+    return functions_state[0](player, opponent)
+
+
+def load_player_state(player: Player, opponent: Player, data: bytes) -> None:
+    """
+    Restores the state of the strategy of a player, which must be of the class of the player saved.
+    :param data: state made by dump_player_state
+    """
+    functions_state = _get_functions_state(type(player))
+    if functions_state is not None and data:
+        functions_state[1](player, opponent, data)
+
+
+def dump_game(game: Game, with_states_rng: bool = True) -> bytes:
+    """
+    :param game: game, started or not, between two attacks
+    :param with_states_rng: if True, the states of the random generators of the game and of the players are included,
+    so that the game resumes exactly as it would have gone on. They take 2.5 kB each.
+    :return: the checkpoint of the game
+    """
+    player_1, player_2 = game.player_1, game.player_2
+    list_shots = game.list_shots
+
+    index_player_turn = 0
+    if game.player_turn is not None:
+        index_player_turn = 1 if game.player_turn is player_1 else 2
+
+    list_parts = [STRUCT_HEADER.pack(MAGIC_NUMBER, VERSION_FORMAT, FLAG_STATES_RNG if with_states_rng else 0),
+                  STRUCT_GAME.pack(game.index_player_starting or 0, index_player_turn, len(list_shots))]
+
+    # the cell of each shot is numbered on the board attacked, i.e. the board of the opponent of the player attacking
+    size_x_1, size_x_2 = player_1.board.SIZE_X, player_2.board.SIZE_X
+    list_parts.append(array('I', [(coord_y - 1) * (size_x_2 if index_player == 1 else size_x_1) + coord_x - 1
+                                  for index_player, coord_x, coord_y, _, _ in list_shots]).tobytes())
+    list_parts.append(bytes([(index_player == 2) * FLAG_SHOT_PLAYER_2 + is_ship_hit * FLAG_SHOT_HIT
+                             + has_ship_sunk * FLAG_SHOT_SUNK
+                             for index_player, _, _, is_ship_hit, has_ship_sunk in list_shots]))
+
+    _dump_board(player_1.board, list_parts)
+    _dump_board(player_2.board, list_parts)
+
+    for player, opponent in ((player_1, player_2), (player_2, player_1)):
+        bytes_name = player.name_player.encode()
+        list_parts.append(STRUCT_SIZE.pack(len(bytes_name)))
+        list_parts.append(bytes_name)
+        if with_states_rng:
+            _dump_state_rng(player.rng, list_parts)
+        state = dump_player_state(player, opponent)
+        list_parts.append(STRUCT_SIZE.pack(len(state)))
+        list_parts.append(state)
+
+    if with_states_rng:
+        _dump_state_rng(game.rng, list_parts)
+
+    return b''.join(list_parts)
+
+
+def load_game(data: bytes, game: Game) -> Game:
+    """
+    Restores a game saved by dump_game into a game whose players are of the same classes as the players saved, e.g. a
+    new game created with the same factories. The boards of the players are replaced by the boards saved, and their
+    names and strategies are restored (and their random generators, if their states were saved).
+    :param data: checkpoint made by dump_game
+    :param game: game restored
+    :return: the game restored
+    :raise ValueError: if the data is not a checkpoint of a game
+    """
+    if len(data) < STRUCT_HEADER.size:
+        raise ValueError("The data is not a checkpoint of a game.")
+    magic_number, version, flags = STRUCT_HEADER.unpack_from(data, 0)
+    if magic_number != MAGIC_NUMBER or version != VERSION_FORMAT:
+        raise ValueError("The data is not a checkpoint of a game.")
+    offset = STRUCT_HEADER.size
+
+    index_player_starting, index_player_turn, number_shots = STRUCT_GAME.unpack_from(data, offset)
+    offset += STRUCT_GAME.size
+    array_index_cells = array('I')
+    array_index_cells.frombytes(data[offset:offset + number_shots * array_index_cells.itemsize])
+    offset += number_shots * array_index_cells.itemsize
+    bytes_flags = data[offset:offset + number_shots]
+    offset += number_shots
+
+    player_1, player_2 = game.player_1, game.player_2
+    player_1.board, offset = _load_board(data, offset)
+    player_2.board, offset = _load_board(data, offset)
+
+    for player, opponent in ((player_1, player_2), (player_2, player_1)):
+        size_name, = STRUCT_SIZE.unpack_from(data, offset)
+        offset += STRUCT_SIZE.size
+        player.name_player = bytes(data[offset:offset + size_name]).decode()
+        offset += size_name
+        if flags & FLAG_STATES_RNG:
+            offset = _load_state_rng(player.rng, data, offset)
+        size_state, = STRUCT_SIZE.unpack_from(data, offset)
+        offset += STRUCT_SIZE.size
+        load_player_state(player, opponent, data[offset:offset + size_state])
+        offset += size_state
+
+    if flags & FLAG_STATES_RNG:
+        _load_state_rng(game.rng, data, offset)
+
+    game.index_player_starting = index_player_starting or None
+    if index_player_turn == 0:
+        game.player_turn, game.player_opponent = None, None
+    elif index_player_turn == 1:
+        game.player_turn, game.player_opponent = player_1, player_2
+    else:
+        game.player_turn, game.player_opponent = player_2, player_1
+
+    size_x_1, size_x_2 = player_1.board.SIZE_X, player_2.board.SIZE_X
+    game.list_shots = []
+    for index_cell, flags_shot in zip(array_index_cells, bytes_flags):
+        index_player = 2 if flags_shot & FLAG_SHOT_PLAYER_2 else 1
+        coord_y, coord_x = divmod(index_cell, size_x_2 if index_player == 1 else size_x_1)
+        game.list_shots.append((index_player, coord_x + 1, coord_y + 1,
+                                bool(flags_shot & FLAG_SHOT_HIT), bool(flags_shot & FLAG_SHOT_SUNK)))
+
+    return game
+
+
+def _dump_board(board: Board, list_parts: List[bytes]) -> None:
+    is_sparse = isinstance(board, BoardSparse)
+    dict_number_ships_per_length = board.DICT_NUMBER_SHIPS_PER_LENGTH
+
+    list_parts.append(STRUCT_BOARD.pack(KIND_BOARD_SPARSE if is_sparse else KIND_BOARD_DENSE,
+                                        board.SIZE_X,
+                                        board.SIZE_Y,
+                                        len(dict_number_ships_per_length),
+                                        len(board.list_ships)))
+    for length, number_ships in dict_number_ships_per_length.items():
+        list_parts.append(STRUCT_LENGTH.pack(length, number_ships))
+    for ship in board.list_ships:
+        list_parts.append(STRUCT_SHIP.pack(ship.x_start, ship.y_start, ship.x_end, ship.y_end))
+
+    # the damages of the ships are the shots received on the ships, they are not stored
+    if is_sparse:
+        _dump_array('I', board.set_index_cells_previous_shots, list_parts)
+    else:
+        list_parts.append(board.mask_shots.to_bytes(_get_size_bitboard(board), 'little'))
+
+
+def _load_board(data: bytes, offset: int) -> Tuple[Board, int]:
+    """
+    :return: the board saved at offset, and the offset following it
+    """
+    kind_board, size_x, size_y, number_lengths, number_ships = STRUCT_BOARD.unpack_from(data, offset)
+    offset += STRUCT_BOARD.size
+
+    dict_number_ships_per_length = {}
+    for _ in range(number_lengths):
+        length, number_ships_length = STRUCT_LENGTH.unpack_from(data, offset)
+        dict_number_ships_per_length[length] = number_ships_length
+        offset += STRUCT_LENGTH.size
+
+    list_ships = []
+    for _ in range(number_ships):
+        x_start, y_start, x_end, y_end = STRUCT_SHIP.unpack_from(data, offset)
+        list_ships.append(Ship(coord_start=(x_start, y_start), coord_end=(x_end, y_end)))
+        offset += STRUCT_SHIP.size
+
+    cls_board = BoardSparse if kind_board == KIND_BOARD_SPARSE else Board
+    board = cls_board(list_ships,
+                      size_x=size_x,
+                      size_y=size_y,
+                      dict_number_ships_per_length=dict_number_ships_per_length,
+                      check_rules=False)
+
+    if kind_board == KIND_BOARD_SPARSE:
+        array_index_cells, offset = _load_array('I', data, offset)
+        board.set_index_cells_previous_shots = set(array_index_cells)
+        for index_cell in array_index_cells:
+            index_ship = board.dict_index_ship_per_index_cell.get(index_cell)
+            if index_ship is not None:
+                list_ships[index_ship].gets_damage_at(*board.get_coordinates_from_index_cell(index_cell))
+        board.number_ships_sunk = sum(1 for ship in list_ships if ship.has_sunk())
+    else:
+        size_bitboard = _get_size_bitboard(board)
+        board.mask_shots = int.from_bytes(data[offset:offset + size_bitboard], 'little')
+        offset += size_bitboard
+        board.mask_damages = board.mask_shots & board.mask_ships
+        for ship, mask_ship in zip(list_ships, board.list_masks_ships):
+            if board.mask_damages & mask_ship:
+                _set_damages_ship(board, ship)
+
+    return board, offset
+
+
+def _set_damages_ship(board: Board, ship: Ship) -> None:
+    """
+    Sets the damages of a ship of a dense board from the bitboard of its damages
+    """
+    index_cell = board.get_index_cell(ship.x_start, ship.y_start)
+    step = 1 if ship.is_horizontal() else board.SIZE_X
+    mask_damages = board.mask_damages
+    ship.mask_damages = 0
+    for offset in range(ship.length()):
+        if mask_damages >> index_cell & 1:
+            ship.mask_damages |= 1 << offset
+        index_cell += step
+
+
+def _get_size_bitboard(board: Board) -> int:
+    return (board.SIZE_X * board.SIZE_Y + 7) // 8
+
+
+def _dump_state_rng(rng: random.Random, list_parts: List[bytes]) -> None:
+    _, tuple_state, gauss_next = rng.getstate()
+    _dump_array('I', tuple_state, list_parts)
+    list_parts.append(STRUCT_GAUSS.pack(gauss_next is not None, gauss_next or 0.))
+
+
+def _load_state_rng(rng: random.Random, data: bytes, offset: int) -> int:
+    """
+    :return: the offset following the state of the random generator
+    """
+    array_state, offset = _load_array('I', data, offset)
+    has_gauss_next, gauss_next = STRUCT_GAUSS.unpack_from(data, offset)
+    rng.setstate((VERSION_STATE_RNG, tuple(array_state), gauss_next if has_gauss_next else None))
+    return offset + STRUCT_GAUSS.size
+
+
+def _dump_array(typecode: str, values, list_parts: List[bytes]) -> None:
+    """
+    Appends the number of values, then the values as an array of that typecode
+    """
+    array_values = array(typecode, values)
+    list_parts.append(STRUCT_SIZE.pack(len(array_values)))
+    list_parts.append(array_values.tobytes())
+
+
+def _load_array(typecode: str, data: bytes, offset: int) -> Tuple[array, int]:
+    """
+    :return: the array saved by _dump_array at offset, and the offset following it
+    """
+    number_values, = STRUCT_SIZE.unpack_from(data, offset)
+    offset += STRUCT_SIZE.size
+    array_values = array(typecode)
+    array_values.frombytes(data[offset:offset + number_values * array_values.itemsize])
+    return array_values, offset + number_values * array_values.itemsize
+
+
+def _dump_positions(list_positions, size_x: int, list_parts: List[bytes]) -> None:
+    _dump_array('I', [(coord_y - 1) * size_x + coord_x - 1 for coord_x, coord_y in list_positions], list_parts)
+
+
+def _load_positions(data: bytes, offset: int, size_x: int) -> Tuple[List[Tuple[int, int]], int]:
+    array_index_cells, offset = _load_array('I', data, offset)
+    return [(index_cell % size_x + 1, index_cell // size_x + 1) for index_cell in array_index_cells], offset
+
+
+def _get_functions_state(cls: type) -> Optional[Tuple[Callable, Callable]]:
+    for cls_parent in cls.__mro__:
+        if cls_parent in _dict_functions_state_per_class:
+            return _dict_functions_state_per_class[cls_parent]
+    return None
+
+
+def _dump_state_player_automatic(player: PlayerAutomatic, opponent: Player) -> bytes:
+    # the order of the checkerboard pattern only depends on the size of the board attacked, it is not stored
+    size_x = opponent.board.SIZE_X
+    list_parts = [STRUCT_SIZE.pack(player.index_next_in_order), STRUCT_SIZE.pack(player.index_next_cell_remaining)]
+    _dump_positions(player.stack_hunt, size_x, list_parts)
+    _dump_positions(player.set_positions_previously_attacked, size_x, list_parts)
+    return b''.join(list_parts)
+
+
+def _load_state_player_automatic(player: PlayerAutomatic, opponent: Player, data: bytes) -> None:
+    size_x = opponent.board.SIZE_X
+    player.index_next_in_order, = STRUCT_SIZE.unpack_from(data, 0)
+    player.index_next_cell_remaining, = STRUCT_SIZE.unpack_from(data, STRUCT_SIZE.size)
+    player.stack_hunt, offset = _load_positions(data, 2 * STRUCT_SIZE.size, size_x)
+    list_positions_attacked, _ = _load_positions(data, offset, size_x)
+    player.set_positions_previously_attacked = set(list_positions_attacked)
+
+
+def _dump_state_player_random(player: PlayerRandom, opponent: Player) -> bytes:
+    size_x = opponent.board.SIZE_X
+    list_parts = [STRUCT_POSITIONS_FREE.pack(player.number_positions_free is not None,
+                                             player.number_positions_free or 0)]
+    _dump_positions(player.set_positions_previously_attacked, size_x, list_parts)
+    _dump_positions([] if player.last_attack_coord is None else [player.last_attack_coord], size_x, list_parts)
+    # the slots swapped of the free positions are kept, the positions picked depend on them. The slots of the cells
+    # swapped are found again from them.
+    _dump_array('I', list(player.dict_index_cell_per_slot), list_parts)
+    _dump_array('I', list(player.dict_index_cell_per_slot.values()), list_parts)
+    # the ships which have sunk are found again on the opponent's board from their first position
+    _dump_positions([(ship.x_start, ship.y_start) for ship in player.list_ships_opponent_previously_sunk],
+                    size_x, list_parts)
+    return b''.join(list_parts)
+
+
+def _load_state_player_random(player: PlayerRandom, opponent: Player, data: bytes) -> None:
+    size_x = opponent.board.SIZE_X
+    is_initialised, number_positions_free = STRUCT_POSITIONS_FREE.unpack_from(data, 0)
+    list_positions_attacked, offset = _load_positions(data, STRUCT_POSITIONS_FREE.size, size_x)
+    list_last_attack_coord, offset = _load_positions(data, offset, size_x)
+    array_slots, offset = _load_array('I', data, offset)
+    array_index_cells, offset = _load_array('I', data, offset)
+    list_positions_ships_sunk, _ = _load_positions(data, offset, size_x)
+
+    player.set_positions_previously_attacked = set(list_positions_attacked)
+    player.last_attack_coord = list_last_attack_coord[0] if list_last_attack_coord else None
+    player.list_ships_opponent_previously_sunk = [opponent.board.get_ship_at(coord_x, coord_y)
+                                                  for coord_x, coord_y in list_positions_ships_sunk]
+    player.size_x = size_x if is_initialised else None
+    player.number_positions_free = number_positions_free if is_initialised else None
+    player.dict_index_cell_per_slot = dict(zip(array_slots, array_index_cells))
+    player.dict_slot_per_index_cell = dict(zip(array_index_cells, array_slots))
+
+
+def _dump_state_player_probability(player: PlayerProbability, opponent: Player) -> bytes:
+    if player.size_x is None:
+        return STRUCT_PROBABILITY.pack(0, 0, 0)
+
+    list_parts = [STRUCT_PROBABILITY.pack(player.size_x, player.size_y, len(player.dict_tables_per_length))]
+    # the densities are stored rather than computed again from the consistent placements, which would take much longer
+    for length in player.dict_tables_per_length:
+        list_parts.append(STRUCT_LENGTH.pack(length, player.dict_number_ships_left_per_length[length]))
+        list_parts.append(bytes(player.dict_placements_consistent_per_length[length]))
+        list_parts.append(array('i', player.dict_density_per_length[length]).tobytes())
+        list_parts.append(array('i', player.dict_density_hits_per_length[length]).tobytes())
+    list_parts.append(array('i', player.list_density).tobytes())
+    list_parts.append(array('i', player.list_density_hits).tobytes())
+    list_parts.append(bytes(player.list_is_cell_candidate))
+    _dump_array('I', player.set_index_cells_hit_not_sunk, list_parts)
+    return b''.join(list_parts)
+
+
+def _load_state_player_probability(player: PlayerProbability, opponent: Player, data: bytes) -> None:
+    # the catalog (and its cache on disk) is only needed by this strategy
+    from battleship.catalog import get_placement_tables
+
+    size_x, size_y, number_lengths = STRUCT_PROBABILITY.unpack_from(data, 0)
+    offset = STRUCT_PROBABILITY.size
+    if not size_x:
+        return
+
+    number_cells = size_x * size_y
+    size_density = number_cells * array('i').itemsize
+
+    def load_density() -> List[int]:
+        nonlocal offset
+        array_density = array('i')
+        array_density.frombytes(data[offset:offset + size_density])
+        offset += size_density
+        return array_density.tolist()
+
+    player.size_x, player.size_y = size_x, size_y
+    player.dict_tables_per_length = {}
+    player.dict_number_ships_left_per_length = {}
+    player.dict_placements_consistent_per_length = {}
+    player.dict_density_per_length = {}
+    player.dict_density_hits_per_length = {}
+
+    for _ in range(number_lengths):
+        length, number_ships_left = STRUCT_LENGTH.unpack_from(data, offset)
+        offset += STRUCT_LENGTH.size
+        tables = get_placement_tables(length, size_x, size_y)
+        player.dict_tables_per_length[length] = tables
+        player.dict_number_ships_left_per_length[length] = number_ships_left
+        player.dict_placements_consistent_per_length[length] = bytearray(data[offset:offset + tables.number_placements])
+        offset += tables.number_placements
+        player.dict_density_per_length[length] = load_density()
+        player.dict_density_hits_per_length[length] = load_density()
+
+    player.list_density = load_density()
+    player.list_density_hits = load_density()
+    player.list_is_cell_candidate = [bool(is_cell_candidate)
+                                     for is_cell_candidate in data[offset:offset + number_cells]]
+    offset += number_cells
+    array_index_cells_hit, _ = _load_array('I', data, offset)
+    player.set_index_cells_hit_not_sunk = set(array_index_cells_hit)
+
+
+_dict_functions_state_per_class[PlayerAutomatic] = (_dump_state_player_automatic, _load_state_player_automatic)
+_dict_functions_state_per_class[PlayerRandom] = (_dump_state_player_random, _load_state_player_random)
+_dict_functions_state_per_class[PlayerProbability] = (_dump_state_player_probability, _load_state_player_probability)
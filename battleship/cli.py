@@ -0,0 +1,198 @@
+import argparse
+import importlib
+import json
+import sys
+
+# Command-line entry point, e.g.:
+#     python main.py play --player-1 user --player-2 probability
+#     python main.py simulate --games 100000 --strategy-1 parity_hunt --strategy-2 random
+#     python main.py tournament --player-1 automatic --player-2 random --games 10000 --seed 1
+#     python main.py bench --quick
+#     python main.py serve --port 8765
+# Only argparse is imported when the module is loaded: the engine, the strategies and the optional dependencies (numpy)
+# are imported by the subcommands which need them, so that short-lived processes (workers, scheduled batches) start
+# quickly. The classes are named below rather than imported.
+
+# name of a strategy on the command line -> (module, class) of the players using it
+DICT_CLASSES_PLAYERS = {'user': ('battleship.player', 'PlayerUser'),
+                        'automatic': ('battleship.player', 'PlayerAutomatic'),
+                        'random': ('battleship.player', 'PlayerRandom'),
+                        'probability': ('battleship.player', 'PlayerProbability'),
+                        'monte_carlo': ('battleship.monte_carlo', 'PlayerMonteCarlo')}
+
+# strategies which can play headless (all of them but the user)
+LIST_NAMES_PLAYERS_AUTOMATIC = [name for name in DICT_CLASSES_PLAYERS if name != 'user']
+
+# strategies of the NumPy simulator (battleship.simulator.STRATEGY_RANDOM and STRATEGY_PARITY_HUNT)
+LIST_STRATEGIES_SIMULATION = ['random', 'parity_hunt']
+
+
+def get_class_player(name_strategy: str) -> type:
+    """
+    :param name_strategy: name of a strategy, key of DICT_CLASSES_PLAYERS
+    :return: the class of the players using that strategy, its module being imported if needed
+    """
+    name_module, name_class = DICT_CLASSES_PLAYERS[name_strategy]
+    return getattr(importlib.import_module(name_module), name_class)
+
+
+def get_factory_player(name_strategy: str):
+    """
+    :return: a factory of players using that strategy (see battleship.tournament.PlayerFactory), picklable so that it
+    can be sent to worker processes
+    """
+    cls_player = get_class_player(name_strategy)
+    if name_strategy == 'monte_carlo':
+        # the games are already spread over the workers of the tournament, the samples are drawn in each worker
+        import functools
+        return functools.partial(cls_player, number_workers=0)
+    return cls_player
+
+
+def play(arguments: argparse.Namespace) -> int:
+    from battleship.board import BoardAutomatic
+    from battleship.game import Game
+    from battleship.seeding import get_new_seed, get_rng
+
+    seed = arguments.seed if arguments.seed is not None else get_new_seed()
+
+    # the random generators are derived from the seed as in battleship.tournament.create_game
+    list_players = []
+    for index_player, name_strategy, name_player in ((1, arguments.player_1, arguments.name_1),
+                                                     (2, arguments.player_2, arguments.name_2)):
+        rng = get_rng(seed, f'player_{index_player}')
+        if name_strategy == 'user':
+            list_players.append(get_class_player(name_strategy)(BoardAutomatic(rng=rng), name_player, rng))
+        else:
+            list_players.append(get_class_player(name_strategy)(name_player=name_player, rng=rng))
+
+    game = Game(player_1=list_players[0], player_2=list_players[1], rng=get_rng(seed, 'game'))
+
+    if arguments.quiet:
+        game_result = game.run()
+        print(f"{game_result.name_winner} wins in {game_result.number_shots_winner} shots "
+              f"({game_result.number_shots_player_1} - {game_result.number_shots_player_2}).")
+    else:
+        game.play()
+    print(f"Seed of the game: {seed}")
+
+    return 0
+
+
+def simulate(arguments: argparse.Namespace) -> int:
+    try:
+        import numpy as np
+    except ImportError:
+        print("The simulator needs numpy, which is not installed.", file=sys.stderr)
+        return 1
+    from battleship.simulator import simulate_games
+
+    simulation_result = simulate_games(number_games=arguments.games,
+                                       strategy_player_1=arguments.strategy_1,
+                                       strategy_player_2=arguments.strategy_2,
+                                       rng=np.random.default_rng(arguments.seed),
+                                       size_x=arguments.size_x,
+                                       size_y=arguments.size_y)
+
+    print(simulation_result)
+    print(json.dumps(simulation_result.get_stats(), indent=2))
+
+    return 0
+
+
+def tournament(arguments: argparse.Namespace) -> int:
+    from battleship.tournament import run_tournament
+
+    tournament_result = run_tournament(factory_player_1=get_factory_player(arguments.player_1),
+                                       factory_player_2=get_factory_player(arguments.player_2),
+                                       number_games=arguments.games,
+                                       number_workers=arguments.workers,
+                                       size_chunk=arguments.chunk,
+                                       seed=arguments.seed,
+                                       path_game_log=arguments.game_log)
+
+    print(tournament_result)
+    print(json.dumps(tournament_result.get_stats(), indent=2))
+
+    return 0
+
+
+def bench(arguments: argparse.Namespace, list_arguments_benchmark: list) -> int:
+    from battleship.benchmark import main as main_benchmark
+
+    return main_benchmark(list_arguments_benchmark)
+
+
+def serve(arguments: argparse.Namespace) -> int:
+    from battleship.server import run_server
+
+    run_server(arguments.host, arguments.port, arguments.seed)
+
+    return 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Battleship: games, simulations, tournaments and benchmarks.")
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    parser_play = subparsers.add_parser('play', help="plays a game, printing the boards and the attacks")
+    parser_play.add_argument('--player-1', choices=list(DICT_CLASSES_PLAYERS), default='user')
+    parser_play.add_argument('--player-2', choices=list(DICT_CLASSES_PLAYERS), default='automatic')
+    parser_play.add_argument('--name-1', default=None, help="name of player_1")
+    parser_play.add_argument('--name-2', default=None, help="name of player_2")
+    parser_play.add_argument('--seed', type=int, default=None, help="seed of the game, a new one if not given")
+    parser_play.add_argument('--quiet', action='store_true', help="only prints the result of the game")
+
+    parser_simulate = subparsers.add_parser('simulate', help="simulates many games at once with numpy")
+    parser_simulate.add_argument('--games', type=int, default=100000, help="number of games")
+    parser_simulate.add_argument('--strategy-1', choices=LIST_STRATEGIES_SIMULATION, default='parity_hunt')
+    parser_simulate.add_argument('--strategy-2', choices=LIST_STRATEGIES_SIMULATION, default='random')
+    parser_simulate.add_argument('--seed', type=int, default=None)
+    parser_simulate.add_argument('--size-x', type=int, default=10, help="length of the boards along the x axis")
+    parser_simulate.add_argument('--size-y', type=int, default=10, help="length of the boards along the y axis")
+
+    parser_tournament = subparsers.add_parser('tournament', help="plays many headless games between 2 strategies")
+    parser_tournament.add_argument('--player-1', choices=LIST_NAMES_PLAYERS_AUTOMATIC, default='automatic')
+    parser_tournament.add_argument('--player-2', choices=LIST_NAMES_PLAYERS_AUTOMATIC, default='random')
+    parser_tournament.add_argument('--games', type=int, default=1000, help="number of games")
+    parser_tournament.add_argument('--workers', type=int, default=None,
+                                   help="number of worker processes, the number of CPUs if not given, 0 for none")
+    parser_tournament.add_argument('--chunk', type=int, default=None, help="number of games per task of a worker")
+    parser_tournament.add_argument('--seed', type=int, default=None, help="seed of the tournament")
+    parser_tournament.add_argument('--game-log', metavar='PATH', default=None,
+                                   help="game log to which the games are appended")
+
+    # the arguments of bench are those of battleship.benchmark, passed through (see bench --help)
+    subparsers.add_parser('bench', add_help=False, help="runs the benchmarks (python -m battleship.benchmark)")
+
+    parser_serve = subparsers.add_parser('serve', help="runs the server for remote players")
+    parser_serve.add_argument('--host', default='127.0.0.1')
+    parser_serve.add_argument('--port', type=int, default=8765)
+    parser_serve.add_argument('--seed', type=int, default=None)
+
+    return parser
+
+
+def main(list_arguments: list = None) -> int:
+    """
+    :param list_arguments: arguments of the command line, sys.argv[1:] if None
+    :return: the exit code
+    """
+    parser = get_parser()
+    arguments, list_arguments_other = parser.parse_known_args(list_arguments)
+
+    if arguments.command == 'bench':
+        return bench(arguments, list_arguments_other)
+    if list_arguments_other:
+        parser.error(f"unrecognized arguments: {' '.join(list_arguments_other)}")
+
+    dict_commands = {'play': play,
+                     'simulate': simulate,
+                     'tournament': tournament,
+                     'serve': serve}
+    return dict_commands[arguments.command](arguments)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,28 +1,188 @@
-from typing import Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from battleship.board import Board, OFFSET_UPPER_CASE_CHAR_CONVERSION
 
+# The columns are labelled as in spreadsheets: A, B, ..., Z, AA, AB, ..., AZ, BA, ...
+NUMBER_LETTERS = 26
+
+# Error codes returned by the bulk conversions, one per item
+CODE_VALID = 0
+CODE_INVALID_FORMAT = 1  # the item is not a position, e.g. '7B' or 'B'
+CODE_OUTSIDE_BOARD = 2  # the item is a position, but not on the board, e.g. 'K1' on a 10x10 board
+
+DIGITS = '0123456789'
+
+# labels of the columns computed so far, _list_labels_columns[x - 1] being the label of the column x
+_list_labels_columns = []  # type: List[str]
+# the same columns, by label: {'A': 1, 'B': 2, ...}, with as many columns as the largest board seen so far
+_dict_columns_per_label = {}  # type: Dict[str, int]
+
+
+def get_label_column(coord_x: int) -> str:
+    """
+    :param coord_x: column, from 1
+    :return: the label of the column, e.g. 'A' for 1, 'Z' for 26, 'AA' for 27
+    """
+    while len(_list_labels_columns) < coord_x:
+        number = len(_list_labels_columns) + 1
+        label = ''
+        while number:
+            number, remainder = divmod(number - 1, NUMBER_LETTERS)
+            label = chr(remainder + 1 + OFFSET_UPPER_CASE_CHAR_CONVERSION) + label
+        _list_labels_columns.append(label)
+        _dict_columns_per_label[label] = len(_list_labels_columns)
+    return _list_labels_columns[coord_x - 1]
+
+
+def get_coord_x_from_label_column(label: str) -> int:
+    """
+    :param label: label of a column, made of upper case letters
+    :return: the column, from 1
+    :raise ValueError: if the label is not made of upper case letters only
+    """
+    coord_x = 0
+    for char in label:
+        code = ord(char) - OFFSET_UPPER_CASE_CHAR_CONVERSION
+        if not 1 <= code <= NUMBER_LETTERS:
+            raise ValueError(f"The column '{label}' is not valid")
+        coord_x = coord_x * NUMBER_LETTERS + code
+    if not coord_x:
+        raise ValueError(f"The column '{label}' is not valid")
+    return coord_x
+
+
+def get_table_columns(size_x: int = Board.SIZE_X) -> Dict[str, int]:
+    """
+    :return: the dict label -> column, e.g. {'A': 1, 'B': 2, ...}, containing at least the columns of a board of that
+    size (its size only depends on the number of columns, the rows are parsed with int)
+    """
+    if len(_list_labels_columns) < size_x:
+        get_label_column(size_x)
+    return _dict_columns_per_label
+
 
 def get_str_coordinates_from_tuple(coord_x: int,
                                    coord_y: int):
-    return chr(coord_x + OFFSET_UPPER_CASE_CHAR_CONVERSION) + str(coord_y)
+    return get_label_column(coord_x) + str(coord_y)
 
 
-def get_tuple_coordinates_from_str(coord_str: str) -> Tuple[int, int]:
-    coord_str = coord_str.strip()
-
-    if not 2 <= len(coord_str) <= 3:
+def get_tuple_coordinates_from_str(coord_str: str,
+                                   size_x: int = Board.SIZE_X,
+                                   size_y: int = Board.SIZE_Y) -> Tuple[int, int]:
+    """
+    :param coord_str: position, e.g. 'B7' (column label then row)
+    :param size_x: length of the board along the x axis
+    :param size_y: length of the board along the y axis
+    :return: the coordinates (coord_x, coord_y) of the position
+    :raise ValueError: if the position is not valid or not on the board
+    """
+    coordinates, code = _parse_coordinates(coord_str.strip(), get_table_columns(size_x), size_x, size_y)
+    if code != CODE_VALID:
         raise ValueError(f"The position provided '{coord_str}' is not valid")
+    return coordinates
 
-    coord_1, coord_2 = coord_str[0], coord_str[1:]
 
-    coord_1 = ord(coord_1) - OFFSET_UPPER_CASE_CHAR_CONVERSION
-    coord_2 = int(coord_2)
+def get_list_tuple_coordinates_from_list_str(list_coord_str: Iterable[str],
+                                             size_x: int = Board.SIZE_X,
+                                             size_y: int = Board.SIZE_Y
+                                             ) -> Tuple[List[Optional[Tuple[int, int]]], List[int]]:
+    """
+    Converts many positions at once, without raising any exception for the invalid ones.
+    :param list_coord_str: positions, e.g. ['B7', 'C3']
+    :return: a tuple (list_coordinates, list_codes) with one item per position: its coordinates (None if it is not
+    valid) and its code (CODE_VALID, CODE_INVALID_FORMAT or CODE_OUTSIDE_BOARD)
+    """
+    table_columns = get_table_columns(size_x)
+    list_coordinates = []
+    list_codes = []
 
-    if not (0 < coord_1 <= Board.SIZE_X and 0 < coord_2 <= Board.SIZE_Y):
-        raise ValueError(f"The position provided '{coord_str}' is not valid")
+    for coord_str in list_coord_str:
+        coordinates, code = _parse_coordinates(coord_str.strip(), table_columns, size_x, size_y)
+        list_coordinates.append(coordinates)
+        list_codes.append(code)
+
+    return list_coordinates, list_codes
+
+
+def get_list_tuple_coordinates_from_moves(moves: str,
+                                          size_x: int = Board.SIZE_X,
+                                          size_y: int = Board.SIZE_Y
+                                          ) -> Tuple[List[Optional[Tuple[int, int]]], List[int]]:
+    """
+    :param moves: list of positions separated by spaces, commas or new lines, e.g. 'B7, C3 D4'
+    :return: the same as get_list_tuple_coordinates_from_list_str
+    """
+    return get_list_tuple_coordinates_from_list_str(moves.replace(',', ' ').split(), size_x, size_y)
+
+
+def iter_tuple_coordinates_from_lines(lines: Iterable[str],
+                                      size_x: int = Board.SIZE_X,
+                                      size_y: int = Board.SIZE_Y) -> Iterator[Tuple[Optional[Tuple[int, int]], int]]:
+    """
+    Converts a stream of positions, one per line (a file, a socket...), without loading it in memory.
+    The empty lines are skipped.
+    :return: an iterator of tuples (coordinates, code), as in get_list_tuple_coordinates_from_list_str
+    """
+    table_columns = get_table_columns(size_x)
+
+    for line in lines:
+        coord_str = line.strip()
+        if coord_str:
+            yield _parse_coordinates(coord_str, table_columns, size_x, size_y)
+
+
+def get_list_str_coordinates_from_list_tuple(list_coordinates: Iterable[Tuple[int, int]],
+                                             size_x: int = Board.SIZE_X,
+                                             size_y: int = Board.SIZE_Y) -> Tuple[List[Optional[str]], List[int]]:
+    """
+    Converts many coordinates to positions at once, without raising any exception for the invalid ones.
+    :param list_coordinates: coordinates (coord_x, coord_y)
+    :return: a tuple (list_coord_str, list_codes) with one item per coordinates: the position (None if the coordinates
+    are not on the board) and its code (CODE_VALID or CODE_OUTSIDE_BOARD)
+    """
+    list_coord_str = []
+    list_codes = []
+
+    for coord_x, coord_y in list_coordinates:
+        if 0 < coord_x <= size_x and 0 < coord_y <= size_y:
+            list_coord_str.append(get_label_column(coord_x) + str(coord_y))
+            list_codes.append(CODE_VALID)
+        else:
+            list_coord_str.append(None)
+            list_codes.append(CODE_OUTSIDE_BOARD)
+
+    return list_coord_str, list_codes
+
+
+def _parse_coordinates(coord_str: str,
+                       table_columns: Dict[str, int],
+                       size_x: int,
+                       size_y: int) -> Tuple[Optional[Tuple[int, int]], int]:
+    """
+    :param coord_str: position, without spaces around it
+    :param table_columns: table returned by get_table_columns(size_x)
+    :return: a tuple (coordinates, code), coordinates being None if the code is not CODE_VALID
+    """
+    # the label of the column is made of letters and the row of digits: the row is what follows the last non-digit.
+    # Spaces between the column and the row are allowed, e.g. 'B 7'.
+    label = coord_str.rstrip(DIGITS)
+    str_coord_y = coord_str[len(label):]
+    label = label.rstrip()
+    if not label or not str_coord_y:
+        return None, CODE_INVALID_FORMAT
+
+    coord_x = table_columns.get(label)
+    if coord_x is None:
+        # either a column outside of the board, or not a label at all
+        try:
+            coord_x = get_coord_x_from_label_column(label)
+        except ValueError:
+            return None, CODE_INVALID_FORMAT
+    coord_y = int(str_coord_y)
 
-    return coord_1, coord_2
+    if not (0 < coord_x <= size_x and 0 < coord_y <= size_y):
+        return None, CODE_OUTSIDE_BOARD
+    return (coord_x, coord_y), CODE_VALID
 
 
 if __name__ == '__main__':
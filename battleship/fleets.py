@@ -0,0 +1,178 @@
+from typing import Dict
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.ship import Ship
+
+
+class FleetBatch(object):
+    """
+    Batch of fleets generated together, stored as NumPy arrays:
+    - array_ships: integers of shape (number_fleets, number_ships, 4), each ship being (x_start, y_start, x_end, y_end)
+    - array_occupancy: booleans of shape (number_fleets, size_y, size_x), array_occupancy[k, y - 1, x - 1] is True if
+    and only if a ship of the k-th fleet is at (x, y)
+    The Board objects are only created on demand, with get_board.
+    """
+
+    def __init__(self,
+                 array_ships: np.ndarray,
+                 array_occupancy: np.ndarray,
+                 dict_number_ships_per_length: Dict[int, int]):
+        self.array_ships = array_ships
+        self.array_occupancy = array_occupancy
+        self.dict_number_ships_per_length = dict_number_ships_per_length
+
+    def __len__(self):
+        return len(self.array_ships)
+
+    @property
+    def size_x(self) -> int:
+        return self.array_occupancy.shape[2]
+
+    @property
+    def size_y(self) -> int:
+        return self.array_occupancy.shape[1]
+
+    def get_list_ships(self, index_fleet: int) -> list:
+        """
+        :param index_fleet: index of a fleet of the batch
+        :return: the list of the ships of that fleet
+        """
+        return [Ship(coord_start=(int(x_start), int(y_start)), coord_end=(int(x_end), int(y_end)))
+                for x_start, y_start, x_end, y_end in self.array_ships[index_fleet]]
+
+    def get_board(self, index_fleet: int) -> Board:
+        """
+        :param index_fleet: index of a fleet of the batch
+        :return: a new Board with the ships of that fleet
+        """
+        return Board(self.get_list_ships(index_fleet),
+                     size_x=self.size_x,
+                     size_y=self.size_y,
+                     dict_number_ships_per_length=self.dict_number_ships_per_length)
+
+
+# number of fleets generated at the same time, to bound the memory used by the intermediate arrays
+SIZE_CHUNK_GENERATION = 8192
+
+# number of times the fleets whose ships could not all be placed are generated again
+MAXIMUM_NUMBER_ATTEMPTS = 100
+
+
+def generate_fleets(number_fleets: int,
+                    rng: np.random.Generator = None,
+                    size_x: int = Board.SIZE_X,
+                    size_y: int = Board.SIZE_Y,
+                    dict_number_ships_per_length: Dict[int, int] = None) -> FleetBatch:
+    """
+    Generates a batch of random fleets, all of them respecting the number of ships per length and the spacing
+    between ships of the boards.
+    :param number_fleets: number of fleets to generate
+    :param rng: NumPy random generator, a new one is created if None
+    :param size_x: length of the boards along the x axis
+    :param size_y: length of the boards along the y axis
+    :param dict_number_ships_per_length: dict length -> number of ships of that length,
+    Board.DICT_NUMBER_SHIPS_PER_LENGTH if None
+    :return: the FleetBatch containing the fleets
+    :raise ValueError: if the ships could not be placed on the boards
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if dict_number_ships_per_length is None:
+        dict_number_ships_per_length = Board.DICT_NUMBER_SHIPS_PER_LENGTH
+
+    # longest ships first, they are the hardest to place
+    list_lengths = []
+    for length, number_ships in sorted(dict_number_ships_per_length.items(), reverse=True):
+        list_lengths.extend([length] * number_ships)
+
+    array_ships = np.zeros((number_fleets, len(list_lengths), 4), dtype=np.int32)
+    array_occupancy = np.zeros((number_fleets, size_y, size_x), dtype=bool)
+
+    for index_start in range(0, number_fleets, SIZE_CHUNK_GENERATION):
+        index_end = min(index_start + SIZE_CHUNK_GENERATION, number_fleets)
+        array_indexes_to_generate = np.arange(index_start, index_end)
+
+        for _ in range(MAXIMUM_NUMBER_ATTEMPTS):
+            if not len(array_indexes_to_generate):
+                break
+
+            ships, occupancy, is_valid = _generate_fleets_chunk(len(array_indexes_to_generate),
+                                                                rng, size_x, size_y, list_lengths)
+            array_ships[array_indexes_to_generate[is_valid]] = ships[is_valid]
+            array_occupancy[array_indexes_to_generate[is_valid]] = occupancy[is_valid]
+            array_indexes_to_generate = array_indexes_to_generate[~is_valid]
+        else:
+            if len(array_indexes_to_generate):
+                raise ValueError("The ships cannot be placed on the board without being too close.")
+
+    return FleetBatch(array_ships, array_occupancy, dict(dict_number_ships_per_length))
+
+
+def _generate_fleets_chunk(number_fleets: int,
+                           rng: np.random.Generator,
+                           size_x: int,
+                           size_y: int,
+                           list_lengths: list) -> tuple:
+    """
+    Places the ships of all the fleets at the same time, ship after ship, each one at a random legal position.
+    :return: a tuple (array_ships, array_occupancy, is_valid), is_valid being False for the fleets in which a ship had
+    no legal position left.
+    """
+    array_ships = np.zeros((number_fleets, len(list_lengths), 4), dtype=np.int32)
+    array_occupancy = np.zeros((number_fleets, size_y, size_x), dtype=bool)
+    # padded with a border of 1 cell, so that the surrounding cells of any ship can be written without clipping
+    array_forbidden_padded = np.zeros((number_fleets, size_y + 2, size_x + 2), dtype=bool)
+    array_forbidden = array_forbidden_padded[:, 1:-1, 1:-1]
+    is_valid = np.ones(number_fleets, dtype=bool)
+    array_indexes_fleets = np.arange(number_fleets)
+
+    for index_ship, length in enumerate(list_lengths):
+        array_free = ~array_forbidden
+
+        # a ship can start at a cell if the length consecutive cells (rightwards or downwards) are free
+        legal_horizontal = array_free[:, :, :max(size_x - length + 1, 0)].copy()  # (n, size_y, size_x - length + 1)
+        legal_vertical = array_free[:, :max(size_y - length + 1, 0), :].copy()  # (n, size_y - length + 1, size_x)
+        for offset in range(1, length):
+            legal_horizontal &= array_free[:, :, offset:offset + legal_horizontal.shape[2]]
+            legal_vertical &= array_free[:, offset:offset + legal_vertical.shape[1], :]
+        if length == 1:  # both orientations give the same ship
+            legal_vertical[:] = False
+
+        number_horizontal = legal_horizontal[0].size
+        legal = np.concatenate((legal_horizontal.reshape(number_fleets, -1),
+                                legal_vertical.reshape(number_fleets, -1)), axis=1)
+        if not legal.shape[1]:
+            raise ValueError(f"A ship of length {length} does not fit on the board.")
+
+        # picks uniformly one of the legal positions of each fleet
+        scores = rng.random(legal.shape, dtype=np.float32)
+        scores[~legal] = -1.
+        index_position = np.argmax(scores, axis=1)
+        is_valid &= legal.any(axis=1)
+
+        is_horizontal = index_position < number_horizontal
+        index_vertical = index_position - number_horizontal
+        number_columns_horizontal = max(size_x - length + 1, 1)
+        y_start = np.where(is_horizontal,
+                           index_position // number_columns_horizontal,
+                           index_vertical // size_x) + 1
+        x_start = np.where(is_horizontal,
+                           index_position % number_columns_horizontal,
+                           index_vertical % size_x) + 1
+        x_end = np.where(is_horizontal, x_start + length - 1, x_start)
+        y_end = np.where(is_horizontal, y_start, y_start + length - 1)
+
+        array_ships[:, index_ship] = np.stack((x_start, y_start, x_end, y_end), axis=1)
+
+        # only the cells of the ships and around them are written, instead of comparing every cell of the boards
+        step_x, step_y = is_horizontal.astype(np.int32), (~is_horizontal).astype(np.int32)
+        for offset in range(-1, length + 1):
+            x, y = x_start + offset * step_x, y_start + offset * step_y  # coordinates in the padded array
+            if 0 <= offset < length:
+                array_occupancy[array_indexes_fleets, y - 1, x - 1] = True
+            for offset_side in (-1, 0, 1):
+                array_forbidden_padded[array_indexes_fleets, y + offset_side * step_x, x + offset_side * step_y] = True
+
+    return array_ships, array_occupancy, is_valid
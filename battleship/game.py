@@ -1,8 +1,51 @@
 import random
+from typing import List, Tuple
 
 from battleship.player import Player
 
 
+class GameResult(object):
+    """
+    Outcome of a game, returned by Game.run and Game.play
+    """
+
+    def __init__(self,
+                 name_player_1: str,
+                 name_player_2: str,
+                 index_player_starting: int,
+                 index_winner: int,
+                 list_shots: List[Tuple[int, int, int, bool, bool]]):
+        """
+        :param name_player_1: name of the first competitor
+        :param name_player_2: name of the second competitor
+        :param index_player_starting: 1 if player_1 started the game, 2 otherwise
+        :param index_winner: 1 if player_1 won the game, 2 otherwise
+        :param list_shots: list of all the attacks of the game, in order, each attack being a tuple
+        (index_player, coord_x, coord_y, is_ship_hit, has_ship_sunk), index_player being the index (1 or 2) of the
+        player who attacked.
+        """
+        self.name_player_1 = name_player_1
+        self.name_player_2 = name_player_2
+        self.index_player_starting = index_player_starting
+        self.index_winner = index_winner
+        self.list_shots = list_shots
+
+        self.number_shots_player_1 = sum(1 for shot in list_shots if shot[0] == 1)
+        self.number_shots_player_2 = len(list_shots) - self.number_shots_player_1
+
+    def __repr__(self):
+        return f"GameResult(winner={self.name_winner}, " \
+               f"shots=({self.number_shots_player_1}, {self.number_shots_player_2}))"
+
+    @property
+    def name_winner(self) -> str:
+        return self.name_player_1 if self.index_winner == 1 else self.name_player_2
+
+    @property
+    def number_shots_winner(self) -> int:
+        return self.number_shots_player_1 if self.index_winner == 1 else self.number_shots_player_2
+
+
 class Game(object):
     """
     Perform game simulations.
@@ -13,49 +56,115 @@ class Game(object):
 
     def __init__(self,
                  player_1: Player,
-                 player_2: Player):
+                 player_2: Player,
+                 rng: random.Random = None):
         """
         :param player_1: First competitor (Player object)
         :param player_2: Second competitor (Player object)
+        :param rng: random generator choosing the player who starts, a new one seeded from the system if None
         """
         self.player_1 = player_1
         self.player_2 = player_2
+        self.rng = rng if rng is not None else random.Random()
+
+        # state of the game, set by start
+        self.player_turn = None
+        self.player_opponent = None
+        self.index_player_starting = None
+        self.list_shots = []
+
+    def start(self) -> None:
+        """
+        Chooses randomly the player who starts the game
+        """
+        if self.rng.choice([True, False]):
+            self.player_turn, self.player_opponent = self.player_1, self.player_2
+            self.index_player_starting = 1
+        else:
+            self.player_turn, self.player_opponent = self.player_2, self.player_1
+            self.index_player_starting = 2
+
+        self.list_shots = []
 
-    def play(self) -> None:
+    def is_over(self) -> bool:
+        """
+        :return: True if and only if a player has lost
+        """
+        return self.player_1.has_lost() or self.player_2.has_lost()
+
+    def play_next_attack(self) -> Tuple[int, int, bool, bool]:
+        """
+        The player whose turn it is performs one attack, without printing anything.
+        If no ship is hit, it is then the opponent's turn.
+        :return: the tuple (coord_x, coord_y, is_ship_hit, has_ship_sunk) of the attack
+        """
+        index_player_turn = 1 if self.player_turn is self.player_1 else 2
+
+        coord_x, coord_y, is_ship_hit, has_ship_sunk = self.player_turn.attacks_silently(self.player_opponent)
+
+        self.list_shots.append((index_player_turn, coord_x, coord_y, is_ship_hit, has_ship_sunk))
+
+        # if an opponent's ship is hit, the player is allowed to play another time.
+        if not is_ship_hit:
+            self.player_turn, self.player_opponent = self.player_opponent, self.player_turn
+
+        return coord_x, coord_y, is_ship_hit, has_ship_sunk
+
+    def get_result(self) -> GameResult:
+        """
+        :return: the result of the game, which must be over
+        """
+        return GameResult(name_player_1=str(self.player_1),
+                          name_player_2=str(self.player_2),
+                          index_player_starting=self.index_player_starting,
+                          index_winner=2 if self.player_1.has_lost() else 1,
+                          list_shots=self.list_shots)
+
+    def run(self) -> GameResult:
+        """
+        Simulates an entire game without printing anything.
+        :return: the result of the game
+        """
+        self.start()
+
+        while not self.is_over():
+            self.play_next_attack()
+
+        return self.get_result()
+
+    def play(self) -> GameResult:
         """
         Simulates an entire game. Prints necessary information (boards without ships, positions under attack... )
+        :return: the result of the game
         """
 
         # Chooses position first turn
-        if random.choice([True, False]):
-            print(f"{self.player_1} starts the game.")
-            player_turn = self.player_1
-            player_opponent = self.player_2
-        else:
-            print(f"{self.player_2} starts the game.")
-            player_turn = self.player_2
-            player_opponent = self.player_1
+        self.start()
+        print(f"{self.player_turn} starts the game.")
 
         # Simulates the game, until a player has lost
-        while not self.player_1.has_lost() and not self.player_2.has_lost():
+        while not self.is_over():
             print("-" * 75 + "\n"* 5 + "-" * 75 + "\n")
             is_ship_hit = None
 
             # if an opponent's ship is hit, the player is allowed to play another time.
             while is_ship_hit is None or is_ship_hit:
+                player_turn, player_opponent = self.player_turn, self.player_opponent
 
-                is_ship_hit, _ = player_turn.attacks(player_opponent)
+                player_turn.print_state_before_attack(player_opponent)
+                coord_x, coord_y, is_ship_hit, has_ship_sunk = self.play_next_attack()
+                player_turn.print_attack(player_opponent, coord_x, coord_y, is_ship_hit, has_ship_sunk)
 
-                if self.player_1.has_lost() or self.player_2.has_lost():
+                if self.is_over():
                     break
 
                 if is_ship_hit:
                     print("-" * 75)
 
-            player_turn, player_opponent = player_opponent, player_turn  # Now it's the opponent's turn
-
         self._print_results()
 
+        return self.get_result()
+
     def _print_results(self):
         print("-" * 75 + "\n" * 5 + "-" * 75 + "\n")
         print(f"Here is the final state of {self.player_1}'s board:\n ")
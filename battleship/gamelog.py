@@ -0,0 +1,335 @@
+import mmap
+import struct
+from array import array
+from collections import Counter
+from typing import Iterator, List, Tuple
+
+from battleship.board import Board
+from battleship.game import Game
+from battleship.ship import Ship
+
+MAGIC_NUMBER = b'BSGL'
+VERSION_FORMAT = 3
+
+# The shots are stored as the index of the cell attacked on 1 byte, so the boards can have at most 256 cells
+MAXIMUM_NUMBER_CELLS = 256
+
+# magic number, version, size_x, size_y (a board of 256 cells can be 256 cells long)
+STRUCT_HEADER = struct.Struct('<4sHHH')
+# index of the player starting, number of ships of player_1, number of ships of player_2, number of shots
+STRUCT_HEADER_GAME = struct.Struct('<BHHH')
+# x_start - 1, y_start - 1, x_end - 1, y_end - 1: from 0, so that they fit on 1 byte on boards 256 cells long
+STRUCT_SHIP = struct.Struct('<BBBB')
+
+# size of the blocks copied by append_game_log
+SIZE_BUFFER_COPY = 1024 * 1024
+
+
+class GameRecord(object):
+    """
+    Game read from a game log: the fleets of both players, the player who started and the cells attacked, in order.
+    Whether each attack hit or sank a ship is not stored, it is found again by replaying the game (see get_list_shots).
+    """
+
+    def __init__(self,
+                 size_x: int,
+                 size_y: int,
+                 index_player_starting: int,
+                 list_ships_player_1: List[Tuple[int, int, int, int]],
+                 list_ships_player_2: List[Tuple[int, int, int, int]],
+                 bytes_shots: bytes):
+        """
+        :param size_x: length of the boards along the x axis
+        :param size_y: length of the boards along the y axis
+        :param index_player_starting: 1 if player_1 started the game, 2 otherwise
+        :param list_ships_player_1: ships (x_start, y_start, x_end, y_end) of player_1
+        :param list_ships_player_2: ships (x_start, y_start, x_end, y_end) of player_2
+        :param bytes_shots: index of the cell attacked by each shot, see Board.get_index_cell
+        """
+        self.size_x = size_x
+        self.size_y = size_y
+        self.index_player_starting = index_player_starting
+        self.list_ships_player_1 = list_ships_player_1
+        self.list_ships_player_2 = list_ships_player_2
+        self.bytes_shots = bytes_shots
+
+    def __len__(self):
+        return len(self.bytes_shots)
+
+    def __repr__(self):
+        return f"GameRecord(starting={self.index_player_starting}, shots={len(self)})"
+
+    def get_list_coordinates_shots(self) -> List[Tuple[int, int]]:
+        """
+        :return: the coordinates (x, y) of all the shots, in order
+        """
+        return [(index_cell % self.size_x + 1, index_cell // self.size_x + 1) for index_cell in self.bytes_shots]
+
+    def get_board(self, index_player: int) -> Board:
+        """
+        :param index_player: 1 for player_1, 2 for player_2
+        :return: a new Board with the fleet of that player, before any shot
+        """
+        list_ships = [Ship(coord_start=(x_start, y_start), coord_end=(x_end, y_end))
+                      for x_start, y_start, x_end, y_end in (self.list_ships_player_1 if index_player == 1
+                                                             else self.list_ships_player_2)]
+        return Board(list_ships,
+                     size_x=self.size_x,
+                     size_y=self.size_y,
+                     dict_number_ships_per_length=dict(Counter(ship.length() for ship in list_ships)))
+
+    def get_list_shots(self) -> List[Tuple[int, int, int, bool, bool]]:
+        """
+        Replays the game on new boards.
+        :return: the list of the attacks (index_player, coord_x, coord_y, is_ship_hit, has_ship_sunk), as in GameResult
+        """
+        list_boards = [self.get_board(1), self.get_board(2)]
+        index_player = self.index_player_starting
+        list_shots = []
+
+        for coord_x, coord_y in self.get_list_coordinates_shots():
+            # the board attacked is the one of the opponent
+            is_ship_hit, has_ship_sunk = list_boards[2 - index_player].is_attacked_at(coord_x, coord_y)
+            list_shots.append((index_player, coord_x, coord_y, is_ship_hit, has_ship_sunk))
+            if not is_ship_hit:
+                index_player = 3 - index_player
+
+        return list_shots
+
+    @property
+    def index_winner(self) -> int:
+        """
+        :return: 1 if player_1 won the game, 2 otherwise (the winner is the player who performed the last attack)
+        """
+        return self.get_list_shots()[-1][0]
+
+
+def encode_game(game: Game) -> bytes:
+    """
+    :param game: game which has been played
+    :return: the record of the game, in the format of the game logs
+    :raise ValueError: if the boards of the players do not have the same size, or are too large
+    """
+    board_1, board_2 = game.player_1.board, game.player_2.board
+    list_shots = game.list_shots
+
+    if (board_1.SIZE_X, board_1.SIZE_Y) != (board_2.SIZE_X, board_2.SIZE_Y):
+        raise ValueError("The game logs only support games whose boards have the same size.")
+    if board_1.SIZE_X * board_1.SIZE_Y > MAXIMUM_NUMBER_CELLS:
+        raise ValueError(f"The game logs only support boards of at most {MAXIMUM_NUMBER_CELLS} cells.")
+
+    data = bytearray(STRUCT_HEADER_GAME.pack(game.index_player_starting,
+                                             len(board_1.list_ships),
+                                             len(board_2.list_ships),
+                                             len(list_shots)))
+    for ship in board_1.list_ships + board_2.list_ships:
+        data += STRUCT_SHIP.pack(ship.x_start - 1, ship.y_start - 1, ship.x_end - 1, ship.y_end - 1)
+    data += bytes((coord_y - 1) * board_1.SIZE_X + coord_x - 1 for _, coord_x, coord_y, _, _ in list_shots)
+
+    return bytes(data)
+
+
+class GameLogWriter(object):
+    """
+    Appends games to a game log file.
+    The file starts with a header, followed by the games one after another, each one being:
+    - a small header (player starting, number of ships of each player, number of shots)
+    - the ships of player_1 then those of player_2, each one on 4 bytes (x_start, y_start, x_end, y_end, from 0)
+    - the cells attacked, on 1 byte each
+    The games are only appended, so an existing log can be extended, by several tournaments for instance. An incomplete
+    game at the end of an existing log (e.g. left by a writer which was interrupted) is removed before appending.
+    """
+
+    def __init__(self,
+                 path_file: str,
+                 size_x: int = Board.SIZE_X,
+                 size_y: int = Board.SIZE_Y):
+        """
+        :param path_file: path of the game log, created if it does not exist
+        :param size_x: length of the boards along the x axis
+        :param size_y: length of the boards along the y axis
+        :raise ValueError: if the boards are too large, or if the existing file is not a game log of the same boards
+        """
+        if size_x * size_y > MAXIMUM_NUMBER_CELLS:
+            raise ValueError(f"The game logs only support boards of at most {MAXIMUM_NUMBER_CELLS} cells.")
+
+        self.path_file = path_file
+        self.size_x = size_x
+        self.size_y = size_y
+
+        self._file = open(path_file, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(STRUCT_HEADER.pack(MAGIC_NUMBER, VERSION_FORMAT, size_x, size_y))
+        else:
+            with open(path_file, 'rb') as file:
+                header = file.read(STRUCT_HEADER.size)
+            if len(header) < STRUCT_HEADER.size \
+                    or STRUCT_HEADER.unpack(header) != (MAGIC_NUMBER, VERSION_FORMAT, size_x, size_y):
+                self._file.close()
+                raise ValueError(f"The file {path_file} is not a game log of {size_x}x{size_y} boards.")
+
+            # the games appended would otherwise be read as the end of the incomplete game
+            with GameLogReader(path_file) as reader:
+                offset_end_games = reader.get_offset_end_games()
+            if offset_end_games < self._file.tell():
+                self._file.truncate(offset_end_games)
+                self._file.seek(offset_end_games)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write_game(self, game: Game) -> None:
+        """
+        :param game: game which has been played, on boards of the size of the log
+        :raise ValueError: if the boards of the game are not of the size of the log
+        """
+        if (game.player_1.board.SIZE_X, game.player_1.board.SIZE_Y) != (self.size_x, self.size_y):
+            raise ValueError(f"The game log {self.path_file} only records games on {self.size_x}x{self.size_y} boards.")
+        self._file.write(encode_game(game))
+
+    def write_records(self, data: bytes) -> None:
+        """
+        :param data: records of games already encoded, with encode_game
+        """
+        self._file.write(data)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class GameLogReader(object):
+    """
+    Reads a game log file through a memory map, so that the games are only read when they are accessed.
+    The games can be iterated, or accessed by index: the offsets of the games are then found by going through the
+    headers of the games once, and kept in an array of 8 bytes per game.
+    An incomplete game at the end of the file (e.g. while a writer is appending it) is ignored.
+    """
+
+    def __init__(self, path_file: str):
+        """
+        :param path_file: path of the game log
+        :raise ValueError: if the file is not a game log
+        """
+        self.path_file = path_file
+
+        with open(path_file, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < STRUCT_HEADER.size:
+            raise ValueError(f"The file {path_file} is not a game log.")
+        magic_number, version, self.size_x, self.size_y = STRUCT_HEADER.unpack_from(self._mmap, 0)
+        if magic_number != MAGIC_NUMBER or version != VERSION_FORMAT:
+            raise ValueError(f"The file {path_file} is not a game log.")
+
+        self._array_offsets_games = None  # type: array
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._get_array_offsets_games())
+
+    def __getitem__(self, index_game: int) -> GameRecord:
+        return self._read_game(self._get_array_offsets_games()[index_game])
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for offset in self._iter_offsets_games():
+            yield self._read_game(offset)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def get_offset_end_games(self) -> int:
+        """
+        :return: the offset in the file of the end of the last complete game, the size of the header if there is none
+        """
+        array_offsets_games = self._get_array_offsets_games()
+        if not array_offsets_games:
+            return STRUCT_HEADER.size
+        return self._get_offset_next_game(array_offsets_games[-1])
+
+    def _get_array_offsets_games(self) -> array:
+        if self._array_offsets_games is None:
+            self._array_offsets_games = array('Q', self._iter_offsets_games())
+        return self._array_offsets_games
+
+    def _iter_offsets_games(self) -> Iterator[int]:
+        offset = STRUCT_HEADER.size
+        size_file = len(self._mmap)
+
+        while offset + STRUCT_HEADER_GAME.size <= size_file:
+            offset_next = self._get_offset_next_game(offset)
+            if offset_next > size_file:
+                break
+            yield offset
+            offset = offset_next
+
+    def _get_offset_next_game(self, offset: int) -> int:
+        """
+        :return: the offset of the end of the game starting at offset, from its header
+        """
+        _, number_ships_player_1, number_ships_player_2, number_shots = \
+            STRUCT_HEADER_GAME.unpack_from(self._mmap, offset)
+        return offset + STRUCT_HEADER_GAME.size \
+            + (number_ships_player_1 + number_ships_player_2) * STRUCT_SHIP.size + number_shots
+
+    def _read_game(self, offset: int) -> GameRecord:
+        """
+        :return: the game starting at offset in the file
+        """
+        index_player_starting, number_ships_player_1, number_ships_player_2, number_shots = \
+            STRUCT_HEADER_GAME.unpack_from(self._mmap, offset)
+        offset += STRUCT_HEADER_GAME.size
+
+        list_ships = [tuple(coord + 1 for coord in STRUCT_SHIP.unpack_from(self._mmap,
+                                                                          offset + index_ship * STRUCT_SHIP.size))
+                      for index_ship in range(number_ships_player_1 + number_ships_player_2)]
+        offset += len(list_ships) * STRUCT_SHIP.size
+
+        return GameRecord(size_x=self.size_x,
+                          size_y=self.size_y,
+                          index_player_starting=index_player_starting,
+                          list_ships_player_1=list_ships[:number_ships_player_1],
+                          list_ships_player_2=list_ships[number_ships_player_1:],
+                          bytes_shots=self._mmap[offset:offset + number_shots])
+
+
+def read_game_log(path_file: str) -> List[GameRecord]:
+    """
+    :return: all the games of a game log, loaded in memory (see GameLogReader for large logs)
+    """
+    with GameLogReader(path_file) as reader:
+        return list(reader)
+
+
+def append_game_log(path_file: str, path_file_other: str) -> None:
+    """
+    Appends all the complete games of another game log to a game log, without loading them in memory.
+    :param path_file: path of the game log extended, created if it does not exist
+    :param path_file_other: path of the game log whose games are appended
+    :raise ValueError: if the logs are not game logs of the same boards
+    """
+    with GameLogReader(path_file_other) as reader:
+        size_x, size_y = reader.size_x, reader.size_y
+        offset_end_games = reader.get_offset_end_games()
+
+    with GameLogWriter(path_file, size_x, size_y) as writer, open(path_file_other, 'rb') as file_other:
+        file_other.seek(STRUCT_HEADER.size)
+        writer.flush()
+        # an incomplete game at the end of the other log is not copied
+        number_bytes_left = offset_end_games - STRUCT_HEADER.size
+        while number_bytes_left > 0:
+            data = file_other.read(min(number_bytes_left, SIZE_BUFFER_COPY))
+            if not data:
+                break
+            writer.write_records(data)
+            number_bytes_left -= len(data)
@@ -0,0 +1,326 @@
+import atexit
+import os
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from battleship.board import Board, BoardAutomatic
+from battleship.player import PlayerProbability
+from battleship.ship import Ship
+
+
+class FleetSampler(object):
+    """
+    Generates random fleets consistent with the outcomes of the attacks on an opponent's board, with the placement
+    rules of BoardAutomatic (get_masks_legal_positions, get_mask_surrounding_ship...).
+    The rules are those of a BoardAutomatic without ships, of the dimensions of the board sampled.
+    """
+
+    def __init__(self,
+                 size_x: int = None,
+                 size_y: int = None,
+                 rng: random.Random = None):
+        """
+        :param size_x: length of the board sampled along the x axis, Board.SIZE_X if None
+        :param size_y: length of the board sampled along the y axis, Board.SIZE_Y if None
+        :param rng: random generator used to place the ships, a new one seeded from the system if None
+        """
+        self.rng = rng if rng is not None else random.Random()
+        self.board = BoardAutomatic(size_x, size_y, dict_number_ships_per_length={}, rng=self.rng)
+
+    def sample_fleet(self,
+                     list_lengths: List[int],
+                     mask_forbidden: int,
+                     mask_hits: int) -> Optional[List[Ship]]:
+        """
+        Places the ships in a single pass: first ships covering the hits, one hit after another, then the other ships,
+        longest first, each one at a random legal position.
+        :param list_lengths: lengths of the ships to place (the ships which have not sunk)
+        :param mask_forbidden: bitboard of the cells which cannot contain any of those ships (misses, ships which have
+        sunk and their surrounding cells)
+        :param mask_hits: bitboard of the cells hit on ships which have not sunk, to be covered by the ships placed.
+        No ship placed lies on hits only: it would have sunk, and the ships which have sunk are not placed again.
+        :return: the ships placed, None if the pass failed (the sample is then rejected)
+        """
+        list_lengths = sorted(list_lengths, reverse=True)
+        list_ships = []
+
+        while mask_hits:
+            index_hit = (mask_hits & -mask_hits).bit_length() - 1
+            ship = self._sample_ship_covering(index_hit, set(list_lengths), mask_forbidden, mask_hits)
+            if ship is None:
+                return None
+
+            mask_cells = self.board.get_mask_from_ship(ship)
+            mask_surrounding = self.board.get_mask_surrounding_ship(ship)
+            if mask_surrounding & ~mask_cells & mask_hits:  # a hit near the ship would belong to another ship
+                return None
+
+            list_ships.append(ship)
+            list_lengths.remove(ship.length())
+            mask_forbidden |= mask_surrounding
+            mask_hits &= ~mask_cells
+
+        for length in list_lengths:
+            list_masks_candidates = list(self.board.get_masks_legal_positions(length, mask_forbidden))
+            if not any(list_masks_candidates):
+                return None
+            ship = self.board.generate_ship(length, list_masks_candidates)
+            list_ships.append(ship)
+            mask_forbidden |= self.board.get_mask_surrounding_ship(ship)
+
+        return list_ships
+
+    def _sample_ship_covering(self,
+                              index_hit: int,
+                              set_lengths: set,
+                              mask_forbidden: int,
+                              mask_hits: int) -> Optional[Ship]:
+        """
+        :return: a ship at a random legal position covering the cell index_hit, among all the lengths of set_lengths,
+        None if there is none. The positions covering hits only are left out: a ship hit on all its cells has sunk.
+        """
+        mask_not_hit = ~mask_hits
+        list_candidates = []  # (length, is_horizontal, index_start)
+        for length in set_lengths:
+            mask_horizontal, mask_vertical = self.board.get_masks_legal_positions(length, mask_forbidden)
+            mask_ship_horizontal = (1 << length) - 1
+            mask_ship_vertical = 0
+            for offset in range(length):
+                mask_ship_vertical |= 1 << (offset * self.board.SIZE_X)
+
+            for offset in range(length):
+                index_start = index_hit - offset
+                if index_start >= 0 and mask_horizontal >> index_start & 1 \
+                        and mask_ship_horizontal << index_start & mask_not_hit:
+                    list_candidates.append((length, True, index_start))
+                index_start = index_hit - offset * self.board.SIZE_X
+                if index_start >= 0 and mask_vertical >> index_start & 1 \
+                        and mask_ship_vertical << index_start & mask_not_hit:
+                    list_candidates.append((length, False, index_start))
+
+        if not list_candidates:
+            return None
+
+        length, is_horizontal, index_start = self.rng.choice(list_candidates)
+        x_start, y_start = self.board.get_coordinates_from_index_cell(index_start)
+        if is_horizontal:
+            return Ship(coord_start=(x_start, y_start), coord_end=(x_start + length - 1, y_start))
+        return Ship(coord_start=(x_start, y_start), coord_end=(x_start, y_start + length - 1))
+
+
+def sample_occupancy(size_x: int,
+                     size_y: int,
+                     list_lengths: List[int],
+                     mask_forbidden: int,
+                     mask_hits: int,
+                     seed: int,
+                     number_samples_maximum: int,
+                     time_budget: float = None,
+                     time_deadline: float = None) -> Tuple[int, List[int]]:
+    """
+    Samples fleets consistent with the attacks, until number_samples_maximum attempts or the time budget is reached.
+    Defined at module level so that it can be run in worker processes.
+    :param seed: seed of the random generator of the samples
+    :param time_budget: time in seconds after which the sampling stops, None for no limit
+    :param time_deadline: time (time.time()) at which the sampling stops, if not None, instead of time_budget. It is
+    given by the processes waiting for the workers, so that the time spent in the pool counts in their budget.
+    :return: a tuple (number_samples, list_occupancy), list_occupancy[index_cell] being the number of samples with a
+    ship on that cell
+    """
+    sampler = FleetSampler(size_x, size_y, rng=random.Random(seed))
+    time_end = None if time_budget is None else time.perf_counter() + time_budget
+    if time_deadline is not None:
+        time_end = time.perf_counter() + time_deadline - time.time()
+
+    list_occupancy = [0] * (size_x * size_y)
+    number_samples = 0
+
+    for _ in range(number_samples_maximum):
+        if time_end is not None and time.perf_counter() > time_end:
+            break
+
+        list_ships = sampler.sample_fleet(list_lengths, mask_forbidden, mask_hits)
+        if list_ships is None:
+            continue
+
+        number_samples += 1
+        for ship in list_ships:
+            for coord_x, coord_y in ship.get_all_coordinates():
+                list_occupancy[(coord_y - 1) * size_x + coord_x - 1] += 1
+
+    return number_samples, list_occupancy
+
+
+# share of the time budget of a move kept for the workers to send their results back
+SHARE_TIME_BUDGET_RESULTS = 0.2
+
+# The samples of a move are drawn in this number of batches, each one from its own seed, whatever the number of workers
+# (a worker draws one batch after another): without a time budget, the moves only depend on the random generator of the
+# player, and a game is replayed identically on another machine.
+NUMBER_BATCHES_SAMPLES = 8
+
+# pools of worker processes shared by all the players of the process: number of workers -> pool
+_dict_executors = {}  # type: Dict[int, 'ProcessPoolExecutor']
+
+
+def _get_executor(number_workers: int) -> 'ProcessPoolExecutor':
+    if number_workers not in _dict_executors:
+        # imported only here, the players sampling in the current process do not need multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        _dict_executors[number_workers] = ProcessPoolExecutor(max_workers=number_workers)
+    return _dict_executors[number_workers]
+
+
+@atexit.register
+def _shutdown_executors() -> None:
+    """
+    Stops the worker processes of the pools when the process exits.
+    """
+    while _dict_executors:
+        _, executor = _dict_executors.popitem()
+        executor.shutdown()
+
+
+class PlayerMonteCarlo(PlayerProbability):
+    """
+    Player sampling random fleets consistent with the hits, misses and ships sunk so far, and attacking the cell on
+    which there is a ship in most samples.
+    The sampling is spread over a pool of worker processes. It draws a fixed number of samples per move, so that the
+    games can be replayed from their seeds; a time budget per move can be given instead, which trades playing strength
+    and reproducibility for latency. If no consistent fleet could be sampled, the player attacks like PlayerProbability,
+    whose state also gives the cells known to be empty.
+    """
+
+    def __init__(self,
+                 name_player: str = None,
+                 board: Board = None,
+                 rng: random.Random = None,
+                 time_budget: float = None,
+                 number_samples_maximum: int = 500,
+                 number_workers: int = None):
+        """
+        :param name_player: name of the player
+        :param board: board of the player, generated automatically (BoardAutomatic) if None
+        :param rng: random generator used for the board generated automatically, the seeds of the samples and for
+        breaking ties between cells, a new one seeded from the system if None
+        :param time_budget: time in seconds given to the sampling for each move, None for no limit (the moves are then
+        reproducible from rng, whatever the speed of the machine and the number of workers)
+        :param number_samples_maximum: maximum number of fleets sampled for each move, over all the workers
+        :param number_workers: number of worker processes, the number of CPUs if None, 0 to sample in the current
+        process (e.g. when the games themselves are played by a pool of processes)
+        """
+        super().__init__(name_player, board, rng)
+
+        self.time_budget = time_budget
+        self.number_samples_maximum = number_samples_maximum
+        if number_workers is None:
+            number_workers = os.cpu_count() or 1
+        self.number_workers = number_workers
+        self.number_samples_previous_move = 0
+
+    def select_coordinates_to_attack(self, opponent) -> Tuple[int, int]:
+        """
+        Overrides the method of PlayerProbability, which is only used if no fleet could be sampled.
+        :param opponent: object of class Player representing the player under attack
+        :return: a tuple of coordinates (coord_x, coord_y) at which the next attack will be performed
+        """
+        if self.size_x is None:
+            self._initialise_densities(opponent)
+
+        list_lengths = []
+        for length, number_ships in self.dict_number_ships_left_per_length.items():
+            list_lengths.extend([length] * number_ships)
+
+        mask_hits = 0
+        for index_cell in self.set_index_cells_hit_not_sunk:
+            mask_hits |= 1 << index_cell
+
+        # the cells which are not candidates are the cells attacked and the cells known to be empty
+        mask_forbidden = 0
+        for index_cell, is_cell_candidate in enumerate(self.list_is_cell_candidate):
+            if not is_cell_candidate:
+                mask_forbidden |= 1 << index_cell
+        mask_forbidden &= ~mask_hits
+
+        self.number_samples_previous_move, list_occupancy = self._sample_occupancy(list_lengths,
+                                                                                   mask_forbidden,
+                                                                                   mask_hits)
+
+        if not self.number_samples_previous_move:
+            return super().select_coordinates_to_attack(opponent)
+
+        occupancy_best = -1
+        list_index_cells_best = []
+        for index_cell, occupancy in enumerate(list_occupancy):
+            if self.list_is_cell_candidate[index_cell]:
+                if occupancy > occupancy_best:
+                    occupancy_best = occupancy
+                    list_index_cells_best = [index_cell]
+                elif occupancy == occupancy_best:
+                    list_index_cells_best.append(index_cell)
+
+        if not list_index_cells_best:
+            return super().select_coordinates_to_attack(opponent)
+
+        index_cell = self.rng.choice(list_index_cells_best)
+        return index_cell % self.size_x + 1, index_cell // self.size_x + 1
+
+    def _sample_occupancy(self,
+                          list_lengths: List[int],
+                          mask_forbidden: int,
+                          mask_hits: int) -> Tuple[int, List[int]]:
+        """
+        :return: the number of fleets sampled by all the workers and the merged occupancy of the cells, see
+        sample_occupancy
+        """
+        list_seeds = [self.rng.getrandbits(64) for _ in range(NUMBER_BATCHES_SAMPLES)]
+        number_samples_per_batch = -(-self.number_samples_maximum // NUMBER_BATCHES_SAMPLES)
+
+        if self.number_workers == 0:
+            time_deadline = None if self.time_budget is None else time.time() + self.time_budget
+            list_results = [sample_occupancy(self.size_x, self.size_y, list_lengths, mask_forbidden, mask_hits, seed,
+                                             number_samples_per_batch, None, time_deadline)
+                            for seed in list_seeds]
+        else:
+            list_results = self._sample_occupancy_workers(list_lengths, mask_forbidden, mask_hits, list_seeds,
+                                                          number_samples_per_batch)
+
+        number_samples = 0
+        list_occupancy = [0] * (self.size_x * self.size_y)
+        for number_samples_batch, list_occupancy_batch in list_results:
+            number_samples += number_samples_batch
+            for index_cell, occupancy in enumerate(list_occupancy_batch):
+                list_occupancy[index_cell] += occupancy
+
+        return number_samples, list_occupancy
+
+    def _sample_occupancy_workers(self,
+                                  list_lengths: List[int],
+                                  mask_forbidden: int,
+                                  mask_hits: int,
+                                  list_seeds: List[int],
+                                  number_samples_per_batch: int) -> List[Tuple[int, List[int]]]:
+        """
+        :return: the results of sample_occupancy for the batches drawn by the workers within the time budget
+        """
+        from concurrent.futures import wait
+
+        # the workers stop sampling a bit before the end of the budget, to leave time for sending their results back
+        time_end = time_deadline = None
+        if self.time_budget is not None:
+            time_end = time.time() + self.time_budget
+            time_deadline = time_end - self.time_budget * SHARE_TIME_BUDGET_RESULTS
+
+        executor = _get_executor(self.number_workers)
+        list_futures = [executor.submit(sample_occupancy, self.size_x, self.size_y, list_lengths, mask_forbidden,
+                                        mask_hits, seed, number_samples_per_batch, None, time_deadline)
+                        for seed in list_seeds]
+
+        # the results arriving after the end of the budget (e.g. if the pool was busy) are left out
+        set_futures_done, set_futures_late = wait(list_futures,
+                                                  timeout=None if time_end is None else max(time_end - time.time(), 0.))
+        for future in set_futures_late:
+            future.cancel()
+
+        return [future.result() for future in list_futures if future in set_futures_done]
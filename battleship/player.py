@@ -1,5 +1,5 @@
 import random
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from battleship.board import Board, BoardAutomatic
 from battleship.ship import Ship
@@ -16,10 +16,17 @@ class Player(object):
     def __init__(self,
                  board: Board,
                  name_player: str = None,
+                 rng: random.Random = None,
                  ):
+        """
+        :param board: board of the player
+        :param name_player: name of the player
+        :param rng: random generator of the player's strategy, a new one seeded from the system if None
+        """
         Player.index_player += 1
 
         self.board = board
+        self.rng = rng if rng is not None else random.Random()
 
         if name_player is None:
             self.name_player = "player_" + str(self.index_player)
@@ -41,16 +48,70 @@ class Player(object):
 
         assert isinstance(opponent, Player)
 
-        print(f"Here is the current state of {opponent}'s board before {self}'s attack:\n")
-        opponent.print_board_without_ships()
+        self.print_state_before_attack(opponent)
 
+        coord_x, coord_y, is_ship_hit, has_ship_sunk = self.attacks_silently(opponent)
+
+        self.print_attack(opponent, coord_x, coord_y, is_ship_hit, has_ship_sunk)
+
+        return is_ship_hit, has_ship_sunk
+
+    def attacks_silently(self,
+                         opponent) -> Tuple[int, int, bool, bool]:
+        """
+        Same as attacks, without printing anything.
+        :param opponent: object of class Player representing the person to attack
+        :return: a tuple (coord_x, coord_y, is_ship_hit, has_ship_sunk) where (coord_x, coord_y) is the position
+        attacked and is_ship_hit, has_ship_sunk are the same as in attacks.
+        """
         coord_x, coord_y = self.select_coordinates_to_attack(opponent)
 
-        print(f"{self} attacks {opponent} "
-              f"at position {get_str_coordinates_from_tuple(coord_x, coord_y)}")
+        is_ship_hit, has_ship_sunk = self.attacks_at(opponent, coord_x, coord_y)
 
+        return coord_x, coord_y, is_ship_hit, has_ship_sunk
+
+    def attacks_at(self,
+                   opponent,
+                   coord_x: int,
+                   coord_y: int) -> Tuple[bool, bool]:
+        """
+        Performs an attack at a position chosen beforehand, and lets the strategy of the player know its outcome.
+        :param opponent: object of class Player representing the person to attack
+        :param coord_x: integer representing the projection of a coordinate on the x-axis
+        :param coord_y: integer representing the projection of a coordinate on the y-axis
+        :return: the tuple (is_ship_hit, has_ship_sunk), as in attacks
+        """
         is_ship_hit, has_ship_sunk = opponent.is_attacked_at(coord_x, coord_y)
 
+        self.update_after_attack(opponent, coord_x, coord_y, is_ship_hit, has_ship_sunk)
+
+        return is_ship_hit, has_ship_sunk
+
+    def update_after_attack(self,
+                            opponent,
+                            coord_x: int,
+                            coord_y: int,
+                            is_ship_hit: bool,
+                            has_ship_sunk: bool) -> None:
+        """
+        Called after each attack of the player with its outcome, for the strategies that need to keep track of it.
+        Does nothing by default.
+        """
+        pass
+
+    def print_state_before_attack(self, opponent) -> None:
+        print(f"Here is the current state of {opponent}'s board before {self}'s attack:\n")
+        opponent.print_board_without_ships()
+
+    def print_attack(self,
+                     opponent,
+                     coord_x: int,
+                     coord_y: int,
+                     is_ship_hit: bool,
+                     has_ship_sunk: bool) -> None:
+        print(f"{self} attacks {opponent} "
+              f"at position {get_str_coordinates_from_tuple(coord_x, coord_y)}")
+
         if has_ship_sunk:
             print(f"\nA ship of {opponent} HAS SUNK. {self} can play another time.")
         elif is_ship_hit:
@@ -58,8 +119,6 @@ class Player(object):
         else:
             print("\nMissed".upper())
 
-        return is_ship_hit, has_ship_sunk
-
     def is_attacked_at(self,
                        coord_x: int,
                        coord_y: int
@@ -88,18 +147,13 @@ class Player(object):
         """
         :return: True if and only if all the ships of the player have sunk
         """
-        # TODO
-        for ship in self.board.list_ships:
-            if not ship.has_sunk():
-                return False
-
-        return True
+        return self.board.has_no_ships_left()
 
-    def print_board_with_ships(self):
-        self.board.print_board_with_ships_positions()
+    def print_board_with_ships(self, file=None):
+        self.board.print_board_with_ships_positions(file=file)
 
-    def print_board_without_ships(self):
-        self.board.print_board_without_ships_positions()
+    def print_board_without_ships(self, file=None):
+        self.board.print_board_without_ships_positions(file=file)
 
 
 class PlayerUser(Player):
@@ -118,7 +172,9 @@ class PlayerUser(Player):
         while True:
             try:
                 coord_str = input('coordinates target = ')
-                coord_x, coord_y = get_tuple_coordinates_from_str(coord_str)
+                coord_x, coord_y = get_tuple_coordinates_from_str(coord_str,
+                                                                  opponent.board.SIZE_X,
+                                                                  opponent.board.SIZE_Y)
                 return coord_x, coord_y
             except ValueError as value_error:
                 print(value_error)
@@ -129,183 +185,416 @@ class PlayerAutomatic(Player):
     Player playing automatically using a strategy.
     """
 
-    def __init__(self, name_player: str = None):
-        board = BoardAutomatic()
-
-        super().__init__(board, name_player)
-        self.coordinate_previously_attacked_x = 0
-        self.coordinate_previously_attacked_y = 0
-        self.previous_hit_sunk_ship = False
-        self.previous_coordinate_was_hit = False
-        self.hunt_ongoing = False
-        self.set_positions_previously_attacked = set()
-
-    def attacks(self,
-                opponent) -> Tuple[bool, bool]:
+    def __init__(self, name_player: str = None, board: Board = None, rng: random.Random = None):
         """
-        :param opponent: object of class Player representing the person to attack
-        :return: a tuple of bool variables (is_ship_hit, has_ship_sunk) where:
-                    - is_ship_hit is True if and only if the attack was performed at a set of coordinates where an
-                    opponent's ship is.
-                    - has_ship_sunk is True if and only if that attack made the ship sink.
+        :param name_player: name of the player
+        :param board: board of the player, generated automatically (BoardAutomatic) if None
+        :param rng: random generator used for the board generated automatically and for the strategy, a new one seeded
+        from the system if None
         """
+        if rng is None:
+            rng = random.Random()
+        if board is None:
+            board = BoardAutomatic(rng=rng)
+
+        super().__init__(board, name_player, rng)
+
+        # state of the strategy
+        self.index_next_in_order = 0  # index of the next position to consider, see get_position_in_order_parity
+        # index of the next cell to consider once the order is exhausted, in the order of the indices of the cells
+        self.index_next_cell_remaining = 0
+        self.stack_hunt = []  # positions near the hits of the ship being hunted, the last one is attacked first
+        self.set_positions_previously_attacked = set()
 
-        assert isinstance(opponent, Player)
-
-        print(f"Here is the current state of {opponent}'s board before {self}'s attack:\n")
-        opponent.print_board_without_ships()
-
-        coord_x, coord_y = self.select_coordinates_to_attack(opponent)
-
-        print(f"{self} attacks {opponent} "
-              f"at position {get_str_coordinates_from_tuple(coord_x, coord_y)}")
-
-        is_ship_hit, has_ship_sunk = opponent.is_attacked_at(coord_x, coord_y)
-
+    def update_after_attack(self,
+                            opponent,
+                            coord_x: int,
+                            coord_y: int,
+                            is_ship_hit: bool,
+                            has_ship_sunk: bool) -> None:
         if has_ship_sunk:
-            print(f"\nA ship of {opponent} HAS SUNK. {self} can play another time.")
-            self.previous_hit_sunk_ship = True
-            self.previous_coordinate_was_hit = True
+            self.stack_hunt.clear()
         elif is_ship_hit:
-            print(f"\nA ship of {opponent} HAS BEEN HIT. {self} can play another time.")
-            self.previous_coordinate_was_hit = True
-            self.previous_hit_sunk_ship = False
-        else:
-            print("\nMissed".upper())
-            self.previous_coordinate_was_hit = False
-            self.previous_hit_sunk_ship = False
-
-        return is_ship_hit, has_ship_sunk
-
-    def hunt(self):
-        attacked_positions = self.set_positions_previously_attacked
-        last_x = self.coordinate_previously_attacked_x
-        last_y = self.coordinate_previously_attacked_y
-
-        if (last_x + 1, last_y) not in attacked_positions and 1 <= last_x + 1 <= 10:
-            self.hunt_ongoing = True
-            return (last_x + 1, last_y)
-        elif (last_x - 1, last_y) not in attacked_positions and 1 <= last_x - 1 <= 10:
-            self.hunt_ongoing = True
-            return (last_x - 1, last_y)
-        elif (last_x, last_y + 1) not in attacked_positions and 1 <= last_y + 1 <= 10:
-            self.hunt_ongoing = True
-            return (last_x, last_y + 1)
-        elif (last_x, last_y - 1) not in attacked_positions and 1 <= last_y - 1 <= 10:
-            self.hunt_ongoing = True
-            return (last_x, last_y - 1)
-        else:
-            self.hunt_ongoing = False
-            return (11, 11)
+            size_x, size_y = opponent.board.SIZE_X, opponent.board.SIZE_Y
+            # pushed so that the positions are popped in the order right, left, down, up
+            if coord_y > 1:
+                self.stack_hunt.append((coord_x, coord_y - 1))
+            if coord_y < size_y:
+                self.stack_hunt.append((coord_x, coord_y + 1))
+            if coord_x > 1:
+                self.stack_hunt.append((coord_x - 1, coord_y))
+            if coord_x < size_x:
+                self.stack_hunt.append((coord_x + 1, coord_y))
 
     def select_coordinates_to_attack(self, opponent: Player) -> tuple:
         """
         Overrides the abstract method of the parent class.
+        Hunts the positions near the last hits while the ship hit has not sunk, otherwise follows the checkerboard
+        pattern. Each position is pushed on the stack or skipped in the order at most once, so every call takes an
+        amortised constant time.
         :param opponent: object of class Player representing the player under attack
         :return: a tuple of coordinates (coord_x, coord_y) at which the next attack will be performed
+        :raise ValueError: if all the positions of the board have been attacked
         """
-
-        last_x = self.coordinate_previously_attacked_x
-        last_y = self.coordinate_previously_attacked_y
+        size_x, size_y = opponent.board.SIZE_X, opponent.board.SIZE_Y
         attacked_positions = self.set_positions_previously_attacked
 
-        if (self.previous_coordinate_was_hit or self.hunt_ongoing) \
-                and not self.previous_hit_sunk_ship:
-            self.hunt_ongoing = True
-            coords = self.hunt()
-            if coords != (11, 11):
-                self.set_positions_previously_attacked.add(coords)
-                return coords
-        elif self.previous_hit_sunk_ship:
-            self.hunt_ongoing = False
-
-        if last_x == 0 and last_y == 0:  # starts search from 2,1
-            coord_x = 2
-            coord_y = 1
-            self.coordinate_previously_attacked_x = coord_x
-            self.coordinate_previously_attacked_y = coord_y
-            self.set_positions_previously_attacked.add((coord_x, coord_y))
-            return (coord_x, coord_y)
-        elif (last_x == 9 and last_y == 10):  # if checkerboard pattern reaches end of board, loops over
-            coord_x = 1
-            coord_y = 1
-            self.coordinate_previously_attacked_x = coord_x
-            self.coordinate_previously_attacked_y = coord_y
-            self.set_positions_previously_attacked.add((coord_x, coord_y))
-            return (coord_x, coord_y)
-        elif last_x + 2 <= 10 and (last_x+2,last_y) not in attacked_positions:
-            coord_x = self.coordinate_previously_attacked_x + 2
-            coord_y = self.coordinate_previously_attacked_y
-            self.coordinate_previously_attacked_x = coord_x
-            self.coordinate_previously_attacked_y = coord_y
-            self.set_positions_previously_attacked.add((coord_x, coord_y))
-            return (coord_x, coord_y)
-        elif (last_x + 2 > 10 and last_x % 2 == 0) and (1,last_y+1) not in attacked_positions:
-            coord_x = 1
-            coord_y = self.coordinate_previously_attacked_y + 1
-            self.coordinate_previously_attacked_x = coord_x
-            self.coordinate_previously_attacked_y = coord_y
-            self.set_positions_previously_attacked.add((coord_x, coord_y))
-            return (coord_x, coord_y)
-        elif (last_x + 2 > 10 and last_x % 2 != 0) and (2, last_y + 1) not in attacked_positions:
-            coord_x = 2
-            coord_y = self.coordinate_previously_attacked_y + 1
-            self.coordinate_previously_attacked_x = coord_x
-            self.coordinate_previously_attacked_y = coord_y
-            self.set_positions_previously_attacked.add((coord_x, coord_y))
-            return (coord_x, coord_y)
+        while self.stack_hunt:
+            coords = self.stack_hunt.pop()
+            if coords not in attacked_positions:
+                break
         else:
-            for x in range(1,11):
-                for y in range(1,11):
-                    if (x,y) not in attacked_positions:
-                        self.coordinate_previously_attacked_x = x
-                        self.coordinate_previously_attacked_y = y
-                        self.set_positions_previously_attacked.add((x, y))
-                        return (x,y)
+            while True:
+                coords = get_position_in_order_parity(self.index_next_in_order, size_x, size_y)
+                if coords is None:
+                    # the order is exhausted (e.g. the positions attacked were not picked in this order)
+                    coords = self._get_next_position_remaining(size_x, size_y)
+                    break
+                self.index_next_in_order += 1
+                if coords not in attacked_positions:
+                    break
+
+        attacked_positions.add(coords)
+        return coords
+
+    def _get_next_position_remaining(self, size_x: int, size_y: int) -> Tuple[int, int]:
+        # each cell is considered at most once over the game, like the positions of the order
+        while self.index_next_cell_remaining < size_x * size_y:
+            coords = (self.index_next_cell_remaining % size_x + 1, self.index_next_cell_remaining // size_x + 1)
+            self.index_next_cell_remaining += 1
+            if coords not in self.set_positions_previously_attacked:
+                return coords
+        raise ValueError("All the positions of the board have been attacked.")
+
+
+def get_position_in_order_parity(index: int, size_x: int, size_y: int) -> Optional[Tuple[int, int]]:
+    """
+    The order of the checkerboard pattern: first the positions (x, y) with x + y odd, starting from (2, 1), row by row,
+    then the other ones. Every ship of length 2 or more covers at least one position of the first pass.
+    The positions are computed from their index rather than listed, which would take a time and a memory proportional to
+    the area of the board: each pair of rows holds size_x positions of each pass.
+    :param index: index in the order, from 0
+    :return: the position (x, y) at that index, None if the index is past the last position of the board
+    """
+    number_positions_odd = size_x * size_y // 2
+    if index < number_positions_odd:
+        # odd rows start at x = 2, even rows at x = 1
+        number_positions_row_odd = size_x // 2
+        x_start_row_odd, x_start_row_even = 2, 1
+    elif index < size_x * size_y:
+        index -= number_positions_odd
+        number_positions_row_odd = size_x - size_x // 2
+        x_start_row_odd, x_start_row_even = 1, 2
+    else:
+        return None
+
+    index_pair_rows, index_in_pair = divmod(index, size_x)
+    if index_in_pair < number_positions_row_odd:
+        return x_start_row_odd + 2 * index_in_pair, 2 * index_pair_rows + 1
+    return x_start_row_even + 2 * (index_in_pair - number_positions_row_odd), 2 * index_pair_rows + 2
 
 
 class PlayerRandom(Player):
-    def __init__(self, name_player: str = None):
-        board = BoardAutomatic()
+    def __init__(self, name_player: str = None, board: Board = None, rng: random.Random = None):
+        """
+        :param name_player: name of the player
+        :param board: board of the player, generated automatically (BoardAutomatic) if None
+        :param rng: random generator used for the board generated automatically and for the strategy, a new one seeded
+        from the system if None
+        """
+        if rng is None:
+            rng = random.Random()
+        if board is None:
+            board = BoardAutomatic(rng=rng)
         self.set_positions_previously_attacked = set()
         self.last_attack_coord = None
         self.list_ships_opponent_previously_sunk = []
 
-        super().__init__(board, name_player)
+        # The positions which can still be attacked (not attacked and not near a ship which has sunk) are the first
+        # number_positions_free slots of a permutation of the cells of the board. A position is removed by swapping it
+        # with the last free slot (Fisher-Yates), so that both the random pick and the removal take a constant time.
+        # The slot of a cell is the index of the cell (index_cell = (y - 1) * size_x + x - 1) until it is swapped: only
+        # the slots and the cells swapped are stored, the memory taken is proportional to the number of removals and not
+        # to the area of the board. None until the size of the board attacked is known.
+        self.size_x = None  # type: Optional[int]
+        self.number_positions_free = None  # type: Optional[int]
+        self.dict_index_cell_per_slot = {}  # slot -> index of the cell in it, for the slots swapped
+        self.dict_slot_per_index_cell = {}  # index of a cell -> its slot, for the cells swapped
+
+        super().__init__(board, name_player, rng)
+
+    def update_after_attack(self,
+                            opponent,
+                            coord_x: int,
+                            coord_y: int,
+                            is_ship_hit: bool,
+                            has_ship_sunk: bool) -> None:
+        if not has_ship_sunk:
+            return
+
+        ship = opponent.board.get_ship_at(coord_x, coord_y)
+        self.list_ships_opponent_previously_sunk.append(ship)
+        self.remove_positions_near_ship(ship, opponent.board.SIZE_X, opponent.board.SIZE_Y)
 
     def select_coordinates_to_attack(self, opponent: Player) -> tuple:
-        position_to_attack = self.select_random_coordinates_to_attack()
+        position_to_attack = self.select_random_coordinates_to_attack(opponent.board.SIZE_X, opponent.board.SIZE_Y)
 
         self.set_positions_previously_attacked.add(position_to_attack)
         self.last_attack_coord = position_to_attack
         return position_to_attack
 
-    def select_random_coordinates_to_attack(self) -> tuple:
-        has_position_been_previously_attacked = True
-        is_position_near_previously_sunk_ship = True
-        coord_random = None
+    def select_random_coordinates_to_attack(self,
+                                            size_x: int = Board.SIZE_X,
+                                            size_y: int = Board.SIZE_Y) -> tuple:
+        """
+        :return: a position picked uniformly among the positions which have not been attacked and are not near a ship
+        which has sunk. The position is removed from the free positions.
+        :raise ValueError: if no position can be attacked any more
+        """
+        self._initialise_positions_free(size_x, size_y)
+        if self.number_positions_free == 0:
+            raise ValueError("All the positions of the board have been attacked or are near a ship which has sunk.")
+
+        index_cell = self._get_index_cell_at_slot(self.rng.randrange(self.number_positions_free))
+        self._remove_index_cell_free(index_cell)
+        return index_cell % size_x + 1, index_cell // size_x + 1
+
+    def remove_positions_near_ship(self, ship: Ship, size_x: int, size_y: int) -> None:
+        """
+        Removes from the free positions the positions of a ship which has sunk and the positions around it, where no
+        other ship can be.
+        """
+        self._initialise_positions_free(size_x, size_y)
+        for x in range(max(ship.x_start - 1, 1), min(ship.x_end + 1, size_x) + 1):
+            for y in range(max(ship.y_start - 1, 1), min(ship.y_end + 1, size_y) + 1):
+                self._remove_index_cell_free((y - 1) * size_x + x - 1)
+
+    def _initialise_positions_free(self, size_x: int, size_y: int) -> None:
+        if self.number_positions_free is None:
+            self.size_x = size_x
+            self.number_positions_free = size_x * size_y
+
+    def _get_index_cell_at_slot(self, slot: int) -> int:
+        return self.dict_index_cell_per_slot.get(slot, slot)
 
-        while has_position_been_previously_attacked or is_position_near_previously_sunk_ship:
-            coord_random = self._get_random_coordinates()
+    def _remove_index_cell_free(self, index_cell: int) -> None:
+        slot = self.dict_slot_per_index_cell.get(index_cell, index_cell)
+        if slot >= self.number_positions_free:
+            return  # removed already
 
-            has_position_been_previously_attacked = coord_random in self.set_positions_previously_attacked
-            is_position_near_previously_sunk_ship = self._is_position_near_previously_sunk_ship(coord_random)
+        self.number_positions_free -= 1
+        slot_last = self.number_positions_free
+        index_cell_last = self._get_index_cell_at_slot(slot_last)
+        self.dict_index_cell_per_slot[slot], self.dict_slot_per_index_cell[index_cell_last] = index_cell_last, slot
+        self.dict_index_cell_per_slot[slot_last], self.dict_slot_per_index_cell[index_cell] = index_cell, slot_last
 
-        return coord_random
 
-    def _get_random_coordinates(self) -> tuple:
-        coord_random_x = random.randint(1, self.board.SIZE_X)
-        coord_random_y = random.randint(1, self.board.SIZE_Y)
+class PlayerProbability(Player):
+    """
+    Player attacking the cell covered by the largest number of placements of the remaining ships still consistent with
+    the outcomes of its previous attacks (probability density targeting).
+    The placements are those of the placement catalog (see battleship.catalog). A placement stops being consistent if it
+    covers a cell missed, covers or touches a ship which has sunk, or touches a cell hit without covering it.
+    While some ships are hit but have not sunk, the cells covered by the placements covering those hits are attacked
+    first.
+    The densities are updated incrementally: each attack only updates the placements it makes inconsistent. Picking the
+    cell still scans all the cells of the board at every move.
+    The placement catalog is limited to boards of at most battleship.catalog.MAXIMUM_NUMBER_CELLS cells (64x64): the
+    first attack on a larger board raises a ValueError.
+    """
 
-        coord_random = (coord_random_x, coord_random_y)
+    def __init__(self, name_player: str = None, board: Board = None, rng: random.Random = None):
+        """
+        :param name_player: name of the player
+        :param board: board of the player, generated automatically (BoardAutomatic) if None
+        :param rng: random generator used for the board generated automatically and for breaking ties between cells,
+        a new one seeded from the system if None
+        """
+        if rng is None:
+            rng = random.Random()
+        if board is None:
+            board = BoardAutomatic(rng=rng)
+
+        super().__init__(board, name_player, rng)
+
+        # state of the densities, set at the first attack, once the size of the opponent's board is known
+        self.size_x = None
+        self.size_y = None
+        self.dict_tables_per_length = {}  # length -> PlacementTables
+        self.dict_number_ships_left_per_length = {}  # length -> number of ships of that length not sunk yet
+        self.dict_placements_consistent_per_length = {}  # length -> bytearray, 1 if the placement is still consistent
+        # length -> number of consistent placements covering each cell
+        self.dict_density_per_length = {}
+        # length -> sum, over the consistent placements covering each cell, of the number of hits (of ships not sunk)
+        # they cover
+        self.dict_density_hits_per_length = {}
+        # same as above, summed over all the lengths and weighted by the number of ships left per length
+        self.list_density = []
+        self.list_density_hits = []
+        self.set_index_cells_hit_not_sunk = set()
+        self.list_is_cell_candidate = []  # False for the cells attacked, or known to be empty
+
+    def _initialise_densities(self, opponent: Player) -> None:
+        """
+        :raise ValueError: if the opponent's board is too large for the placement catalog
+        """
+        # the catalog (and its cache on disk) is only needed by this strategy
+        from battleship.catalog import MAXIMUM_NUMBER_CELLS, get_placement_tables
+
+        size_x, size_y = opponent.board.SIZE_X, opponent.board.SIZE_Y
+        if size_x * size_y > MAXIMUM_NUMBER_CELLS:
+            raise ValueError(f"{type(self).__name__} only supports boards of at most {MAXIMUM_NUMBER_CELLS} cells, "
+                             f"the board of {opponent} has {size_x}x{size_y} cells.")
+
+        self.size_x = size_x
+        self.size_y = size_y
+        number_cells = self.size_x * self.size_y
+
+        self.list_density = [0] * number_cells
+        self.list_density_hits = [0] * number_cells
+        self.list_is_cell_candidate = [True] * number_cells
+
+        for length, number_ships in opponent.board.DICT_NUMBER_SHIPS_PER_LENGTH.items():
+            if not number_ships:
+                continue
+            tables = get_placement_tables(length, self.size_x, self.size_y)
+            density = [0] * number_cells
+            for tuple_cells in tables.list_cells_per_placement:
+                for index_cell in tuple_cells:
+                    density[index_cell] += 1
+
+            self.dict_tables_per_length[length] = tables
+            self.dict_number_ships_left_per_length[length] = number_ships
+            self.dict_placements_consistent_per_length[length] = bytearray(b'\x01') * tables.number_placements
+            self.dict_density_per_length[length] = density
+            self.dict_density_hits_per_length[length] = [0] * number_cells
+            for index_cell in range(number_cells):
+                self.list_density[index_cell] += number_ships * density[index_cell]
 
-        return coord_random
+    def select_coordinates_to_attack(self, opponent: Player) -> Tuple[int, int]:
+        """
+        Overrides the abstract method of the parent class.
+        :param opponent: object of class Player representing the player under attack
+        :return: a tuple of coordinates (coord_x, coord_y) at which the next attack will be performed
+        """
+        if self.size_x is None:
+            self._initialise_densities(opponent)
+
+        list_density, list_density_hits = self.list_density, self.list_density_hits
+        list_is_cell_candidate = self.list_is_cell_candidate
+
+        # the density of the hits comes first, then the density of all the placements
+        score_best = (-1, -1)
+        list_index_cells_best = []
+        for index_cell in range(len(list_is_cell_candidate)):
+            if list_is_cell_candidate[index_cell]:
+                score = (list_density_hits[index_cell], list_density[index_cell])
+                if score > score_best:
+                    score_best = score
+                    list_index_cells_best = [index_cell]
+                elif score == score_best:
+                    list_index_cells_best.append(index_cell)
+
+        if not list_index_cells_best:
+            # all the cells are known, which can only happen if the opponent's board does not follow the rules
+            set_coordinates_previous_shots = opponent.board.set_coordinates_previous_shots
+            list_index_cells_best = [(y - 1) * self.size_x + x - 1
+                                     for y in range(1, self.size_y + 1) for x in range(1, self.size_x + 1)
+                                     if (x, y) not in set_coordinates_previous_shots]
+
+        index_cell = self.rng.choice(list_index_cells_best)
+        return index_cell % self.size_x + 1, index_cell // self.size_x + 1
+
+    def update_after_attack(self,
+                            opponent,
+                            coord_x: int,
+                            coord_y: int,
+                            is_ship_hit: bool,
+                            has_ship_sunk: bool) -> None:
+        if self.size_x is None:
+            self._initialise_densities(opponent)
+
+        index_cell = (coord_y - 1) * self.size_x + coord_x - 1
+        self.list_is_cell_candidate[index_cell] = False
+
+        if not is_ship_hit:
+            self._remove_placements_covering(index_cell)
+            return
+
+        # no other ship can touch the ship hit
+        for length, tables in self.dict_tables_per_length.items():
+            for index_placement in tables.list_placements_near_cell[index_cell]:
+                self._remove_placement(length, index_placement)
+
+        self.set_index_cells_hit_not_sunk.add(index_cell)
+        self._add_density_hits(index_cell, 1)
 
-    def _is_position_near_previously_sunk_ship(self, coord: tuple) -> bool:
-        for ship_opponent in self.list_ships_opponent_previously_sunk:  # type: Ship
-            if ship_opponent.has_sunk() and ship_opponent.is_near_coordinate(*coord):
-                return True
-        return False
+        if has_ship_sunk:
+            self._update_after_ship_sunk(opponent.board.get_ship_at(coord_x, coord_y))
+
+    def _update_after_ship_sunk(self, ship: Ship) -> None:
+        list_index_cells_ship = [(y - 1) * self.size_x + x - 1 for x, y in ship.get_all_coordinates()]
+
+        for index_cell in list_index_cells_ship:
+            if index_cell in self.set_index_cells_hit_not_sunk:
+                self._add_density_hits(index_cell, -1)
+                self.set_index_cells_hit_not_sunk.discard(index_cell)
+
+        # the ship and its surrounding cells cannot contain any other ship
+        for x in range(max(ship.x_start - 1, 1), min(ship.x_end + 1, self.size_x) + 1):
+            for y in range(max(ship.y_start - 1, 1), min(ship.y_end + 1, self.size_y) + 1):
+                index_cell = (y - 1) * self.size_x + x - 1
+                self.list_is_cell_candidate[index_cell] = False
+                self._remove_placements_covering(index_cell)
+
+        length = ship.length()
+        if self.dict_number_ships_left_per_length.get(length):
+            self.dict_number_ships_left_per_length[length] -= 1
+            # the density of that length has one ship less
+            density = self.dict_density_per_length[length]
+            density_hits = self.dict_density_hits_per_length[length]
+            for index_cell in range(len(density)):
+                self.list_density[index_cell] -= density[index_cell]
+                self.list_density_hits[index_cell] -= density_hits[index_cell]
+
+    def _add_density_hits(self, index_cell_hit: int, sign: int) -> None:
+        """
+        Adds (sign=1) or removes (sign=-1) the hit at index_cell_hit from the density of the hits, for all the
+        consistent placements covering it
+        """
+        for length, tables in self.dict_tables_per_length.items():
+            number_ships_left = self.dict_number_ships_left_per_length[length]
+            list_placements_consistent = self.dict_placements_consistent_per_length[length]
+            density_hits = self.dict_density_hits_per_length[length]
+            for index_placement in tables.list_placements_per_cell[index_cell_hit]:
+                if list_placements_consistent[index_placement]:
+                    for index_cell in tables.list_cells_per_placement[index_placement]:
+                        density_hits[index_cell] += sign
+                        self.list_density_hits[index_cell] += sign * number_ships_left
+
+    def _remove_placements_covering(self, index_cell: int) -> None:
+        for length, tables in self.dict_tables_per_length.items():
+            for index_placement in tables.list_placements_per_cell[index_cell]:
+                self._remove_placement(length, index_placement)
+
+    def _remove_placement(self, length: int, index_placement: int) -> None:
+        list_placements_consistent = self.dict_placements_consistent_per_length[length]
+        if not list_placements_consistent[index_placement]:
+            return
+        list_placements_consistent[index_placement] = 0
+
+        tuple_cells = self.dict_tables_per_length[length].list_cells_per_placement[index_placement]
+        number_hits = sum(1 for index_cell in tuple_cells if index_cell in self.set_index_cells_hit_not_sunk)
+        number_ships_left = self.dict_number_ships_left_per_length[length]
+        density = self.dict_density_per_length[length]
+        density_hits = self.dict_density_hits_per_length[length]
+
+        for index_cell in tuple_cells:
+            density[index_cell] -= 1
+            self.list_density[index_cell] -= number_ships_left
+            if number_hits:
+                density_hits[index_cell] -= number_hits
+                self.list_density_hits[index_cell] -= number_hits * number_ships_left
 
 
 if __name__ == '__main__':
@@ -0,0 +1,38 @@
+import hashlib
+import random
+
+# number of bits of the seeds derived by get_seed_child
+NUMBER_BITS_SEED = 64
+
+
+def get_seed_child(seed: int, *keys) -> int:
+    """
+    Derives deterministically a new seed from a seed and some keys, e.g. get_seed_child(seed_tournament, index_game).
+    The seeds derived with different keys give independent random streams, whatever the process deriving them.
+    :param seed: parent seed (int)
+    :param keys: ints or strs identifying the child
+    :return: the seed of the child
+    """
+    string_seed = ':'.join(str(element) for element in (seed,) + keys)
+    digest = hashlib.blake2b(string_seed.encode(), digest_size=NUMBER_BITS_SEED // 8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def get_rng(seed: int = None, *keys) -> random.Random:
+    """
+    :param seed: parent seed, None to get a generator seeded from the entropy of the system
+    :param keys: keys passed to get_seed_child, the generator is seeded with the parent seed directly if there are none
+    :return: a new random generator
+    """
+    if seed is None:
+        return random.Random()
+    if keys:
+        seed = get_seed_child(seed, *keys)
+    return random.Random(seed)
+
+
+def get_new_seed() -> int:
+    """
+    :return: a new seed, taken from the entropy of the system
+    """
+    return random.SystemRandom().getrandbits(NUMBER_BITS_SEED)
@@ -0,0 +1,304 @@
+import argparse
+import asyncio
+import random
+from typing import Callable, Optional, Tuple
+
+from battleship.board import Board, BoardAutomatic
+from battleship.convert import get_str_coordinates_from_tuple, get_tuple_coordinates_from_str
+from battleship.game import Game, GameResult
+from battleship.player import Player, PlayerAutomatic
+from battleship.seeding import get_new_seed, get_rng, get_seed_child
+
+# Line protocol (UTF-8, one message per line) between the server and a remote player:
+# server -> client:
+#   WELCOME <name_player> <name_opponent>     at the connection
+#   SHIP <start> <end>                        once per ship of the player's board, e.g. SHIP B2 B5
+#   START <YOU|OPPONENT>                      who plays first
+#   YOUR_TURN                                 the server waits for coordinates
+#   ERROR <message>                           the coordinates received are not valid, YOUR_TURN follows
+#   RESULT <position> <MISS|HIT|SUNK>         outcome of the player's attack
+#   ATTACKED <position> <MISS|HIT|SUNK>       outcome of the opponent's attack
+#   WIN / LOSE                                end of the game, the connection is then closed
+# client -> server:
+#   <position>                                e.g. B7 (as read by get_tuple_coordinates_from_str)
+#   QUIT                                      abandons the game
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# connections waiting to be accepted: many clients can connect at the same time, beyond it the connections are delayed
+SIZE_BACKLOG_CONNECTIONS = 1024
+
+# the games between automatic players give control back to the event loop after this number of attacks
+NUMBER_ATTACKS_PER_YIELD = 10
+
+
+class PlayerRemote(Player):
+    """
+    Player whose attacks are received from a client connected to the GameServer.
+    The coordinates are received asynchronously by receive_coordinates before each attack, so that waiting for the
+    client never blocks the event loop; select_coordinates_to_attack then returns them.
+    """
+
+    def __init__(self,
+                 reader: asyncio.StreamReader,
+                 writer: asyncio.StreamWriter,
+                 name_player: str = None,
+                 board: Board = None,
+                 rng: random.Random = None):
+        """
+        :param reader: stream of the lines sent by the client
+        :param writer: stream of the lines sent to the client
+        :param name_player: name of the player
+        :param board: board of the player, generated automatically (BoardAutomatic) if None
+        :param rng: random generator used for the board generated automatically, a new one seeded from the system if
+        None
+        """
+        if rng is None:
+            rng = random.Random()
+        if board is None:
+            board = BoardAutomatic(rng=rng)
+
+        super().__init__(board, name_player, rng)
+
+        self.reader = reader
+        self.writer = writer
+        self.coordinates_next = None  # type: Optional[Tuple[int, int]]
+        self.set_positions_previously_attacked = set()
+
+    def select_coordinates_to_attack(self, opponent: Player) -> Tuple[int, int]:
+        """
+        Overrides the abstract method of the parent class.
+        :return: the coordinates received by the last call to receive_coordinates
+        """
+        return self.coordinates_next
+
+    async def send_line(self, line: str) -> None:
+        self.writer.write((line + '\n').encode())
+        await self.writer.drain()
+
+    async def receive_coordinates(self, opponent: Player) -> Tuple[int, int]:
+        """
+        Asks the client for coordinates until valid ones, not attacked before, are received.
+        :param opponent: object of class Player representing the player under attack, whose board gives the coordinates
+        which are valid
+        :return: the coordinates received, also kept for select_coordinates_to_attack
+        :raise ConnectionError: if the client quits the game, disconnects or sends a line longer than the limit of the
+        reader
+        """
+        while True:
+            await self.send_line('YOUR_TURN')
+
+            try:
+                line = await self.reader.readline()
+            except ValueError:  # asyncio.LimitOverrunError, the rest of the line cannot be told from the next ones
+                raise ConnectionError(f"{self} sent a line too long.")
+            if not line:
+                raise ConnectionError(f"{self} disconnected.")
+            coord_str = line.decode(errors='replace').strip().upper()
+            if coord_str == 'QUIT':
+                raise ConnectionError(f"{self} quit the game.")
+
+            try:
+                coordinates = get_tuple_coordinates_from_str(coord_str, opponent.board.SIZE_X, opponent.board.SIZE_Y)
+            except ValueError as value_error:
+                await self.send_line(f'ERROR {value_error}')
+                continue
+
+            if coordinates in self.set_positions_previously_attacked:
+                await self.send_line(f"ERROR The position '{coord_str}' has already been attacked")
+                continue
+
+            self.set_positions_previously_attacked.add(coordinates)
+            self.coordinates_next = coordinates
+            return coordinates
+
+
+def get_str_outcome(is_ship_hit: bool, has_ship_sunk: bool) -> str:
+    if has_ship_sunk:
+        return 'SUNK'
+    return 'HIT' if is_ship_hit else 'MISS'
+
+
+async def play_game_async(game: Game) -> GameResult:
+    """
+    Plays a game inside an event loop: the remote players are waited for asynchronously, and the games between
+    automatic players regularly give control back to the loop, so that many games can be played concurrently.
+    :return: the result of the game
+    :raise ConnectionError: if a remote player quits the game or disconnects
+    """
+    game.start()
+
+    for player in (game.player_1, game.player_2):
+        if isinstance(player, PlayerRemote):
+            await player.send_line(f"START {'YOU' if player is game.player_turn else 'OPPONENT'}")
+
+    number_attacks_without_yield = 0
+    while not game.is_over():
+        player_turn, player_opponent = game.player_turn, game.player_opponent
+
+        if isinstance(player_turn, PlayerRemote):
+            await player_turn.receive_coordinates(player_opponent)
+
+        coord_x, coord_y, is_ship_hit, has_ship_sunk = game.play_next_attack()
+
+        str_attack = f'{get_str_coordinates_from_tuple(coord_x, coord_y)} {get_str_outcome(is_ship_hit, has_ship_sunk)}'
+        if isinstance(player_turn, PlayerRemote):
+            await player_turn.send_line(f'RESULT {str_attack}')
+        if isinstance(player_opponent, PlayerRemote):
+            await player_opponent.send_line(f'ATTACKED {str_attack}')
+
+        number_attacks_without_yield += 1
+        if number_attacks_without_yield >= NUMBER_ATTACKS_PER_YIELD:
+            number_attacks_without_yield = 0
+            await asyncio.sleep(0)
+
+    game_result = game.get_result()
+
+    for index_player, player in enumerate((game.player_1, game.player_2), 1):
+        if isinstance(player, PlayerRemote):
+            await player.send_line('WIN' if index_player == game_result.index_winner else 'LOSE')
+
+    return game_result
+
+
+class GameServer(object):
+    """
+    Hosts concurrent games in a single event loop: each client connecting over TCP plays a game against an automatic
+    player, and games between automatic players can be scheduled alongside them.
+    """
+
+    def __init__(self,
+                 factory_opponent: Callable[..., Player] = PlayerAutomatic,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 seed: int = None,
+                 callback_game_over: Callable[[GameResult], None] = None):
+        """
+        :param factory_opponent: callable returning the opponent of each remote player, called with the keyword
+        argument rng (see battleship.tournament.PlayerFactory)
+        :param host: address on which the server listens
+        :param port: port on which the server listens, 0 to pick a free one
+        :param seed: seed from which the random generators of the games are derived, a new one if None
+        :param callback_game_over: called with the result of every game finished, if not None
+        """
+        self.factory_opponent = factory_opponent
+        self.host = host
+        self.port = port
+        self.seed = seed if seed is not None else get_new_seed()
+        self.callback_game_over = callback_game_over
+
+        self.server = None  # type: asyncio.AbstractServer
+        self.set_tasks = set()  # tasks of the games being played
+        self.index_next_game = 0
+        self.number_games_finished = 0
+        self.number_games_abandoned = 0
+
+    async def start(self) -> None:
+        """
+        Starts listening. If the port was 0, self.port is then the port picked.
+        """
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port,
+                                                 backlog=SIZE_BACKLOG_CONNECTIONS)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """
+        Stops listening and cancels the games being played
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.set_tasks):
+            task.cancel()
+        if self.set_tasks:
+            await asyncio.gather(*self.set_tasks, return_exceptions=True)
+
+    def schedule_automatic_game(self,
+                                factory_player_1: Callable[..., Player],
+                                factory_player_2: Callable[..., Player]) -> asyncio.Task:
+        """
+        Schedules a game between automatic players in the event loop of the server.
+        :return: the task of the game, whose result is the GameResult
+        """
+        seed_game = self._get_seed_next_game()
+        game = Game(player_1=factory_player_1(rng=get_rng(seed_game, 'player_1')),
+                    player_2=factory_player_2(rng=get_rng(seed_game, 'player_2')),
+                    rng=get_rng(seed_game, 'game'))
+        return self._create_task_game(game)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        seed_game = self._get_seed_next_game()
+        player_remote = PlayerRemote(reader, writer, rng=get_rng(seed_game, 'player_1'))
+        player_opponent = self.factory_opponent(rng=get_rng(seed_game, 'player_2'))
+        game = Game(player_1=player_remote,
+                    player_2=player_opponent,
+                    rng=get_rng(seed_game, 'game'))
+
+        try:
+            await player_remote.send_line(f'WELCOME {player_remote} {player_opponent}')
+            for ship in player_remote.board.list_ships:
+                await player_remote.send_line(f'SHIP {get_str_coordinates_from_tuple(ship.x_start, ship.y_start)} '
+                                              f'{get_str_coordinates_from_tuple(ship.x_end, ship.y_end)}')
+            await self._create_task_game(game)
+        except ConnectionError:  # the client disconnected before the game started, or its game was abandoned
+            pass
+        finally:
+            writer.close()
+            # StreamWriter.wait_closed only exists from Python 3.7
+            if hasattr(writer, 'wait_closed'):
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    def _create_task_game(self, game: Game) -> asyncio.Task:
+        task = asyncio.ensure_future(self._play_game(game))
+        self.set_tasks.add(task)
+        task.add_done_callback(self.set_tasks.discard)
+        return task
+
+    async def _play_game(self, game: Game) -> Optional[GameResult]:
+        try:
+            game_result = await play_game_async(game)
+        except ConnectionError:
+            self.number_games_abandoned += 1
+            return None
+
+        self.number_games_finished += 1
+        if self.callback_game_over is not None:
+            self.callback_game_over(game_result)
+        return game_result
+
+    def _get_seed_next_game(self) -> int:
+        self.index_next_game += 1
+        return get_seed_child(self.seed, 'game', self.index_next_game - 1)
+
+
+def run_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, seed: int = None) -> None:
+    """
+    Runs a GameServer until it is interrupted (Ctrl+C)
+    """
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    game_server = GameServer(host=host, port=port, seed=seed)
+
+    try:
+        loop.run_until_complete(game_server.start())
+        print(f"Battleship server listening on {game_server.host}:{game_server.port}")
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(game_server.close())
+        loop.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Battleship server for remote players.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--seed', type=int, default=None)
+    arguments = parser.parse_args()
+
+    run_server(arguments.host, arguments.port, arguments.seed)
@@ -1,8 +1,15 @@
+from typing import Tuple
+
+
 class Ship(object):
     """
     Representing the ships that are placed on the board
     """
 
+    # Only the end points of the ship and a bitmask of its damages are stored:
+    # bit i of mask_damages is set when the i-th position of the ship (starting from (x_start, y_start)) is damaged
+    __slots__ = ('x_start', 'y_start', 'x_end', 'y_end', 'mask_damages')
+
     def __init__(self,
                  coord_start: tuple,
                  coord_end: tuple):
@@ -22,8 +29,25 @@ class Ship(object):
         if not self.is_horizontal() and not self.is_vertical():
             raise ValueError("The ship_1 needs to have either a horizontal or a vertical orientation.")
 
-        self.set_coordinates_damages = set()
-        self.set_all_coordinates = self.get_all_coordinates()
+        self.mask_damages = 0
+
+    @property
+    def set_all_coordinates(self) -> set:
+        """
+        :return: A set containing only all the coordinates of the ship, computed on demand
+        """
+        return self.get_all_coordinates()
+
+    @property
+    def set_coordinates_damages(self) -> set:
+        """
+        :return: A set containing the coordinates at which the ship is damaged, computed on demand
+        """
+        set_coordinates_damages = set()
+        for offset in range(self.length()):
+            if self.mask_damages >> offset & 1:
+                set_coordinates_damages.add(self._get_coordinates_from_offset(offset))
+        return set_coordinates_damages
 
     def __len__(self):
         return self.length()
@@ -31,6 +55,15 @@ class Ship(object):
     def __repr__(self):
         return f"Ship(start=({self.x_start},{self.y_start}), end=({self.x_end},{self.y_end}))"
 
+    def copy(self) -> 'Ship':
+        """
+        :return: a new ship of the same class, at the same position, with the same damages
+        """
+        ship = type(self).__new__(type(self))
+        ship.x_start, ship.y_start, ship.x_end, ship.y_end = self.x_start, self.y_start, self.x_end, self.y_end
+        ship.mask_damages = self.mask_damages
+        return ship
+
     @classmethod
     def get_ship_from_str_coordinates(cls, coord_str_start: str, coord_str_end: str) -> 'Ship':
         from battleship.convert import get_tuple_coordinates_from_str
@@ -96,10 +129,8 @@ class Ship(object):
         :param coord_damage_x: integer representing the projection of a coordinate on the x-axis
         :param coord_damage_y: integer representing the projection of a coordinate on the y-axis
         """
-        if self.is_on_coordinate(coord_damage_x, coord_damage_y): #checks if input coordinates are in ship, if so, adds to damage set
-            self.set_coordinates_damages.add((coord_damage_x, coord_damage_y))
-
-        # TODO
+        if self.is_on_coordinate(coord_damage_x, coord_damage_y): #checks if input coordinates are in ship, if so, sets the damage bit
+            self.mask_damages |= 1 << self._get_offset(coord_damage_x, coord_damage_y)
 
     def is_damaged_at(self,
                       coord_x: int,
@@ -110,29 +141,40 @@ class Ship(object):
         :param coord_y: integer representing the projection of a coordinate on the y-axis
         :return True if and only if the ship is damaged at (coord_x, coord_y)
         """
-        coord = (coord_x,coord_y)
-        if coord in self.set_coordinates_damages:
-            return True
-        else:
+        if not self.is_on_coordinate(coord_x, coord_y):
             return False
-        # TODO
+        return bool(self.mask_damages >> self._get_offset(coord_x, coord_y) & 1)
 
     def number_damages(self) -> int:
         """
         :return: The total number of coordinates at which the ship is damaged
         """
-        return len(self.set_coordinates_damages)#length of set_coordinates_damages is the number of damaged coordinates
+        return bin(self.mask_damages).count('1')  # each damaged coordinate is one bit set in mask_damages
 
     def has_sunk(self) -> bool:
         """
         :return: True if and only if ship is damaged at all its positions
         """
-        if self.number_damages() == self.length():
-            return True
-        else:
-            return False
-        #as set_coordinates_damages is a set, it cannot have repeating values. If its length = length of the ship,
-        #the ship has sunk. Therefore returns True, else False
+        # the ship has sunk once the bits of all its positions are set
+        return self.mask_damages == (1 << self.length()) - 1
+
+    def _get_offset(self, coord_x: int, coord_y: int) -> int:
+        """
+        :param coord_x: integer representing the projection of a coordinate of the ship on the x-axis
+        :param coord_y: integer representing the projection of a coordinate of the ship on the y-axis
+        :return: the position of (coord_x, coord_y) along the ship, 0 being (x_start, y_start)
+        """
+        # one of the two differences is always 0, as the ship is either horizontal or vertical
+        return coord_x - self.x_start + coord_y - self.y_start
+
+    def _get_coordinates_from_offset(self, offset: int) -> Tuple[int, int]:
+        """
+        :param offset: position along the ship, 0 being (x_start, y_start)
+        :return: the coordinates (coord_x, coord_y) of that position
+        """
+        if self.is_horizontal():
+            return self.x_start + offset, self.y_start
+        return self.x_start, self.y_start + offset
 
     def get_all_coordinates(self) -> set:
         """
@@ -182,28 +224,10 @@ class Ship(object):
         :param other_ship: other object of class Ship
         :return: False if and only if there is a coordinate of other_ship that is near this ship.
         """
-        #Starts by scanning over each coordinate of self ship
-        for x in range(self.x_start,self.x_end+1):
-            for y in range(self.y_start,self.y_end+1):
-                #if any of these coordiates are near another ship,
-                #print(f"C1 {x},{y}")
-                if self.is_near_coordinate(x,y):
-                    #print("ship nearby")
-                    #scans the surrounding coordinates to see if any of them are on other ship
-                    for x2 in range(x-1,x+2):
-                        for y2 in range(y-1,y+2):
-                            #if the surrounding coordinate is on other ship, the two ships are
-                            #near each other so returns true
-                            #print(f"C2 {x2},{y2}")
-                            if (other_ship.is_on_coordinate(x2,y2)):
-                                #print(f"other ship found: {x2},{y2}")
-                                return True
-        #if the whole scaning process finds that none of the surrounding coordinates are on
-        #other ship, the ships must not be close to each other, so returns false.
-        #sadly, is_near_coordinate does not return coordinates and does not check for specific ships, so
-        #there are a lot of 'false positives' where the method considers parts of the self ship as a nearby ship
-        #which increases processing steps, however the method does its job without fail
-        return False
+        # other_ship is near this ship if and only if it intersects the rectangle made of this ship and its
+        # surrounding positions (this ship inflated by 1 in each direction)
+        return self.x_start - 1 <= other_ship.x_end and other_ship.x_start <= self.x_end + 1 \
+               and self.y_start - 1 <= other_ship.y_end and other_ship.y_start <= self.y_end + 1
 
 
 
@@ -0,0 +1,329 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.fleets import FleetBatch, generate_fleets
+
+# Strategies supported by the simulator
+# random: attacks a random position that has not been attacked yet and is not near a ship which has sunk (PlayerRandom)
+STRATEGY_RANDOM = 'random'
+STRATEGY_PARITY_HUNT = 'parity_hunt'  # PlayerAutomatic: checkerboard pattern, then the neighbours of the hits
+
+# number of games simulated at the same time, to bound the memory used by the arrays
+SIZE_CHUNK_SIMULATION = 65536
+
+
+class SimulationResult(object):
+    """
+    Results of games simulated by simulate_games, as arrays with one value per game
+    """
+
+    def __init__(self,
+                 array_index_player_starting: np.ndarray,
+                 array_index_winner: np.ndarray,
+                 array_number_shots_player_1: np.ndarray,
+                 array_number_shots_player_2: np.ndarray):
+        self.array_index_player_starting = array_index_player_starting
+        self.array_index_winner = array_index_winner
+        self.array_number_shots_player_1 = array_number_shots_player_1
+        self.array_number_shots_player_2 = array_number_shots_player_2
+
+    def __len__(self):
+        return len(self.array_index_winner)
+
+    def __repr__(self):
+        return f"SimulationResult(games={len(self)}, " \
+               f"win_rates=({self.get_win_rate(1):.3f}, {self.get_win_rate(2):.3f}))"
+
+    def get_win_rate(self, index_player: int) -> float:
+        """
+        :param index_player: 1 for player_1, 2 for player_2
+        :return: the proportion of games won by the player
+        """
+        return float(np.mean(self.array_index_winner == index_player)) if len(self) else 0.
+
+    def get_stats(self) -> dict:
+        """
+        :return: the statistics of the games, as a dict that can be serialised in JSON
+        """
+        dict_stats = {'number_games': len(self)}
+
+        for index_player, array_number_shots in ((1, self.array_number_shots_player_1),
+                                                 (2, self.array_number_shots_player_2)):
+            is_win = self.array_index_winner == index_player
+            dict_stats[f'player_{index_player}'] = {
+                'number_wins': int(np.sum(is_win)),
+                'win_rate': self.get_win_rate(index_player),
+                'mean_shots_per_game': float(np.mean(array_number_shots)) if len(self) else 0.,
+                'mean_shots_per_win': float(np.mean(array_number_shots[is_win])) if np.any(is_win) else 0.,
+            }
+
+        return dict_stats
+
+
+def simulate_games(number_games: int,
+                   strategy_player_1: str = STRATEGY_PARITY_HUNT,
+                   strategy_player_2: str = STRATEGY_RANDOM,
+                   rng: np.random.Generator = None,
+                   size_x: int = Board.SIZE_X,
+                   size_y: int = Board.SIZE_Y,
+                   dict_number_ships_per_length: Dict[int, int] = None) -> SimulationResult:
+    """
+    Simulates number_games complete games, all of them advanced at the same time.
+
+    As a player who hits a ship plays another time, the attacks of a player only depend on the board of its opponent
+    (not on the attacks of the opponent). So the attacks of each player are simulated separately, and the winner is
+    the player who needs the fewest turns, i.e. who misses the fewest times before sinking all the ships: if both miss
+    the same number of times, the player who started wins.
+
+    :param number_games: number of games to simulate
+    :param strategy_player_1: strategy of player_1, STRATEGY_RANDOM or STRATEGY_PARITY_HUNT
+    :param strategy_player_2: strategy of player_2, STRATEGY_RANDOM or STRATEGY_PARITY_HUNT
+    :param rng: NumPy random generator, a new one is created if None
+    :param size_x: length of the boards along the x axis
+    :param size_y: length of the boards along the y axis
+    :param dict_number_ships_per_length: dict length -> number of ships of that length,
+    Board.DICT_NUMBER_SHIPS_PER_LENGTH if None
+    :return: the results of the games
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    list_results = []
+    for index_start in range(0, number_games, SIZE_CHUNK_SIMULATION):
+        number_games_chunk = min(SIZE_CHUNK_SIMULATION, number_games - index_start)
+
+        # each player attacks the fleet of the other one
+        fleets_player_1 = generate_fleets(number_games_chunk, rng, size_x, size_y, dict_number_ships_per_length)
+        fleets_player_2 = generate_fleets(number_games_chunk, rng, size_x, size_y, dict_number_ships_per_length)
+
+        number_shots_1, number_misses_1, shots_at_miss_1 = simulate_attacks(strategy_player_1, fleets_player_2, rng)
+        number_shots_2, number_misses_2, shots_at_miss_2 = simulate_attacks(strategy_player_2, fleets_player_1, rng)
+
+        index_player_starting = rng.integers(1, 3, size=number_games_chunk)
+        index_winner = np.where(index_player_starting == 1,
+                                np.where(number_misses_1 <= number_misses_2, 1, 2),
+                                np.where(number_misses_2 <= number_misses_1, 2, 1))
+
+        # the loser played as many turns as the winner (one more if it started), each turn ending with a miss
+        number_misses_winner = np.where(index_winner == 1, number_misses_1, number_misses_2)
+        number_turns_loser = number_misses_winner + (index_player_starting != index_winner)
+        array_games = np.arange(number_games_chunk)
+
+        array_number_shots_player_1 = np.where(index_winner == 1,
+                                               number_shots_1,
+                                               shots_at_miss_1[array_games, number_turns_loser])
+        array_number_shots_player_2 = np.where(index_winner == 2,
+                                               number_shots_2,
+                                               shots_at_miss_2[array_games, number_turns_loser])
+
+        list_results.append((index_player_starting, index_winner,
+                             array_number_shots_player_1, array_number_shots_player_2))
+
+    if not list_results:
+        empty = np.zeros(0, dtype=np.int64)
+        return SimulationResult(empty, empty, empty, empty)
+
+    return SimulationResult(*(np.concatenate(arrays) for arrays in zip(*list_results)))
+
+
+def simulate_attacks(strategy: str,
+                     fleet_batch: FleetBatch,
+                     rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulates a player attacking each fleet of the batch until all its ships have sunk, all the fleets at the same time.
+    :param strategy: STRATEGY_RANDOM or STRATEGY_PARITY_HUNT
+    :param fleet_batch: fleets under attack
+    :param rng: NumPy random generator
+    :return: a tuple of arrays (number_shots, number_misses, shots_at_miss) where, for each fleet:
+    - number_shots is the number of attacks needed to sink all the ships
+    - number_misses is the number of those attacks that missed
+    - shots_at_miss[k, j] is the number of attacks performed when the j-th miss happened (shots_at_miss[k, 0] = 0)
+    """
+    if strategy == STRATEGY_RANDOM:
+        return _simulate_attacks_random(fleet_batch, rng)
+    if strategy != STRATEGY_PARITY_HUNT:
+        raise ValueError(f"Unknown strategy '{strategy}'.")
+
+    number_games = len(fleet_batch)
+    size_x, size_y = fleet_batch.size_x, fleet_batch.size_y
+    number_cells = size_x * size_y
+    array_games = np.arange(number_games)
+
+    # all the 2D arrays below are indexed with flat indexes (game * number_columns + column), which is much faster
+    # than indexing them with pairs of arrays
+    array_ship_ids, array_lengths = _get_array_ship_ids(fleet_batch)
+    array_ship_ids = array_ship_ids.reshape(-1)
+    number_ships = len(array_lengths)
+    number_damages_per_ship = np.zeros(number_games * number_ships, dtype=np.int16)
+    number_cells_left = np.full(number_games, int(np.sum(array_lengths)), dtype=np.int64)
+
+    is_attacked = np.zeros(number_games * number_cells, dtype=bool)
+    is_active = np.ones(number_games, dtype=bool)
+    number_shots = np.zeros(number_games, dtype=np.int64)
+    number_misses = np.zeros(number_games, dtype=np.int64)
+    shots_at_miss = np.zeros(number_games * (number_cells + 1), dtype=np.int64)
+
+    # order in which the positions are attacked when there is nothing to hunt
+    array_order = _get_parity_order(size_x, size_y)
+    index_in_order = np.zeros(number_games, dtype=np.int64)
+
+    # stack of the positions to hunt (neighbours of the hits)
+    size_maximum_stack_hunt = 4 * number_cells
+    stack_hunt = np.zeros(number_games * size_maximum_stack_hunt, dtype=np.int64)
+    size_stack_hunt = np.zeros(number_games, dtype=np.int64)
+
+    for step in range(1, number_cells + 1):
+        games = array_games[is_active]
+        if not len(games):
+            break
+
+        cells = np.full(len(games), -1, dtype=np.int64)
+
+        # pops the hunt stack until a position that was not attacked is found
+        to_pop = size_stack_hunt[games] > 0
+        while np.any(to_pop):
+            games_pop = games[to_pop]
+            size_stack_hunt[games_pop] -= 1
+            cells_popped = stack_hunt[games_pop * size_maximum_stack_hunt + size_stack_hunt[games_pop]]
+            is_new = ~is_attacked[games_pop * number_cells + cells_popped]
+            cells[np.flatnonzero(to_pop)[is_new]] = cells_popped[is_new]
+            to_pop = (cells == -1) & (size_stack_hunt[games] > 0)
+
+        # otherwise, next position of the order that was not attacked
+        to_advance = cells == -1
+        while np.any(to_advance):
+            games_advance = games[to_advance]
+            cells_next = array_order[index_in_order[games_advance]]
+            index_in_order[games_advance] += 1
+            is_new = ~is_attacked[games_advance * number_cells + cells_next]
+            cells[np.flatnonzero(to_advance)[is_new]] = cells_next[is_new]
+            to_advance = cells == -1
+
+        # attacks
+        indexes_attacked = games * number_cells + cells
+        is_attacked[indexes_attacked] = True
+        ship_ids = array_ship_ids[indexes_attacked]
+        is_hit = ship_ids >= 0
+
+        games_miss = games[~is_hit]
+        number_misses[games_miss] += 1
+        shots_at_miss[games_miss * (number_cells + 1) + number_misses[games_miss]] = step
+
+        games_hit, ship_ids_hit, cells_hit = games[is_hit], ship_ids[is_hit], cells[is_hit]
+        indexes_ships_hit = games_hit * number_ships + ship_ids_hit
+        number_damages_per_ship[indexes_ships_hit] += 1
+        number_cells_left[games_hit] -= 1
+        has_sunk = number_damages_per_ship[indexes_ships_hit] == array_lengths[ship_ids_hit]
+
+        is_finished = number_cells_left[games] == 0
+        number_shots[games[is_finished]] = step
+        is_active[games[is_finished]] = False
+
+        # a sunk ship ends the hunt, otherwise the neighbours of the hit are hunted (right, left, down, up)
+        size_stack_hunt[games_hit[has_sunk]] = 0
+        games_hunt, cells_hunt = games_hit[~has_sunk], cells_hit[~has_sunk]
+        x, y = cells_hunt % size_x, cells_hunt // size_x
+        for is_valid, cells_neighbour in ((y > 0, cells_hunt - size_x),
+                                          (y < size_y - 1, cells_hunt + size_x),
+                                          (x > 0, cells_hunt - 1),
+                                          (x < size_x - 1, cells_hunt + 1)):
+            games_push = games_hunt[is_valid]
+            stack_hunt[games_push * size_maximum_stack_hunt + size_stack_hunt[games_push]] = cells_neighbour[is_valid]
+            size_stack_hunt[games_push] += 1
+
+    shots_at_miss = shots_at_miss.reshape(number_games, number_cells + 1)
+    return number_shots, number_misses, shots_at_miss
+
+
+def _simulate_attacks_random(fleet_batch: FleetBatch,
+                             rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same as simulate_attacks for STRATEGY_RANDOM. As the random strategy only depends on the outcome of the attacks
+    through the ships which have sunk, all the attacks are drawn at once (as a random permutation of the cells) instead
+    of step by step: a position of the permutation is skipped if it is near a ship which has sunk before it is reached,
+    as PlayerRandom never attacks such positions (the positions left stay in a uniformly random order).
+    """
+    number_games = len(fleet_batch)
+    size_x, size_y = fleet_batch.size_x, fleet_batch.size_y
+    number_cells = size_x * size_y
+    array_games = np.arange(number_games)[:, None]
+
+    array_ship_ids, array_lengths = _get_array_ship_ids(fleet_batch)
+    number_ships = len(array_lengths)
+    number_cells_ships = int(np.sum(array_lengths))
+
+    array_orders = np.argsort(rng.random((number_games, number_cells), dtype=np.float32), axis=1)
+    array_steps = np.empty_like(array_orders)  # step of the permutation at which each cell is reached
+    array_steps[array_games, array_orders] = np.arange(number_cells)
+
+    # step at which each ship sinks: the step of its last cell reached
+    array_steps_sunk = np.zeros((number_games, number_ships + 1), dtype=array_steps.dtype)
+    is_ship = array_ship_ids >= 0
+    np.maximum.at(array_steps_sunk, (np.nonzero(is_ship)[0], array_ship_ids[is_ship]), array_steps[is_ship])
+    array_steps_sunk[:, number_ships] = number_cells  # column of the cells without ship (index -1): never sinks
+
+    # step from which each cell is near a ship which has sunk (the ships never touch, so it is never a cell of a ship)
+    array_ship_ids_2d = array_ship_ids.reshape(number_games, size_y, size_x)
+    array_ship_ids_padded = np.full((number_games, size_y + 2, size_x + 2), -1, dtype=array_ship_ids.dtype)
+    array_ship_ids_padded[:, 1:-1, 1:-1] = array_ship_ids_2d
+    array_steps_near_sunk = np.full((number_games, size_y, size_x), number_cells, dtype=array_steps.dtype)
+    for offset_y in range(3):
+        for offset_x in range(3):
+            ship_ids_neighbour = array_ship_ids_padded[:, offset_y:offset_y + size_y, offset_x:offset_x + size_x]
+            np.minimum(array_steps_near_sunk,
+                       array_steps_sunk[array_games[:, :, None], ship_ids_neighbour],
+                       out=array_steps_near_sunk)
+    array_steps_near_sunk = array_steps_near_sunk.reshape(number_games, number_cells)
+    array_steps_near_sunk[is_ship] = number_cells
+
+    is_hit = np.take_along_axis(is_ship, array_orders, axis=1)
+    is_attacked = np.take_along_axis(array_steps_near_sunk > array_steps, array_orders, axis=1)
+
+    # all the ships have sunk at the attack hitting the last cell of the ships
+    number_hits = np.cumsum(is_hit, axis=1, dtype=np.int32)
+    number_attacks = np.cumsum(is_attacked, axis=1, dtype=np.int32)
+    step_last_hit = np.argmax(number_hits == number_cells_ships, axis=1)
+    number_shots = number_attacks[array_games[:, 0], step_last_hit].astype(np.int64)
+    number_misses = number_shots - number_cells_ships
+
+    # a stable sort puts the steps of the misses first, in order
+    steps_misses = np.argsort(~(is_attacked & ~is_hit), axis=1, kind='stable')
+    shots_at_miss = np.zeros((number_games, number_cells + 1), dtype=np.int64)
+    shots_at_miss[:, 1:] = np.take_along_axis(number_attacks, steps_misses, axis=1)
+
+    return number_shots, number_misses, shots_at_miss
+
+
+def _get_array_ship_ids(fleet_batch: FleetBatch) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :return: a tuple (array_ship_ids, array_lengths) where array_ship_ids[k, (y - 1) * size_x + x - 1] is the index of
+    the ship of the k-th fleet at (x, y) (-1 if there is none), and array_lengths[s] is the length of the s-th ships
+    """
+    number_games = len(fleet_batch)
+    size_x, size_y = fleet_batch.size_x, fleet_batch.size_y
+    array_ships = fleet_batch.array_ships.astype(np.int64)
+    array_offsets_games = np.arange(number_games) * (size_x * size_y)
+
+    array_lengths = (array_ships[0, :, 2] - array_ships[0, :, 0]) + (array_ships[0, :, 3] - array_ships[0, :, 1]) + 1
+
+    array_ship_ids = np.full(number_games * size_x * size_y, -1, dtype=np.int64)
+    for index_ship, length in enumerate(array_lengths):
+        x_start, y_start, x_end, y_end = (array_ships[:, index_ship, index] for index in range(4))
+        step = np.where(x_end > x_start, 1, size_x)  # next cell of the ship: rightwards or downwards
+        index_start = array_offsets_games + (y_start - 1) * size_x + x_start - 1
+        for offset in range(length):
+            array_ship_ids[index_start + offset * step] = index_ship
+
+    return array_ship_ids.reshape(number_games, -1), array_lengths
+
+
+def _get_parity_order(size_x: int, size_y: int) -> np.ndarray:
+    """
+    :return: the indexes of the cells in the order of the checkerboard pattern of PlayerAutomatic: first the positions
+    (x, y) with x + y odd, row by row, then the other ones
+    """
+    array_cells = np.arange(size_x * size_y)
+    is_odd = (array_cells % size_x + array_cells // size_x) % 2 == 1  # x + y has the parity of (x - 1) + (y - 1)
+    return np.concatenate((array_cells[is_odd], array_cells[~is_odd]))
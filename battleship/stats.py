@@ -0,0 +1,258 @@
+import functools
+import json
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from battleship.board import Board, BoardAutomatic
+from battleship.player import Player
+from battleship.ship import Ship
+
+# Opt-in instrumentation of the hot paths of the engine.
+# Nothing is measured until enable() is called: it replaces the instrumented methods by wrappers recording their
+# counts and latencies, and disable() puts the original methods back, so that there is no overhead at all when the
+# instrumentation is off. The statistics are kept per process.
+# The classes defined while the instrumentation is on are instrumented too: enable() also installs an __init_subclass__
+# hook on the base classes (Board, Player, Ship), which disable() removes.
+# When an override calls the method of its parent class (e.g. BoardSparseAutomatic.generate_ships_automatically falling
+# back to BoardAutomatic.generate_ships_automatically), only the outermost call is recorded, so that the same work is
+# not recorded twice.
+
+
+class Statistic(object):
+    """
+    Running statistics about the values observed for one quantity (latencies in seconds, numbers of backtracks...)
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.
+        self.minimum = None
+        self.maximum = None
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.
+
+    def get_dict(self) -> dict:
+        return {'count': self.count,
+                'total': self.total,
+                'mean': self.mean,
+                'minimum': self.minimum,
+                'maximum': self.maximum}
+
+
+# name -> number of events
+dict_counters = {}  # type: Dict[str, int]
+# name -> statistics of the values observed
+dict_statistics = {}  # type: Dict[str, Statistic]
+
+# base classes on which enable installs the __init_subclass__ hook
+_list_classes_base = [Board, Player, Ship]
+
+# methods replaced by enable: (class, name of the method, original method)
+_list_methods_replaced = []  # type: List[Tuple[type, str, Callable]]
+# hooks installed by enable: (base class, its own __init_subclass__ if it defines one, else None)
+_list_hooks_installed = []  # type: List[Tuple[type, Optional[classmethod]]]
+# names of the instrumented methods being called, e.g. 'generate_ships_automatically'
+_set_names_methods_running = set()  # type: Set[str]
+
+
+def increment(name: str, number: int = 1) -> None:
+    dict_counters[name] = dict_counters.get(name, 0) + number
+
+
+def observe(name: str, value: float) -> None:
+    if name not in dict_statistics:
+        dict_statistics[name] = Statistic()
+    dict_statistics[name].observe(value)
+
+
+def is_enabled() -> bool:
+    return bool(_list_hooks_installed)
+
+
+def enable() -> None:
+    """
+    Starts recording:
+    - the latency of Board.is_attacked_at (and its overrides) and of select_coordinates_to_attack of every class of
+    players, in seconds
+    - the numbers of calls of BoardAutomatic.generate_ship, i.e. of positions tried, and of
+    generate_ships_automatically, with the latency and the number of backtracks of each generation
+    - the number of calls of Ship.is_near_ship, i.e. of checks of the distance between two ships, and of
+    Board.ships_too_close, i.e. of checks of the distances between all the ships of a board. The boards check their
+    fleets with an occupancy grid, without calling Ship.is_near_ship.
+    The classes defined after enable is called are instrumented too.
+    Does nothing if the instrumentation is already enabled.
+    """
+    if is_enabled():
+        return
+
+    for cls_instrumented, name_method, get_wrapper in _get_list_methods_instrumented():
+        for cls in _get_subclasses(cls_instrumented):
+            _replace_method(cls, name_method, get_wrapper)
+    for cls_base in _list_classes_base:
+        _install_hook_subclasses(cls_base)
+
+
+def disable() -> None:
+    """
+    Stops recording and puts the original methods back. The statistics recorded are kept.
+    """
+    while _list_hooks_installed:
+        cls_base, init_subclass = _list_hooks_installed.pop()
+        if init_subclass is None:
+            delattr(cls_base, '__init_subclass__')
+        else:
+            setattr(cls_base, '__init_subclass__', init_subclass)
+    while _list_methods_replaced:
+        cls, name_method, method = _list_methods_replaced.pop()
+        setattr(cls, name_method, method)
+
+
+def reset() -> None:
+    """
+    Forgets all the statistics recorded
+    """
+    dict_counters.clear()
+    dict_statistics.clear()
+
+
+@contextmanager
+def enabled():
+    """
+    Context manager enabling the instrumentation in its block, e.g.:
+        with stats.enabled():
+            game.run()
+        print(stats.get_json())
+    """
+    was_enabled = is_enabled()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def get_stats() -> dict:
+    """
+    :return: a snapshot of the statistics: {'counters': {name: count}, 'statistics': {name: {count, total, mean,
+    minimum, maximum}}}, the latencies being in seconds
+    """
+    return {'counters': dict(sorted(dict_counters.items())),
+            'statistics': {name: statistic.get_dict() for name, statistic in sorted(dict_statistics.items())}}
+
+
+def get_json(indent: int = 2) -> str:
+    """
+    :return: the snapshot of get_stats, in JSON
+    """
+    return json.dumps(get_stats(), indent=indent)
+
+
+def _get_list_methods_instrumented() -> List[Tuple[type, str, Callable]]:
+    """
+    :return: the methods instrumented: (class defining the method, name of the method, function returning the wrapper
+    of the method)
+    """
+    return [(Board, 'is_attacked_at', _get_wrapper_timer),
+            (Board, 'ships_too_close', _get_wrapper_counter),
+            (Ship, 'is_near_ship', _get_wrapper_counter),
+            (Player, 'select_coordinates_to_attack', _get_wrapper_timer),
+            (BoardAutomatic, 'generate_ship', _get_wrapper_counter),
+            (BoardAutomatic, 'generate_ships_automatically', _get_wrapper_generation)]
+
+
+def _get_subclasses(cls: type) -> List[type]:
+    list_classes = [cls]
+    for subclass in cls.__subclasses__():
+        for cls_descendant in _get_subclasses(subclass):
+            if cls_descendant not in list_classes:
+                list_classes.append(cls_descendant)
+    return list_classes
+
+
+def _install_hook_subclasses(cls_base: type) -> None:
+    """
+    Instruments the methods of the subclasses of cls_base when they are defined.
+    """
+    init_subclass = cls_base.__dict__.get('__init_subclass__')
+
+    def __init_subclass__(cls, **kwargs):
+        if init_subclass is None:
+            super(cls_base, cls).__init_subclass__(**kwargs)
+        else:
+            init_subclass.__func__(cls, **kwargs)
+        for cls_instrumented, name_method, get_wrapper in _get_list_methods_instrumented():
+            if issubclass(cls, cls_instrumented):
+                _replace_method(cls, name_method, get_wrapper)
+
+    _list_hooks_installed.append((cls_base, init_subclass))
+    cls_base.__init_subclass__ = classmethod(__init_subclass__)
+
+
+def _replace_method(cls: type, name_method: str, get_wrapper: Callable) -> None:
+    """
+    Wraps the method if it is defined by the class itself: the inherited methods are wrapped in their own class.
+    """
+    if name_method not in cls.__dict__:
+        return
+    method = cls.__dict__[name_method]
+    _list_methods_replaced.append((cls, name_method, method))
+    setattr(cls, name_method, _get_wrapper_outermost(get_wrapper(method, f'{cls.__name__}.{name_method}'),
+                                                     method, name_method))
+
+
+def _get_wrapper_outermost(wrapper: Callable, method: Callable, name_method: str) -> Callable:
+    """
+    :return: a function calling wrapper, or method without recording anything if it is called within another
+    instrumented method of the same name (an override calling the method of its parent class)
+    """
+    @functools.wraps(method)
+    def wrapper_outermost(*args, **kwargs):
+        if name_method in _set_names_methods_running:
+            return method(*args, **kwargs)
+        _set_names_methods_running.add(name_method)
+        try:
+            return wrapper(*args, **kwargs)
+        finally:
+            _set_names_methods_running.discard(name_method)
+    return wrapper_outermost
+
+
+def _get_wrapper_timer(method: Callable, name: str) -> Callable:
+    def wrapper(*args, **kwargs):
+        time_start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            observe(name, time.perf_counter() - time_start)
+    return wrapper
+
+
+def _get_wrapper_counter(method: Callable, name: str) -> Callable:
+    dict_counters.setdefault(name, 0)  # the methods never called appear in the snapshots too
+
+    def wrapper(*args, **kwargs):
+        increment(name)
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def _get_wrapper_generation(method: Callable, name: str) -> Callable:
+    def wrapper(self, *args, **kwargs):
+        time_start = time.perf_counter()
+        list_ships = method(self, *args, **kwargs)
+        observe(name, time.perf_counter() - time_start)
+        observe(f'{name}.backtracks', self.number_backtracks)
+        return list_ships
+    return wrapper
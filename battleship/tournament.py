@@ -0,0 +1,264 @@
+import math
+import os
+from typing import Callable, List
+
+from battleship.game import Game, GameResult
+from battleship.gamelog import GameLogWriter, append_game_log
+from battleship.player import Player
+from battleship.seeding import get_new_seed, get_rng, get_seed_child
+
+# Players are created for each game by calling a factory with the keyword argument rng (random generator to be used
+# by the player and its board), e.g. the class PlayerAutomatic.
+# The factories must be picklable (classes, functions defined at module level, functools.partial...) to be sent to the
+# worker processes.
+PlayerFactory = Callable[..., Player]
+
+
+class StatisticsShots(object):
+    """
+    Running statistics about a number of shots, that can be merged with other ones
+    """
+
+    def __init__(self):
+        self.number_values = 0
+        self.total = 0
+        self.total_squares = 0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, number_shots: int) -> None:
+        self.number_values += 1
+        self.total += number_shots
+        self.total_squares += number_shots * number_shots
+        self.minimum = number_shots if self.minimum is None else min(self.minimum, number_shots)
+        self.maximum = number_shots if self.maximum is None else max(self.maximum, number_shots)
+
+    def merge(self, other: 'StatisticsShots') -> None:
+        if not other.number_values:
+            return
+        self.number_values += other.number_values
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.number_values if self.number_values else 0.
+
+    @property
+    def standard_deviation(self) -> float:
+        if not self.number_values:
+            return 0.
+        return math.sqrt(max(self.total_squares / self.number_values - self.mean ** 2, 0.))
+
+    def get_dict(self) -> dict:
+        return {'mean': self.mean,
+                'standard_deviation': self.standard_deviation,
+                'minimum': self.minimum,
+                'maximum': self.maximum}
+
+
+class TournamentResult(object):
+    """
+    Merged results of the games of a tournament between 2 strategies
+    """
+
+    def __init__(self):
+        self.seed = None  # seed of the tournament, any of its games can be replayed with replay_game
+        self.number_games = 0
+        self.list_number_wins = [0, 0]  # number of wins of player_1, player_2
+        self.list_number_starts = [0, 0]  # number of games started by player_1, player_2
+        self.list_statistics_shots = [StatisticsShots(), StatisticsShots()]  # shots of player_1, player_2 per game
+        self.list_statistics_shots_wins = [StatisticsShots(), StatisticsShots()]  # shots needed by each one to win
+
+    def __repr__(self):
+        return f"TournamentResult(games={self.number_games}, " \
+               f"win_rates=({self.get_win_rate(1):.3f}, {self.get_win_rate(2):.3f}))"
+
+    def add_game_result(self, game_result: GameResult) -> None:
+        self.number_games += 1
+        self.list_number_wins[game_result.index_winner - 1] += 1
+        self.list_number_starts[game_result.index_player_starting - 1] += 1
+        self.list_statistics_shots[0].add(game_result.number_shots_player_1)
+        self.list_statistics_shots[1].add(game_result.number_shots_player_2)
+        self.list_statistics_shots_wins[game_result.index_winner - 1].add(game_result.number_shots_winner)
+
+    def merge(self, other: 'TournamentResult') -> None:
+        self.number_games += other.number_games
+        for index in range(2):
+            self.list_number_wins[index] += other.list_number_wins[index]
+            self.list_number_starts[index] += other.list_number_starts[index]
+            self.list_statistics_shots[index].merge(other.list_statistics_shots[index])
+            self.list_statistics_shots_wins[index].merge(other.list_statistics_shots_wins[index])
+
+    def get_win_rate(self, index_player: int) -> float:
+        """
+        :param index_player: 1 for player_1, 2 for player_2
+        :return: the proportion of games won by the player
+        """
+        return self.list_number_wins[index_player - 1] / self.number_games if self.number_games else 0.
+
+    def get_stats(self) -> dict:
+        """
+        :return: the statistics of the tournament, as a dict that can be serialised in JSON
+        """
+        return {'seed': self.seed,
+                'number_games': self.number_games,
+                **{f'player_{index_player}': {
+                    'number_wins': self.list_number_wins[index_player - 1],
+                    'win_rate': self.get_win_rate(index_player),
+                    'number_starts': self.list_number_starts[index_player - 1],
+                    'shots_per_game': self.list_statistics_shots[index_player - 1].get_dict(),
+                    'shots_per_win': self.list_statistics_shots_wins[index_player - 1].get_dict(),
+                } for index_player in (1, 2)}}
+
+
+def get_seed_game(seed_tournament: int, index_game: int) -> int:
+    """
+    :return: the seed of the game number index_game of the tournament, which does not depend on the worker playing it
+    """
+    return get_seed_child(seed_tournament, 'game', index_game)
+
+
+def create_game(factory_player_1: PlayerFactory,
+                factory_player_2: PlayerFactory,
+                seed_game: int) -> Game:
+    """
+    :return: a new game entirely determined by its seed: the boards, the strategies and the player who starts use
+    random generators derived from it.
+    """
+    return Game(player_1=factory_player_1(rng=get_rng(seed_game, 'player_1')),
+                player_2=factory_player_2(rng=get_rng(seed_game, 'player_2')),
+                rng=get_rng(seed_game, 'game'))
+
+
+def play_game(factory_player_1: PlayerFactory,
+              factory_player_2: PlayerFactory,
+              seed_game: int) -> GameResult:
+    """
+    Plays headless the game determined by the seed (see create_game).
+    :return: the result of the game
+    """
+    return create_game(factory_player_1, factory_player_2, seed_game).run()
+
+
+def replay_game(factory_player_1: PlayerFactory,
+                factory_player_2: PlayerFactory,
+                seed_tournament: int,
+                index_game: int) -> GameResult:
+    """
+    Plays again exactly the game number index_game of a tournament.
+    :param seed_tournament: the seed of the tournament (TournamentResult.seed)
+    :return: the result of the game, identical to the one of the tournament
+    """
+    return play_game(factory_player_1, factory_player_2, get_seed_game(seed_tournament, index_game))
+
+
+def play_games(factory_player_1: PlayerFactory,
+               factory_player_2: PlayerFactory,
+               number_games: int,
+               seed_tournament: int = None,
+               index_first_game: int = 0,
+               path_game_log: str = None) -> TournamentResult:
+    """
+    Plays number_games headless games in the current process.
+    :param seed_tournament: seed of the tournament, a new one if None
+    :param index_first_game: index in the tournament of the first game played
+    :param path_game_log: path of a game log (see battleship.gamelog) to which the games are appended, if not None
+    :return: the merged results of those games
+    """
+    if seed_tournament is None:
+        seed_tournament = get_new_seed()
+
+    tournament_result = TournamentResult()
+    tournament_result.seed = seed_tournament
+    game_log_writer = None
+
+    try:
+        for index_game in range(index_first_game, index_first_game + number_games):
+            game = create_game(factory_player_1, factory_player_2, get_seed_game(seed_tournament, index_game))
+            tournament_result.add_game_result(game.run())
+
+            if path_game_log is not None:
+                if game_log_writer is None:
+                    game_log_writer = GameLogWriter(path_game_log,
+                                                    size_x=game.player_1.board.SIZE_X,
+                                                    size_y=game.player_1.board.SIZE_Y)
+                game_log_writer.write_game(game)
+    finally:
+        if game_log_writer is not None:
+            game_log_writer.close()
+
+    return tournament_result
+
+
+def run_tournament(factory_player_1: PlayerFactory,
+                   factory_player_2: PlayerFactory,
+                   number_games: int,
+                   number_workers: int = None,
+                   size_chunk: int = None,
+                   seed: int = None,
+                   path_game_log: str = None) -> TournamentResult:
+    """
+    Plays number_games games between 2 strategies, spread over a pool of processes.
+    The results only depend on the seed, not on the number of workers nor on the size of the chunks.
+    :param factory_player_1: callable returning the first competitor of each game, see PlayerFactory
+    :param factory_player_2: callable returning the second competitor of each game, see PlayerFactory
+    :param number_games: total number of games
+    :param number_workers: number of worker processes, the number of CPUs if None, 0 to play in the current process
+    :param size_chunk: number of games played by a worker before sending back its results,
+    chosen so that each worker receives about 4 chunks if None
+    :param seed: seed of the tournament, a new one if None
+    :param path_game_log: path of a game log (see battleship.gamelog) to which all the games are appended in order, so
+    that the game number index_game of the tournament is the game number index_game of the log (if it was empty).
+    Each worker writes its games in a temporary part file, which is appended to the log once all the games are played.
+    :return: the merged results of all the games
+    """
+    if number_workers is None:
+        number_workers = os.cpu_count() or 1
+    if seed is None:
+        seed = get_new_seed()
+
+    if number_workers == 0:
+        return play_games(factory_player_1, factory_player_2, number_games, seed, path_game_log=path_game_log)
+
+    # imported only here, as multiprocessing slows down the start of the processes playing without workers
+    from concurrent.futures import ProcessPoolExecutor
+
+    if size_chunk is None:
+        size_chunk = max(1, math.ceil(number_games / (4 * number_workers)))
+
+    list_sizes_chunks = _get_list_sizes_chunks(number_games, size_chunk)
+
+    tournament_result = TournamentResult()
+    tournament_result.seed = seed
+    list_paths_parts = []
+    try:
+        with ProcessPoolExecutor(max_workers=number_workers) as executor:
+            list_futures = []
+            index_first_game = 0
+            for index_chunk, size in enumerate(list_sizes_chunks):
+                path_part = None if path_game_log is None else f'{path_game_log}.{os.getpid()}.{index_chunk}.part'
+                list_paths_parts.append(path_part)
+                list_futures.append(executor.submit(play_games, factory_player_1, factory_player_2, size,
+                                                    seed, index_first_game, path_part))
+                index_first_game += size
+            for future, path_part in zip(list_futures, list_paths_parts):
+                tournament_result.merge(future.result())
+                if path_part is not None:
+                    append_game_log(path_game_log, path_part)
+    finally:
+        # the executor has waited for the workers: the part files left, if a game failed, are not written anymore
+        for path_part in list_paths_parts:
+            if path_part is not None and os.path.exists(path_part):
+                os.remove(path_part)
+
+    return tournament_result
+
+
+def _get_list_sizes_chunks(number_games: int, size_chunk: int) -> List[int]:
+    list_sizes_chunks = [size_chunk] * (number_games // size_chunk)
+    if number_games % size_chunk:
+        list_sizes_chunks.append(number_games % size_chunk)
+    return list_sizes_chunks
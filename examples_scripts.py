@@ -107,3 +107,15 @@ def PlayerAutomatic_vs_PlayerRandom():
                 player_2=player_bob)
 
     game.play()
+
+
+def tournament_PlayerAutomatic_vs_PlayerRandom(number_games=1000):
+    from battleship.tournament import run_tournament
+
+    # Plays the games headless, spread over all the cores
+    tournament_result = run_tournament(factory_player_1=PlayerAutomatic,
+                                       factory_player_2=PlayerRandom,
+                                       number_games=number_games)
+
+    print(tournament_result)
+    print(tournament_result.get_stats())
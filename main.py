@@ -1,10 +1,7 @@
-from examples_scripts import *
+import sys
+
+from battleship.cli import main
 
 if __name__ == '__main__':
-    # example_two_players_users()
-    # example_user_manual_board_vs_full_automatic()
-    #board = BoardAutomatic()
-    #board.print_board_with_ships_positions()
-    # example_user_automatic_board_vs_full_automatic()
-    #PlayerAutomatic_vs_PlayerRandom()
-    PlayerAutomatic_vs_PlayerAutomatic()
+    # e.g. python main.py play --player-1 user --player-2 automatic (see python main.py --help)
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from battleship.benchmark import compare_results, get_result, main, save_baseline
+
+DICT_RESULTS_BASELINE = {'board.is_attacked_at': get_result(1., 'us'),
+                         'game.throughput': get_result(1000., 'games/s', higher_is_better=True),
+                         'board.clone': get_result(2., 'us')}
+
+
+class TestCompareResults(unittest.TestCase):
+    def setUp(self):
+        self.path_directory = tempfile.mkdtemp()
+        self.path_baseline = os.path.join(self.path_directory, 'baseline.json')
+        save_baseline(DICT_RESULTS_BASELINE, self.path_baseline)
+
+    def tearDown(self):
+        shutil.rmtree(self.path_directory)
+
+    def test_regressions_beyond_the_tolerance(self):
+        dict_results = {'board.is_attacked_at': get_result(1.25, 'us'),  # 25% slower
+                        'game.throughput': get_result(950., 'games/s', higher_is_better=True),  # 5% slower
+                        'board.clone': get_result(1., 'us'),  # 50% faster
+                        'board.new': get_result(100., 'us')}  # not in the baseline
+
+        list_comparisons = compare_results(dict_results, DICT_RESULTS_BASELINE, tolerance=0.1)
+        dict_comparisons = {comparison['name']: comparison for comparison in list_comparisons}
+        self.assertEqual(sorted(dict_comparisons), ['board.clone', 'board.is_attacked_at', 'game.throughput'])
+        self.assertTrue(dict_comparisons['board.is_attacked_at']['is_regression'])
+        self.assertAlmostEqual(dict_comparisons['board.is_attacked_at']['change'], -0.25)
+        self.assertFalse(dict_comparisons['game.throughput']['is_regression'])
+        self.assertAlmostEqual(dict_comparisons['game.throughput']['change'], -0.05)
+        self.assertFalse(dict_comparisons['board.clone']['is_regression'])
+        self.assertAlmostEqual(dict_comparisons['board.clone']['change'], 0.5)
+
+        list_comparisons = compare_results(dict_results, DICT_RESULTS_BASELINE, tolerance=0.3)
+        self.assertFalse(any(comparison['is_regression'] for comparison in list_comparisons))
+
+    def test_exit_code(self):
+        dict_results = dict(DICT_RESULTS_BASELINE, **{'board.is_attacked_at': get_result(1.25, 'us')})
+        with mock.patch('battleship.benchmark.run_benchmarks', return_value=dict_results), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(['--compare', self.path_baseline, '--tolerance', '0.1']), 1)
+            self.assertEqual(main(['--compare', self.path_baseline, '--tolerance', '0.3']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,261 @@
+import copy
+import random
+import time
+import unittest
+
+from battleship.board import Board, BoardAutomatic, BoardSparse, BoardSparseAutomatic
+from battleship.ship import Ship
+
+
+def get_state(board) -> tuple:
+    return (frozenset(board.set_coordinates_previous_shots),
+            tuple(ship.mask_damages for ship in board.list_ships),
+            board.has_no_ships_left(),
+            board.get_board_string_with_ships_positions())
+
+
+def get_list_ships() -> list:
+    return [Ship(coord_start=(1, 1), coord_end=(1, 1)),
+            Ship(coord_start=(3, 3), coord_end=(3, 4)),
+            Ship(coord_start=(5, 3), coord_end=(5, 5)),
+            Ship(coord_start=(7, 1), coord_end=(7, 4)),
+            Ship(coord_start=(9, 3), coord_end=(9, 7))]
+
+
+class TestBoard(unittest.TestCase):
+    def test_bitboards_match_the_ships(self):
+        board = Board(get_list_ships())
+        set_coordinates_ships = set().union(*(ship.get_all_coordinates() for ship in board.list_ships))
+        list_positions = [(x, y) for y in range(1, 11) for x in range(1, 11)]
+        random.Random(0).shuffle(list_positions)
+
+        for index_shot, (coord_x, coord_y) in enumerate(list_positions, 1):
+            ship = next((ship for ship in board.list_ships if ship.is_on_coordinate(coord_x, coord_y)), None)
+            is_ship_hit = ship is not None
+            self.assertEqual(board.is_attacked_at(coord_x, coord_y), (is_ship_hit, is_ship_hit and ship.has_sunk()))
+            self.assertEqual(board.set_coordinates_previous_shots, set(list_positions[:index_shot]))
+            self.assertEqual(board.get_set_coordinates_from_mask(board.mask_damages),
+                             set().union(*(ship.set_coordinates_damages for ship in board.list_ships)))
+            self.assertEqual(board.get_set_coordinates_from_mask(board.mask_damages),
+                             set(list_positions[:index_shot]) & set_coordinates_ships)
+            self.assertEqual(board.has_no_ships_left(), all(ship.has_sunk() for ship in board.list_ships))
+        self.assertTrue(board.has_no_ships_left())
+
+        # the shots outside of the board are ignored
+        self.assertEqual(board.is_attacked_at(11, 1), (False, False))
+        self.assertEqual(len(board.set_coordinates_previous_shots), 100)
+
+    def test_ship_at(self):
+        board = Board(get_list_ships())
+        for coord_x in range(0, 12):
+            for coord_y in range(0, 12):
+                list_ships_at = [ship for ship in board.list_ships if ship.is_on_coordinate(coord_x, coord_y)]
+                self.assertIs(board.get_ship_at(coord_x, coord_y), list_ships_at[0] if list_ships_at else None)
+
+    def test_ships_too_close(self):
+        board = Board(get_list_ships())
+        self.assertFalse(board.ships_too_close(board.list_ships))
+        for ship_added in (Ship(coord_start=(3, 3), coord_end=(3, 4)),  # the same as another ship
+                           Ship(coord_start=(4, 5), coord_end=(4, 5)),  # diagonally near another ship
+                           Ship(coord_start=(7, 5), coord_end=(7, 5))):  # just below another ship
+            self.assertTrue(board.ships_too_close(get_list_ships() + [ship_added]), ship_added)
+
+    def test_custom_fleet(self):
+        list_ships = [Ship(coord_start=(1, 1), coord_end=(1, 2)), Ship(coord_start=(12, 5), coord_end=(12, 8))]
+        for dict_number_ships_per_length in ({2: 1, 4: 1}, {1: 0, 2: 1, 3: 0, 4: 1}):
+            board = Board(list_ships, size_x=12, size_y=8, dict_number_ships_per_length=dict_number_ships_per_length)
+            self.assertTrue(board.lengths_of_ships_correct())
+            self.assertFalse(board.are_some_ships_outside_the_board())
+
+        for dict_number_ships_per_length in ({2: 1}, {2: 1, 4: 1, 5: 1}, {2: 2, 4: 0}):
+            with self.assertRaises(ValueError):
+                Board(list_ships, size_x=12, size_y=8, dict_number_ships_per_length=dict_number_ships_per_length)
+        with self.assertRaises(ValueError):
+            Board(list_ships, size_x=11, size_y=8, dict_number_ships_per_length={2: 1, 4: 1})
+        # two identical ships are too close from each other
+        with self.assertRaises(ValueError):
+            Board(list_ships + [Ship(coord_start=(1, 1), coord_end=(1, 2))], size_x=12, size_y=8,
+                  dict_number_ships_per_length={2: 2, 4: 1})
+
+
+class TestBoardSparse(unittest.TestCase):
+    def test_same_outcomes_as_board(self):
+        rng = random.Random(0)
+        dict_number_ships_per_length = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1, 6: 1}
+        board, board_sparse = [cls_board(get_list_ships() + [Ship(coord_start=(20, 30), coord_end=(25, 30))],
+                                         size_x=30, size_y=40,
+                                         dict_number_ships_per_length=dict_number_ships_per_length)
+                               for cls_board in (Board, BoardSparse)]
+
+        list_positions = [(x, y) for y in range(0, 42) for x in range(0, 32)]
+        rng.shuffle(list_positions)
+        for coord_x, coord_y in list_positions:
+            self.assertEqual(board_sparse.is_attacked_at(coord_x, coord_y), board.is_attacked_at(coord_x, coord_y))
+            self.assertEqual(board_sparse.has_no_ships_left(), board.has_no_ships_left())
+        self.assertEqual(board_sparse.set_coordinates_previous_shots, board.set_coordinates_previous_shots)
+        self.assertEqual([ship.mask_damages for ship in board_sparse.list_ships],
+                         [ship.mask_damages for ship in board.list_ships])
+        self.assertTrue(board_sparse.has_no_ships_left())
+
+
+class TestBoardAutomatic(unittest.TestCase):
+    def test_fleets_follow_the_rules(self):
+        for seed in range(50):
+            board = BoardAutomatic(rng=random.Random(seed))
+            self.assertTrue(board.lengths_of_ships_correct())
+            self.assertFalse(board.are_some_ships_too_close_from_each_other())
+            self.assertFalse(board.are_some_ships_outside_the_board())
+
+    def test_crowded_fleet_is_placed(self):
+        # 9 ships of length 1 on a 6x6 board only fit on a 3x3 lattice
+        for seed in range(20):
+            board = BoardAutomatic(size_x=6, size_y=6, dict_number_ships_per_length={1: 9}, rng=random.Random(seed))
+            self.assertEqual(len(board.list_ships), 9)
+            self.assertFalse(board.are_some_ships_too_close_from_each_other())
+
+    def test_infeasible_fleet_raises_quickly(self):
+        # rejected before searching, not after NUMBER_ATTEMPTS_MAXIMUM * NUMBER_BACKTRACKS_PER_ATTEMPT backtracks
+        class BoardCountingAttempts(BoardAutomatic):
+            number_attempts = 0
+
+            def _generate_ships_attempt(self, list_lengths):
+                BoardCountingAttempts.number_attempts += 1
+                return super()._generate_ships_attempt(list_lengths)
+
+        time_start = time.perf_counter()
+        for dict_number_ships_per_length in ({1: 10}, {3: 2, 1: 6}, {5: 2, 2: 2, 1: 2}):
+            with self.assertRaises(ValueError):
+                BoardCountingAttempts(size_x=6, size_y=6, dict_number_ships_per_length=dict_number_ships_per_length,
+                                      rng=random.Random(0))
+        self.assertEqual(BoardCountingAttempts.number_attempts, 0)
+        self.assertLess(time.perf_counter() - time_start, 0.1)
+
+    def test_fleet_too_large_raises_immediately(self):
+        time_start = time.perf_counter()
+        for dict_number_ships_per_length in ({1: 13}, {7: 1}, {5: 5}):
+            with self.assertRaises(ValueError):
+                BoardAutomatic(size_x=6, size_y=6, dict_number_ships_per_length=dict_number_ships_per_length,
+                               rng=random.Random(0))
+        self.assertLess(time.perf_counter() - time_start, 0.1)
+
+
+class TestBoardShots(unittest.TestCase):
+    def check_against_deepcopy(self, get_board) -> None:
+        rng = random.Random(0)
+        for seed in range(30):
+            board = get_board(seed)
+            size = board.SIZE_X
+            for _ in range(rng.randrange(40)):
+                board.is_attacked_at(rng.randint(0, size + 1), rng.randint(0, size + 1))
+            board_reference = copy.deepcopy(board)
+            state_before = get_state(board)
+
+            # the clone is attacked as the deep copy, the original board is not changed
+            board_clone = board.clone()
+            list_tokens_and_states = []
+            for _ in range(rng.randrange(1, 60)):
+                coord_x, coord_y = rng.randint(0, size + 1), rng.randint(0, size + 1)
+                is_ship_hit, has_ship_sunk, token = board_clone.apply_shot(coord_x, coord_y)
+                self.assertEqual((is_ship_hit, has_ship_sunk), board_reference.is_attacked_at(coord_x, coord_y))
+                self.assertEqual(get_state(board_clone), get_state(board_reference))
+                list_tokens_and_states.append((token, get_state(board_clone)))
+                if rng.random() < 0.3:
+                    board_clone.clone().is_attacked_at(coord_x % size + 1, coord_y % size + 1)
+                    self.assertEqual(get_state(board_clone), list_tokens_and_states[-1][1])
+            self.assertEqual(get_state(board), state_before)
+
+            # the shots are undone in reverse order
+            while list_tokens_and_states:
+                token, state = list_tokens_and_states.pop()
+                self.assertEqual(get_state(board_clone), state)
+                board_clone.undo_shot(token)
+            self.assertEqual(get_state(board_clone), state_before)
+
+            # the original board and the clone are then attacked independently
+            board.is_attacked_at(1, 1)
+            board_clone.is_attacked_at(2, 2)
+            self.assertIn((1, 1), board.set_coordinates_previous_shots)
+            self.assertEqual((1, 1) in board_clone.set_coordinates_previous_shots, (1, 1) in state_before[0])
+
+    def test_dense_board(self):
+        self.check_against_deepcopy(lambda seed: BoardAutomatic(rng=random.Random(seed)))
+
+    def test_sparse_board(self):
+        self.check_against_deepcopy(lambda seed: BoardSparseAutomatic(size_x=30, size_y=30, rng=random.Random(seed)))
+
+    def test_clone_keeps_the_classes_of_the_ships(self):
+        class ShipSubclass(Ship):
+            __slots__ = ()
+
+        board = Board([ShipSubclass(coord_start=(1, 1), coord_end=(1, 3))], dict_number_ships_per_length={3: 1})
+        board.is_attacked_at(1, 2)
+        board_clone = board.clone()
+        board_clone.is_attacked_at(1, 3)
+        self.assertIs(type(board_clone.get_ship_at(1, 3)), ShipSubclass)
+        self.assertEqual(board_clone.get_ship_at(1, 3).mask_damages, 0b110)
+        self.assertEqual(board.get_ship_at(1, 3).mask_damages, 0b010)
+
+
+def get_board_string_rebuilt(board, with_ships_positions: bool) -> str:
+    # the board built from scratch as before the incremental rendering, for boards of at most 26 columns
+    array_board = [[' ' for _ in range(board.SIZE_X)] for _ in range(board.SIZE_Y)]
+    for x_shot, y_shot in board.set_coordinates_previous_shots:
+        array_board[y_shot - 1][x_shot - 1] = 'O'
+    for ship in board.list_ships:
+        if ship.has_sunk():
+            for x_ship, y_ship in ship.get_all_coordinates():
+                array_board[y_ship - 1][x_ship - 1] = '$'
+            continue
+        if with_ships_positions:
+            for x_ship, y_ship in ship.get_all_coordinates():
+                array_board[y_ship - 1][x_ship - 1] = 'S'
+        for x_ship, y_ship in ship.set_coordinates_damages:
+            array_board[y_ship - 1][x_ship - 1] = 'X'
+
+    first_line = ' ' * 6 + (' ' * 5).join(chr(code + 64) for code in range(1, board.SIZE_X + 1)) + ' \n'
+    list_lines = [f'{index_line:>2} |  ' + '  |  '.join(array_line) + '  |\n'
+                  for index_line, array_line in enumerate(array_board, 1)]
+    line_dashes = '   ' + '-' * 6 * board.SIZE_X + '-\n'
+    return first_line + line_dashes + line_dashes.join(list_lines) + line_dashes
+
+
+class TestBoardRender(unittest.TestCase):
+    def check_render(self, get_board) -> None:
+        rng = random.Random(0)
+        for seed in range(20):
+            board = get_board(seed)
+            # the renders are created before the shots, then updated after each shot
+            board.get_board_string_with_ships_positions()
+            board.get_board_string_without_ships_positions()
+            list_positions = [(x, y) for y in range(1, board.SIZE_Y + 1) for x in range(1, board.SIZE_X + 1)]
+            rng.shuffle(list_positions)
+            for coord_x, coord_y in list_positions[:rng.randrange(len(list_positions))]:
+                board.is_attacked_at(coord_x, coord_y)
+                if rng.random() < 0.2:
+                    board.get_board_string_without_ships_positions()
+
+            board_fresh = copy.deepcopy(board)
+            board_fresh.dict_renders = {}
+            for with_ships_positions, get_board_string in ((True, board.get_board_string_with_ships_positions),
+                                                           (False, board.get_board_string_without_ships_positions)):
+                board_string = get_board_string()
+                self.assertEqual(board_string, get_board_string_rebuilt(board, with_ships_positions))
+                self.assertEqual(board_string, board_fresh._get_render(with_ships_positions).get_string())
+
+    def test_dense_board(self):
+        self.check_render(lambda seed: BoardAutomatic(rng=random.Random(seed)))
+
+    def test_sparse_board(self):
+        self.check_render(lambda seed: BoardSparseAutomatic(size_x=20, size_y=20, rng=random.Random(seed)))
+
+    def test_labels_of_rows_aligned(self):
+        board = BoardSparseAutomatic(size_x=3, size_y=120, dict_number_ships_per_length={2: 1}, rng=random.Random(0))
+        list_lines = board.get_board_string_without_ships_positions().split('\n')
+        self.assertTrue(list_lines[0].startswith(' ' * 7 + 'A'), list_lines[0])
+        self.assertEqual(list_lines[1], '    -------------------')
+        self.assertEqual(list_lines[2], '  1 |     |     |     |')
+        self.assertEqual(list_lines[200], '100 |     |     |     |')
+
+
+if __name__ == '__main__':
+    unittest.main()
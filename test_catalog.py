@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from battleship import catalog
+from battleship.catalog import PlacementCatalog
+
+
+class TestPlacementCatalog(unittest.TestCase):
+    def setUp(self):
+        self.path_cache_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path_cache_directory)
+
+    def test_conflicts_between_lengths(self):
+        catalog_2 = PlacementCatalog(6, 5, 2, self.path_cache_directory)
+        catalog_3 = PlacementCatalog(6, 5, 3, self.path_cache_directory)
+        for catalog_1, catalog_other in ((catalog_2, catalog_2), (catalog_2, catalog_3), (catalog_3, catalog_2)):
+            for index_placement in range(len(catalog_1)):
+                ship = catalog_1.get_ship(index_placement)
+                mask_conflicts = catalog_1.get_mask_conflicts(index_placement, catalog_other)
+                for index_other_placement in range(len(catalog_other)):
+                    self.assertEqual(bool(mask_conflicts >> index_other_placement & 1),
+                                     ship.is_near_ship(catalog_other.get_ship(index_other_placement)))
+
+    def test_invalid_file_written_again(self):
+        path_file = PlacementCatalog(5, 5, 3, self.path_cache_directory).path_file
+        with open(path_file, 'rb') as file:
+            data = file.read()
+
+        data_corrupted = bytearray(data)
+        data_corrupted[-1] ^= 1
+        for data_invalid in (bytes(data_corrupted), data[:-4], data[:10], b''):
+            with open(path_file, 'wb') as file:
+                file.write(data_invalid)
+            placement_catalog = PlacementCatalog(5, 5, 3, self.path_cache_directory)
+            self.assertEqual(placement_catalog.get_placement(len(placement_catalog) - 1), (5, 3, 5, 5))
+            with open(path_file, 'rb') as file:
+                self.assertEqual(file.read(), data)
+
+    def test_size_of_cache_bounded(self):
+        size_maximum_default = catalog.MAXIMUM_SIZE_CACHE
+        catalog.MAXIMUM_SIZE_CACHE = 1
+        try:
+            for length in (1, 2, 3):
+                PlacementCatalog(8, 8, length, self.path_cache_directory)
+        finally:
+            catalog.MAXIMUM_SIZE_CACHE = size_maximum_default
+        self.assertEqual(os.listdir(self.path_cache_directory), ['placements_8x8_3.bin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
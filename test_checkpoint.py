@@ -0,0 +1,81 @@
+import random
+import subprocess
+import sys
+import unittest
+
+from battleship.board import BoardSparse, BoardSparseAutomatic
+from battleship.checkpoint import dump_board, dump_game, dump_player_state, load_board, load_game, load_player_state
+from battleship.game import Game
+from battleship.player import PlayerAutomatic, PlayerProbability, PlayerRandom
+from battleship.seeding import get_rng
+
+LIST_CLASSES_PLAYERS = [PlayerAutomatic, PlayerRandom, PlayerProbability]
+
+
+def create_game(cls_player_1: type, cls_player_2: type, seed: int) -> Game:
+    return Game(player_1=cls_player_1(rng=get_rng(seed, 'player_1')),
+                player_2=cls_player_2(rng=get_rng(seed, 'player_2')),
+                rng=get_rng(seed, 'game'))
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_game_resumes_as_it_would_have_gone_on(self):
+        for seed in range(27):
+            cls_player_1 = LIST_CLASSES_PLAYERS[seed % 3]
+            cls_player_2 = LIST_CLASSES_PLAYERS[seed // 3 % 3]
+            game_result = create_game(cls_player_1, cls_player_2, seed).run()
+
+            game = create_game(cls_player_1, cls_player_2, seed)
+            number_attacks = random.Random(seed).randrange(len(game_result.list_shots) + 1)
+            if number_attacks:
+                game.start()
+                for _ in range(number_attacks):
+                    if game.is_over():
+                        break
+                    game.play_next_attack()
+
+            # loaded in a game whose players and random generators are different
+            game_loaded = load_game(dump_game(game), create_game(cls_player_1, cls_player_2, seed + 1000))
+            if game_loaded.player_turn is None:
+                game_loaded.start()
+            while not game_loaded.is_over():
+                game_loaded.play_next_attack()
+
+            self.assertEqual(game_loaded.get_result().list_shots, game_result.list_shots, (seed, number_attacks))
+
+    def test_sparse_board(self):
+        rng = random.Random(0)
+        board = BoardSparseAutomatic(size_x=1000, size_y=1000, rng=random.Random(1))
+        for _ in range(500):
+            board.is_attacked_at(rng.randint(1, 1000), rng.randint(1, 1000))
+        for ship in board.list_ships[:2]:
+            board.is_attacked_at(ship.x_start, ship.y_start)
+
+        board_loaded = load_board(dump_board(board))
+        self.assertIs(type(board_loaded), BoardSparse)
+        self.assertEqual(board_loaded.set_coordinates_previous_shots, board.set_coordinates_previous_shots)
+        self.assertEqual([ship.mask_damages for ship in board_loaded.list_ships],
+                         [ship.mask_damages for ship in board.list_ships])
+        self.assertEqual(board_loaded.number_ships_sunk, board.number_ships_sunk)
+
+    def test_no_position_free(self):
+        # every position left was near a ship which has sunk: no position is free, which differs from the free
+        # positions not initialised yet
+        player, opponent = PlayerRandom(rng=random.Random(0)), PlayerRandom(rng=random.Random(1))
+        player.size_x, player.number_positions_free = opponent.board.SIZE_X, 0
+
+        player_loaded = PlayerRandom(rng=random.Random(2))
+        load_player_state(player_loaded, opponent, dump_player_state(player, opponent))
+        self.assertEqual(player_loaded.number_positions_free, 0)
+
+        player_loaded = PlayerRandom(rng=random.Random(2))
+        load_player_state(player_loaded, opponent, dump_player_state(PlayerRandom(rng=random.Random(3)), opponent))
+        self.assertIsNone(player_loaded.number_positions_free)
+
+    def test_catalog_not_imported(self):
+        code = "import battleship.checkpoint, sys; assert 'battleship.catalog' not in sys.modules"
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+from battleship.cli import get_parser
+
+
+def run_main(*arguments: str) -> str:
+    path_main = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    return subprocess.run([sys.executable, path_main] + list(arguments),
+                          check=True, stdout=subprocess.PIPE, universal_newlines=True).stdout
+
+
+class TestCli(unittest.TestCase):
+    def test_engine_not_imported(self):
+        code = "import battleship.cli, sys; assert 'numpy' not in sys.modules and 'battleship.board' not in sys.modules"
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_arguments(self):
+        parser = get_parser()
+        arguments = parser.parse_args(['play', '--player-1', 'automatic', '--quiet', '--seed', '3'])
+        self.assertEqual((arguments.command, arguments.player_1, arguments.player_2, arguments.quiet, arguments.seed),
+                         ('play', 'automatic', 'automatic', True, 3))
+
+        arguments = parser.parse_args(['tournament', '--games', '10', '--workers', '0'])
+        self.assertEqual((arguments.player_1, arguments.player_2, arguments.games, arguments.workers, arguments.chunk),
+                         ('automatic', 'random', 10, 0, None))
+
+        for list_arguments in (['play', '--player-1', 'unknown'], ['tournament', '--player-1', 'user'], []):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                parser.parse_args(list_arguments)
+
+    def test_play_depends_on_the_seed_only(self):
+        output = run_main('play', '--player-1', 'automatic', '--player-2', 'random', '--quiet', '--seed', '3')
+        self.assertTrue(output.endswith("Seed of the game: 3\n"), output)
+        self.assertEqual(run_main('play', '--player-1', 'automatic', '--player-2', 'random', '--quiet', '--seed', '3'),
+                         output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from battleship.convert import CODE_INVALID_FORMAT, CODE_OUTSIDE_BOARD, CODE_VALID, \
+    get_list_tuple_coordinates_from_list_str, get_str_coordinates_from_tuple, get_tuple_coordinates_from_str
+
+
+class TestConvert(unittest.TestCase):
+    def test_positions(self):
+        self.assertEqual(get_tuple_coordinates_from_str('B7'), (2, 7))
+        self.assertEqual(get_tuple_coordinates_from_str(' B07 '), (2, 7))
+        self.assertEqual(get_tuple_coordinates_from_str('J10'), (10, 10))
+        self.assertEqual(get_tuple_coordinates_from_str('A 1'), (1, 1))
+        self.assertEqual(get_tuple_coordinates_from_str('AB 12', 30, 30), (28, 12))
+        for coord_str in ('K1', 'A0', 'A11', 'c3', '7B', 'B', '', 'A1 0', ' 1'):
+            with self.assertRaises(ValueError):
+                get_tuple_coordinates_from_str(coord_str)
+
+    def test_codes(self):
+        list_coordinates, list_codes = get_list_tuple_coordinates_from_list_str(['A1', 'K1', 'AA1', 'B-7', '1'])
+        self.assertEqual(list_coordinates, [(1, 1), None, None, None, None])
+        self.assertEqual(list_codes, [CODE_VALID, CODE_OUTSIDE_BOARD, CODE_OUTSIDE_BOARD, CODE_INVALID_FORMAT,
+                                      CODE_INVALID_FORMAT])
+
+    def test_codes_spaces_and_columns_of_several_letters(self):
+        list_coordinates, list_codes = get_list_tuple_coordinates_from_list_str(
+            ['A 1', 'AB12', ' AB 12 ', 'ZZ3', 'A1 0'], 30, 30)
+        self.assertEqual(list_coordinates, [(1, 1), (28, 12), (28, 12), None, None])
+        self.assertEqual(list_codes, [CODE_VALID, CODE_VALID, CODE_VALID, CODE_OUTSIDE_BOARD, CODE_INVALID_FORMAT])
+
+    def test_large_board_round_trip(self):
+        for coordinates in ((1, 1), (26, 27), (27, 1000), (703, 5), (1000, 1000)):
+            coord_str = get_str_coordinates_from_tuple(*coordinates)
+            self.assertEqual(get_tuple_coordinates_from_str(coord_str, 1000, 1000), coordinates)
+        with self.assertRaises(ValueError):
+            get_tuple_coordinates_from_str('ALM1', 1000, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+try:
+    import numpy as np
+
+    from battleship.fleets import generate_fleets
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestGenerateFleets(unittest.TestCase):
+    def test_fleets_follow_the_rules(self):
+        for size_x, size_y, dict_number_ships_per_length in ((10, 10, None), (7, 12, {1: 2, 2: 2, 4: 1})):
+            fleet_batch = generate_fleets(200, np.random.default_rng(0), size_x, size_y, dict_number_ships_per_length)
+            self.assertEqual(len(fleet_batch), 200)
+            self.assertEqual((fleet_batch.size_x, fleet_batch.size_y), (size_x, size_y))
+
+            for index_fleet in range(len(fleet_batch)):
+                # the Board checks the number of ships per length, their spacing and that they are on the board
+                board = fleet_batch.get_board(index_fleet)
+                array_occupancy = np.zeros((size_y, size_x), dtype=bool)
+                for ship in board.list_ships:
+                    for coord_x, coord_y in ship.get_all_coordinates():
+                        array_occupancy[coord_y - 1, coord_x - 1] = True
+                self.assertTrue(np.array_equal(fleet_batch.array_occupancy[index_fleet], array_occupancy))
+
+    def test_fleets_depend_on_the_seed_only(self):
+        fleet_batch_1 = generate_fleets(50, np.random.default_rng(3))
+        fleet_batch_2 = generate_fleets(50, np.random.default_rng(3))
+        self.assertTrue(np.array_equal(fleet_batch_1.array_ships, fleet_batch_2.array_ships))
+
+    def test_infeasible_fleet(self):
+        with self.assertRaises(ValueError):
+            generate_fleets(10, np.random.default_rng(0), 6, 6, {1: 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
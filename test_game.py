@@ -0,0 +1,65 @@
+import contextlib
+import io
+import unittest
+
+from battleship.game import Game, GameResult
+from battleship.player import PlayerAutomatic, PlayerRandom
+from battleship.seeding import get_rng
+
+
+def create_game(seed: int) -> Game:
+    return Game(player_1=PlayerAutomatic(rng=get_rng(seed, 'player_1')),
+                player_2=PlayerRandom(rng=get_rng(seed, 'player_2')),
+                rng=get_rng(seed, 'game'))
+
+
+class TestGame(unittest.TestCase):
+    def test_run(self):
+        for seed in range(20):
+            game = create_game(seed)
+            game_result = game.run()
+            self.assertIsInstance(game_result, GameResult)
+
+            player_winner, player_loser = (game.player_1, game.player_2) if game_result.index_winner == 1 \
+                else (game.player_2, game.player_1)
+            self.assertTrue(player_loser.has_lost())
+            self.assertFalse(player_winner.has_lost())
+            self.assertEqual(game_result.name_winner, str(player_winner))
+
+            list_shots_winner = [shot for shot in game_result.list_shots if shot[0] == game_result.index_winner]
+            self.assertEqual(game_result.number_shots_winner, len(list_shots_winner))
+            self.assertEqual(game_result.number_shots_player_1 + game_result.number_shots_player_2,
+                             len(game_result.list_shots))
+            self.assertEqual(sum(1 for shot in list_shots_winner if shot[3]),
+                             sum(len(ship) for ship in player_loser.board.list_ships))
+            self.assertEqual(sum(1 for shot in list_shots_winner if shot[4]), len(player_loser.board.list_ships))
+            self.assertEqual(game_result.list_shots[0][0], game_result.index_player_starting)
+
+    def test_is_over_when_a_fleet_has_sunk(self):
+        for seed in range(20):
+            game = create_game(seed)
+            game.start()
+            dict_number_ships_sunk_per_player = {1: 0, 2: 0}
+            while not game.is_over():
+                index_player_turn = 1 if game.player_turn is game.player_1 else 2
+                _, _, _, has_ship_sunk = game.play_next_attack()
+                dict_number_ships_sunk_per_player[index_player_turn] += has_ship_sunk
+
+                player_attacked = game.player_2 if index_player_turn == 1 else game.player_1
+                number_ships_opponent = len(player_attacked.board.list_ships)
+                self.assertEqual(game.is_over(),
+                                 dict_number_ships_sunk_per_player[index_player_turn] == number_ships_opponent)
+
+    def test_run_as_play(self):
+        for seed in range(10):
+            game_result = create_game(seed).run()
+            with contextlib.redirect_stdout(io.StringIO()):
+                game_result_played = create_game(seed).play()
+
+            self.assertEqual(game_result_played.list_shots, game_result.list_shots)
+            self.assertEqual(game_result_played.index_winner, game_result.index_winner)
+            self.assertEqual(game_result_played.index_player_starting, game_result.index_player_starting)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from battleship.board import BoardAutomatic
+from battleship.game import Game
+from battleship.gamelog import GameLogWriter, append_game_log, encode_game, read_game_log
+from battleship.player import PlayerAutomatic, PlayerRandom
+
+
+def play_game(seed: int, size_x: int = 10, size_y: int = 10, dict_number_ships_per_length: dict = None) -> Game:
+    list_players = []
+    for index_player, cls_player in ((1, PlayerAutomatic), (2, PlayerRandom)):
+        rng = random.Random(seed * 10 + index_player)
+        board = BoardAutomatic(size_x=size_x, size_y=size_y,
+                               dict_number_ships_per_length=dict_number_ships_per_length, rng=rng)
+        list_players.append(cls_player(board=board, rng=rng))
+    game = Game(player_1=list_players[0], player_2=list_players[1], rng=random.Random(seed))
+    game.run()
+    return game
+
+
+class TestGameLog(unittest.TestCase):
+    def setUp(self):
+        self.path_directory = tempfile.mkdtemp()
+        self.path_file = os.path.join(self.path_directory, 'games.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.path_directory)
+
+    def test_round_trip(self):
+        list_games = [play_game(seed) for seed in range(5)]
+        with GameLogWriter(self.path_file) as writer:
+            for game in list_games:
+                writer.write_game(game)
+
+        list_records = read_game_log(self.path_file)
+        self.assertEqual([record.get_list_shots() for record in list_records],
+                         [game.list_shots for game in list_games])
+
+    def test_board_256_cells_long(self):
+        game = play_game(0, size_x=256, size_y=1, dict_number_ships_per_length={1: 20, 2: 10, 3: 5})
+        with GameLogWriter(self.path_file, size_x=256, size_y=1) as writer:
+            writer.write_game(game)
+
+        record, = read_game_log(self.path_file)
+        self.assertEqual((record.size_x, record.size_y), (256, 1))
+        self.assertEqual(record.list_ships_player_1, [(ship.x_start, ship.y_start, ship.x_end, ship.y_end)
+                                                      for ship in game.player_1.board.list_ships])
+        self.assertEqual(record.get_list_shots(), game.list_shots)
+
+    def test_boards_of_other_sizes_rejected(self):
+        game = play_game(0, size_x=12, size_y=8)
+        with GameLogWriter(self.path_file) as writer:
+            with self.assertRaises(ValueError):
+                writer.write_game(game)
+
+        game.player_2.board = play_game(1).player_2.board
+        with self.assertRaises(ValueError):
+            encode_game(game)
+
+        game = play_game(0, size_x=20, size_y=20)
+        with self.assertRaises(ValueError):
+            encode_game(game)
+
+    def test_append_skips_incomplete_games(self):
+        list_games = [play_game(seed) for seed in range(4)]
+        path_file_other = os.path.join(self.path_directory, 'other.log')
+        for path_file, list_games_file in ((self.path_file, list_games[:2]), (path_file_other, list_games[2:])):
+            with GameLogWriter(path_file) as writer:
+                for game in list_games_file:
+                    writer.write_game(game)
+            # a writer interrupted in the middle of a game
+            with open(path_file, 'ab') as file:
+                file.write(b'\x01\x05\x05\xff')
+
+        append_game_log(self.path_file, path_file_other)
+
+        self.assertEqual([record.get_list_shots() for record in read_game_log(self.path_file)],
+                         [game.list_shots for game in list_games])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from battleship.monte_carlo import FleetSampler, PlayerMonteCarlo
+from battleship.game import Game
+from battleship.player import PlayerRandom
+
+
+class TestFleetSampler(unittest.TestCase):
+    def test_no_ship_on_hits_only(self):
+        # two hits next to each other on a ship which has not sunk: a ship of length 2 covering exactly those hits
+        # would have sunk, so it must never be sampled
+        rng = random.Random(0)
+        number_fleets = 0
+        for seed in range(200):
+            sampler = FleetSampler(rng=random.Random(seed))
+            index_cell = (rng.randint(1, 10) - 1) * 10 + rng.randint(1, 7) - 1
+            mask_hits = (1 << index_cell) | (1 << (index_cell + 1))
+
+            list_ships = sampler.sample_fleet([5, 4, 3, 2, 1], 0, mask_hits)
+            if list_ships is None:
+                continue
+            number_fleets += 1
+
+            for ship in list_ships:
+                self.assertTrue(sampler.board.get_mask_from_ship(ship) & ~mask_hits, ship)
+            mask_ships = 0
+            for ship in list_ships:
+                mask_ships |= sampler.board.get_mask_from_ship(ship)
+            self.assertEqual(mask_ships & mask_hits, mask_hits)
+
+        self.assertGreater(number_fleets, 20)
+
+
+class TestPlayerMonteCarlo(unittest.TestCase):
+    def test_game_with_workers_within_budget(self):
+        player = PlayerMonteCarlo(rng=random.Random(1), number_workers=2, time_budget=0.02)
+        game = Game(player_1=player, player_2=PlayerRandom(rng=random.Random(2)), rng=random.Random(3))
+        game_result = game.run()
+        self.assertIn(game_result.index_winner, (1, 2))
+
+    def test_game_replayed_whatever_the_workers(self):
+        # without a time budget, the moves only depend on the random generator of the player
+        list_list_shots = []
+        for number_workers in (0, 2, 3):
+            player = PlayerMonteCarlo(rng=random.Random(1), number_samples_maximum=80, number_workers=number_workers)
+            game = Game(player_1=player, player_2=PlayerRandom(rng=random.Random(2)), rng=random.Random(3))
+            list_list_shots.append(game.run().list_shots)
+        self.assertEqual(list_list_shots[1], list_list_shots[0])
+        self.assertEqual(list_list_shots[2], list_list_shots[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
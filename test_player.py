@@ -0,0 +1,134 @@
+import random
+import subprocess
+import sys
+import unittest
+from collections import Counter
+from typing import List, Tuple
+
+from battleship.board import BoardAutomatic, BoardSparseAutomatic
+from battleship.ship import Ship
+from battleship.player import PlayerAutomatic, PlayerProbability, PlayerRandom, get_position_in_order_parity
+
+
+class TestPlayerAutomatic(unittest.TestCase):
+    def test_order_parity(self):
+        for size_x, size_y in ((10, 10), (1, 1), (1, 7), (7, 1), (5, 8), (9, 7)):
+            list_positions = [(x, y) for y in range(1, size_y + 1) for x in range(1, size_x + 1)]
+            list_order = [position for position in list_positions if sum(position) % 2 == 1] \
+                + [position for position in list_positions if sum(position) % 2 == 0]
+            self.assertEqual([get_position_in_order_parity(index, size_x, size_y)
+                              for index in range(size_x * size_y)], list_order)
+            self.assertIsNone(get_position_in_order_parity(size_x * size_y, size_x, size_y))
+
+    def test_order_exhausted(self):
+        player = PlayerAutomatic(rng=random.Random(0))
+        opponent = PlayerAutomatic(rng=random.Random(1))
+        player.index_next_in_order = opponent.board.SIZE_X * opponent.board.SIZE_Y
+        player.set_positions_previously_attacked = {(x, y) for x in range(1, 11) for y in range(1, 11)} - {(4, 7)}
+        self.assertEqual(player.select_coordinates_to_attack(opponent), (4, 7))
+        # the cells before (4, 7) are not considered again
+        self.assertEqual(player.index_next_cell_remaining, 64)
+        with self.assertRaises(ValueError):
+            player.select_coordinates_to_attack(opponent)
+
+    def test_every_position_attacked_once(self):
+        player = PlayerAutomatic(rng=random.Random(0))
+        opponent = PlayerAutomatic(board=BoardAutomatic(size_x=7, size_y=5, rng=random.Random(1)))
+        list_positions = [player.select_coordinates_to_attack(opponent) for _ in range(35)]
+        self.assertEqual(len(set(list_positions)), 35)
+
+
+class TestPlayerRandom(unittest.TestCase):
+    def test_positions_attacked_once_and_not_near_ships_sunk(self):
+        for seed in range(10):
+            player = PlayerRandom(rng=random.Random(seed))
+            opponent = PlayerAutomatic(board=BoardAutomatic(size_x=9, size_y=7, rng=random.Random(seed + 100)))
+            set_positions_attacked, set_positions_near_ships_sunk = set(), set()
+            while not opponent.has_lost():
+                coord_x, coord_y, _, has_ship_sunk = player.attacks_silently(opponent)
+                self.assertNotIn((coord_x, coord_y), set_positions_attacked)
+                self.assertNotIn((coord_x, coord_y), set_positions_near_ships_sunk)
+                set_positions_attacked.add((coord_x, coord_y))
+                if has_ship_sunk:
+                    ship = opponent.board.get_ship_at(coord_x, coord_y)
+                    set_positions_near_ships_sunk.update((x, y) for x in range(ship.x_start - 1, ship.x_end + 2)
+                                                         for y in range(ship.y_start - 1, ship.y_end + 2))
+
+            # the positions left are picked once each, then none is left
+            set_positions_left = {(x, y) for x in range(1, 10) for y in range(1, 8)} - set_positions_attacked \
+                - set_positions_near_ships_sunk
+            self.assertEqual(player.number_positions_free, len(set_positions_left))
+            self.assertEqual({player.select_coordinates_to_attack(opponent) for _ in range(len(set_positions_left))},
+                             set_positions_left)
+            with self.assertRaises(ValueError):
+                player.select_coordinates_to_attack(opponent)
+
+
+def get_densities_recounted(opponent) -> Tuple[List[int], List[int]]:
+    """
+    :return: the densities of PlayerProbability (list_density, list_density_hits) counted again from scratch, over the
+    legal positions of the ships not sunk given the shots received by the opponent's board
+    """
+    board = opponent.board
+    board_empty = BoardAutomatic(size_x=board.SIZE_X, size_y=board.SIZE_Y, dict_number_ships_per_length={},
+                                 rng=random.Random(0))
+    mask_forbidden, mask_hits = 0, 0
+    for coord_x, coord_y in board.set_coordinates_previous_shots:
+        ship = board.get_ship_at(coord_x, coord_y)
+        if ship is None:
+            mask_forbidden |= 1 << board_empty.get_index_cell(coord_x, coord_y)
+        elif ship.has_sunk():
+            mask_forbidden |= board_empty.get_mask_surrounding_ship(ship)
+        else:
+            mask_hits |= 1 << board_empty.get_index_cell(coord_x, coord_y)
+
+    list_density, list_density_hits = [0] * (board.SIZE_X * board.SIZE_Y), [0] * (board.SIZE_X * board.SIZE_Y)
+    for length, number_ships_left in Counter(len(ship) for ship in board.list_ships if not ship.has_sunk()).items():
+        mask_horizontal, mask_vertical = board_empty.get_masks_legal_positions(length, mask_forbidden)
+        # the vertical positions of the ships of length 1 are the horizontal ones
+        list_masks_starts = [(mask_horizontal, (length - 1, 0))] + ([(mask_vertical, (0, length - 1))] if length > 1
+                                                                      else [])
+        for mask_starts, offset_end in list_masks_starts:
+            for index_start in range(board.SIZE_X * board.SIZE_Y):
+                if not mask_starts >> index_start & 1:
+                    continue
+                x_start, y_start = board_empty.get_coordinates_from_index_cell(index_start)
+                ship = Ship(coord_start=(x_start, y_start),
+                            coord_end=(x_start + offset_end[0], y_start + offset_end[1]))
+                mask_ship = board_empty.get_mask_from_ship(ship)
+                if board_empty.get_mask_surrounding_ship(ship) & ~mask_ship & mask_hits:
+                    continue  # touches a hit without covering it
+                number_hits = bin(mask_ship & mask_hits).count('1')
+                for coord_x, coord_y in ship.get_all_coordinates():
+                    list_density[board_empty.get_index_cell(coord_x, coord_y)] += number_ships_left
+                    list_density_hits[board_empty.get_index_cell(coord_x, coord_y)] += number_ships_left * number_hits
+    return list_density, list_density_hits
+
+
+class TestPlayerProbability(unittest.TestCase):
+    def test_incremental_densities_recounted(self):
+        for seed in range(5):
+            player = PlayerProbability(rng=random.Random(seed))
+            opponent = PlayerAutomatic(rng=random.Random(seed + 100))
+            number_attacks = 0
+            while not opponent.has_lost():
+                player.attacks_silently(opponent)
+                number_attacks += 1
+                if number_attacks % 3 == 0 or opponent.has_lost():
+                    self.assertEqual((player.list_density, player.list_density_hits),
+                                     get_densities_recounted(opponent), (seed, number_attacks))
+
+    def test_catalog_imported_when_needed(self):
+        code = "import sys, battleship.player; print('battleship.catalog' in sys.modules)"
+        self.assertEqual(subprocess.check_output([sys.executable, '-c', code]).strip(), b'False')
+
+    def test_board_too_large(self):
+        player = PlayerProbability(rng=random.Random(0))
+        opponent = PlayerAutomatic(board=BoardSparseAutomatic(size_x=100, size_y=100, rng=random.Random(1)))
+        with self.assertRaises(ValueError):
+            player.select_coordinates_to_attack(opponent)
+        self.assertIsNone(player.size_x)
+
+
+if __name__ == '__main__':
+    unittest.main()
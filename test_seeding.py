@@ -0,0 +1,21 @@
+import unittest
+
+from battleship.seeding import get_rng, get_seed_child
+
+
+class TestSeeding(unittest.TestCase):
+    def test_seeds_stable_across_processes(self):
+        # the seeds do not depend on hash randomisation nor on the platform: a game can be replayed anywhere
+        self.assertEqual(get_seed_child(0), 8493733112532773764)
+        self.assertEqual(get_seed_child(1, 'game', 3), 9754946341059168674)
+        self.assertEqual(get_seed_child(12345, 'player_1'), 5933674101839315314)
+        self.assertEqual(get_rng(7, 'game').random(), 0.6980772164803439)
+
+    def test_seeds_depend_on_the_keys(self):
+        self.assertNotEqual(get_seed_child(1, 'game', 3), get_seed_child(1, 'game', 4))
+        self.assertNotEqual(get_seed_child(1, 'player_1'), get_seed_child(1, 'player_2'))
+        self.assertNotEqual(get_seed_child(1, 'game', 3), get_seed_child(2, 'game', 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from typing import Any, Awaitable, Callable, Tuple
+
+from battleship.board import BoardAutomatic
+from battleship.convert import get_str_coordinates_from_tuple
+from battleship.player import PlayerAutomatic
+from battleship.server import GameServer
+
+
+def get_player_large_board(rng):
+    return PlayerAutomatic(board=BoardAutomatic(size_x=12, size_y=12, rng=rng), rng=rng)
+
+
+def run_client(client: Callable[[int], Awaitable[Any]], factory_opponent=PlayerAutomatic) -> Tuple[Any, int, int]:
+    """
+    Runs a GameServer on a free port and the coroutine client(port) until the games are over.
+    :return: the tuple (result of the client, number of games abandoned, number of games finished)
+    """
+    async def main() -> Tuple[Any, int, int]:
+        game_server = GameServer(factory_opponent=factory_opponent, port=0, seed=0)
+        await game_server.start()
+        try:
+            result = await asyncio.wait_for(client(game_server.port), 10)
+            while game_server.set_tasks:
+                await asyncio.sleep(0.01)
+            return result, game_server.number_games_abandoned, game_server.number_games_finished
+        finally:
+            await game_server.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+async def wait_turn(reader: asyncio.StreamReader) -> None:
+    while (await reader.readline()).strip() != b'YOUR_TURN':
+        pass
+
+
+class TestGameServer(unittest.TestCase):
+    def test_full_game(self):
+        async def play_game(port: int) -> str:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                list_positions = [get_str_coordinates_from_tuple(x, y) for y in range(1, 11) for x in range(1, 11)]
+                while True:
+                    line = (await reader.readline()).decode().strip()
+                    if line in ('WIN', 'LOSE'):
+                        return line
+                    if line == 'YOUR_TURN':
+                        writer.write(f'{list_positions.pop(0)}\n'.encode())
+                    self.assertFalse(line.startswith('ERROR'), line)
+            finally:
+                writer.close()
+
+        line, number_games_abandoned, number_games_finished = run_client(play_game)
+        self.assertIn(line, ('WIN', 'LOSE'))
+        self.assertEqual((number_games_abandoned, number_games_finished), (0, 1))
+
+    def test_quit_or_disconnect_abandons_the_game(self):
+        async def quit_game(port: int) -> bytes:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                await wait_turn(reader)
+                writer.write(b'QUIT\n')
+                return await reader.read()  # until the server closes the connection
+            finally:
+                writer.close()
+
+        async def disconnect(port: int) -> None:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await wait_turn(reader)
+            writer.close()
+            await writer.wait_closed()
+
+        data, number_games_abandoned, number_games_finished = run_client(quit_game)
+        self.assertEqual(data, b'')
+        self.assertEqual((number_games_abandoned, number_games_finished), (1, 0))
+        _, number_games_abandoned, number_games_finished = run_client(disconnect)
+        self.assertEqual((number_games_abandoned, number_games_finished), (1, 0))
+
+    def test_coordinates_read_on_the_opponent_board(self):
+        async def play_first_attack(port: int) -> str:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                await wait_turn(reader)
+                writer.write(b'L12\n')  # outside of a 10x10 board, on the 12x12 board of the opponent
+                return (await reader.readline()).decode().strip()
+            finally:
+                writer.close()
+
+        line, _, _ = run_client(play_first_attack, factory_opponent=get_player_large_board)
+        self.assertTrue(line.startswith('RESULT L12 '), line)
+
+    def test_line_too_long_abandons_the_game(self):
+        async def send_line_too_long(port: int) -> bytes:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            try:
+                await wait_turn(reader)
+                writer.write(b'A' * 100000)  # beyond the limit of 64 KiB of the reader of the server, without newline
+                return await reader.read()  # until the server closes the connection
+            finally:
+                writer.close()
+
+        data, number_games_abandoned, number_games_finished = run_client(send_line_too_long)
+        self.assertEqual(data, b'')
+        self.assertEqual((number_games_abandoned, number_games_finished), (1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
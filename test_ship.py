@@ -0,0 +1,58 @@
+import itertools
+import unittest
+
+from battleship.ship import Ship
+
+
+class TestShip(unittest.TestCase):
+    def test_damages_bitmask(self):
+        ship = Ship(coord_start=(2, 6), coord_end=(2, 3))
+        self.assertEqual((ship.x_start, ship.y_start, ship.x_end, ship.y_end), (2, 3, 2, 6))
+        self.assertEqual(ship.set_all_coordinates, {(2, 3), (2, 4), (2, 5), (2, 6)})
+
+        ship.gets_damage_at(2, 4)
+        ship.gets_damage_at(2, 6)
+        ship.gets_damage_at(3, 4)  # not on the ship
+        self.assertEqual(ship.mask_damages, 0b1010)
+        self.assertEqual(ship.set_coordinates_damages, {(2, 4), (2, 6)})
+        self.assertTrue(ship.is_damaged_at(2, 4))
+        self.assertFalse(ship.is_damaged_at(2, 5))
+        self.assertEqual(ship.number_damages(), 2)
+        self.assertFalse(ship.has_sunk())
+
+        ship.gets_damage_at(2, 3)
+        ship.gets_damage_at(2, 5)
+        self.assertTrue(ship.has_sunk())
+
+    def test_slots(self):
+        ship = Ship(coord_start=(1, 1), coord_end=(3, 1))
+        self.assertFalse(hasattr(ship, '__dict__'))
+        with self.assertRaises(AttributeError):
+            ship.set_coordinates = set()
+
+    def test_copy(self):
+        ship = Ship(coord_start=(1, 1), coord_end=(3, 1))
+        ship.gets_damage_at(2, 1)
+        ship_copy = ship.copy()
+        self.assertEqual((ship_copy.x_start, ship_copy.y_start, ship_copy.x_end, ship_copy.y_end), (1, 1, 3, 1))
+        self.assertEqual(ship_copy.set_coordinates_damages, {(2, 1)})
+
+        ship_copy.gets_damage_at(3, 1)
+        self.assertEqual(ship.set_coordinates_damages, {(2, 1)})
+        self.assertEqual(ship_copy.set_coordinates_damages, {(2, 1), (3, 1)})
+
+    def test_near_ship_as_the_cells_around(self):
+        # every pair of ships of length at most 3 on a 5x5 board, against the cells near each cell of the ship
+        list_ships = [Ship(coord_start=(x, y), coord_end=(x + length - 1, y))
+                      for length in (1, 2, 3) for x in range(1, 7 - length) for y in range(1, 6)]
+        list_ships += [Ship(coord_start=(x, y), coord_end=(x, y + length - 1))
+                       for length in (2, 3) for x in range(1, 6) for y in range(1, 7 - length)]
+        for ship, other_ship in itertools.product(list_ships, repeat=2):
+            is_near = any(abs(x - x_other) <= 1 and abs(y - y_other) <= 1
+                          for x, y in ship.get_all_coordinates()
+                          for x_other, y_other in other_ship.get_all_coordinates())
+            self.assertEqual(ship.is_near_ship(other_ship), is_near, (ship, other_ship))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import random
+import statistics
+import unittest
+
+from battleship.board import Board
+from battleship.player import PlayerRandom
+
+try:
+    import numpy as np
+
+    from battleship.fleets import generate_fleets
+    from battleship.simulator import STRATEGY_PARITY_HUNT, STRATEGY_RANDOM, simulate_attacks, simulate_games
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+
+@unittest.skipUnless(np is not None, "numpy is not installed")
+class TestSimulator(unittest.TestCase):
+    def test_random_strategy_as_player_random(self):
+        # PlayerRandom skips the positions near the ships which have sunk: about 85 shots per game instead of about 91
+        rng = np.random.default_rng(0)
+        fleet_batch = generate_fleets(5000, rng)
+        number_shots, number_misses, _ = simulate_attacks(STRATEGY_RANDOM, fleet_batch, rng)
+        number_cells_ships = sum(length * number for length, number in Board.DICT_NUMBER_SHIPS_PER_LENGTH.items())
+        self.assertTrue(np.all(number_shots - number_misses == number_cells_ships))
+        self.assertLess(abs(float(np.mean(number_shots)) - 85.3), 1.)
+
+        list_number_shots = []
+        for seed in range(300):
+            player = PlayerRandom(rng=random.Random(seed))
+            opponent = PlayerRandom(rng=random.Random(seed + 1000))
+            number_shots, number_cells_left = 0, sum(len(ship) for ship in opponent.board.list_ships)
+            while number_cells_left:
+                _, _, is_ship_hit, _ = player.attacks_silently(opponent)
+                number_shots += 1
+                number_cells_left -= is_ship_hit
+            list_number_shots.append(number_shots)
+        self.assertLess(abs(statistics.mean(list_number_shots) - 85.3), 2.)
+
+    def test_games(self):
+        simulation_result = simulate_games(1000, STRATEGY_PARITY_HUNT, STRATEGY_RANDOM, np.random.default_rng(1))
+        self.assertEqual(len(simulation_result), 1000)
+        self.assertGreater(simulation_result.get_win_rate(1), simulation_result.get_win_rate(2))
+        self.assertTrue(np.all(simulation_result.array_number_shots_player_1 >= 15))
+        self.assertTrue(np.all(simulation_result.array_number_shots_player_2 >= 15))
+
+
+if __name__ == '__main__':
+    unittest.main()
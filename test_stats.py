@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from battleship import stats
+from battleship.board import Board, BoardAutomatic, BoardSparseAutomatic
+from battleship.player import PlayerAutomatic
+from battleship.ship import Ship
+
+
+class TestStats(unittest.TestCase):
+    def setUp(self):
+        stats.reset()
+
+    def tearDown(self):
+        stats.disable()
+        stats.reset()
+
+    def test_checks_of_distances_counted(self):
+        with stats.enabled():
+            BoardAutomatic(rng=random.Random(0))
+        self.assertGreater(stats.get_stats()['counters']['Board.ships_too_close'], 0)
+
+    def test_checks_of_distances_between_two_ships_counted(self):
+        with stats.enabled():
+            Ship((1, 1), (1, 3)).is_near_ship(Ship((3, 1), (3, 2)))
+            Ship((1, 1), (1, 3)).is_near_ship(Ship((2, 4), (2, 4)))
+        self.assertEqual(stats.get_stats()['counters']['Ship.is_near_ship'], 2)
+
+    def test_classes_defined_when_enabled(self):
+        with stats.enabled():
+            class PlayerTest(PlayerAutomatic):
+                def select_coordinates_to_attack(self, opponent):
+                    return super().select_coordinates_to_attack(opponent)
+
+            PlayerTest(rng=random.Random(0)).select_coordinates_to_attack(PlayerAutomatic(rng=random.Random(1)))
+        self.assertEqual(stats.get_stats()['statistics']['PlayerTest.select_coordinates_to_attack']['count'], 1)
+        # the hooks are removed with the instrumentation
+        self.assertNotIn('__init_subclass__', Board.__dict__)
+
+    def test_fallback_of_generation_recorded_once(self):
+        # too crowded for guessing: BoardSparseAutomatic falls back to the generation of BoardAutomatic
+        with stats.enabled():
+            BoardSparseAutomatic(size_x=6, size_y=6, dict_number_ships_per_length={1: 9}, rng=random.Random(1))
+        self.assertGreater(stats.get_stats()['counters']['BoardAutomatic.generate_ship'], 0)
+        dict_statistics = stats.get_stats()['statistics']
+        self.assertEqual(dict_statistics['BoardSparseAutomatic.generate_ships_automatically']['count'], 1)
+        self.assertNotIn('BoardAutomatic.generate_ships_automatically', dict_statistics)
+
+    def test_disable_puts_methods_back(self):
+        method = BoardAutomatic.generate_ships_automatically
+        stats.enable()
+        self.assertIsNot(BoardAutomatic.generate_ships_automatically, method)
+        stats.disable()
+        self.assertIs(BoardAutomatic.generate_ships_automatically, method)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from battleship.gamelog import read_game_log
+from battleship.player import PlayerAutomatic, PlayerRandom
+from battleship.tournament import replay_game, run_tournament
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.path_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path_directory)
+
+    def test_results_independent_of_the_workers(self):
+        list_stats, list_data_logs = [], []
+        for number_workers, size_chunk in ((0, None), (2, None), (2, 7)):
+            path_game_log = os.path.join(self.path_directory, f'games_{number_workers}_{size_chunk}.log')
+            tournament_result = run_tournament(PlayerAutomatic, PlayerRandom, 40, number_workers=number_workers,
+                                               size_chunk=size_chunk, seed=5, path_game_log=path_game_log)
+            list_stats.append(tournament_result.get_stats())
+            with open(path_game_log, 'rb') as file:
+                list_data_logs.append(file.read())
+
+        self.assertEqual(list_stats[0]['number_games'], 40)
+        for stats, data_log in zip(list_stats[1:], list_data_logs[1:]):
+            self.assertEqual(stats, list_stats[0])
+            self.assertEqual(data_log, list_data_logs[0])
+        # the part files of the workers have been appended to the logs, then removed
+        self.assertEqual(len(os.listdir(self.path_directory)), 3)
+
+    def test_replay_game(self):
+        path_game_log = os.path.join(self.path_directory, 'games.log')
+        tournament_result = run_tournament(PlayerAutomatic, PlayerRandom, 12, number_workers=2, size_chunk=5,
+                                           path_game_log=path_game_log)
+
+        list_game_records = read_game_log(path_game_log)
+        self.assertEqual(len(list_game_records), 12)
+        for index_game, game_record in enumerate(list_game_records):
+            game_result = replay_game(PlayerAutomatic, PlayerRandom, tournament_result.seed, index_game)
+            self.assertEqual(game_result.list_shots, game_record.get_list_shots())
+            self.assertEqual(game_result.index_winner, game_record.index_winner)
+
+
+if __name__ == '__main__':
+    unittest.main()